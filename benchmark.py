@@ -0,0 +1,287 @@
+"""This is a script to measure the throughput of counting bugs in synthetic landscapes."""
+
+import os
+import json
+import time
+import random
+import resource
+import platform
+import argparse
+import tempfile
+import itertools
+import collections
+import multiprocessing
+
+from main import DATA_FOLDER_PATH, ENGINES, Bug, Landscape, BugFinder
+
+Scenario = collections.namedtuple('Scenario', [
+    'height', 'width', 'noise_density', 'bug_count', 'partial_bug_count', 'twin_bug_count'
+])
+
+SCENARIOS = collections.OrderedDict([
+    ('sparse', Scenario(20000, 200, 0.05, 200, 0, 0)),
+    ('dense', Scenario(20000, 200, 0.6, 200, 0, 0)),
+    ('wide', Scenario(500, 8000, 0.3, 200, 0, 0)),
+    ('partial_bugs', Scenario(20000, 200, 0.05, 200, 5000, 0)),
+    ('twin_bugs', Scenario(20000, 200, 0.05, 200, 0, 2000)),
+])
+
+
+def generate_landscape(file_handler, bug, scenario, seed=0):
+    """
+    Write a random landscape with bugs planted in it.
+
+    Noise is made of the characters of the bug, so bug parts match by chance. Partial bugs are bugs missing their last
+    part. Twin bugs are pairs of bugs one under or beside the other, as close as they can be without changing a cell of
+    each other, so they share edge lines or columns where these are alike.
+
+    :param file_handler: File object opened to write the landscape to.
+    :type file_handler: BinaryIO
+    :param bug: Object representing bug pattern to plant.
+    :type bug: Bug
+    :param scenario: Properties of the landscape.
+    :type scenario: Scenario
+    :param seed: Seed of the random generator, so landscapes can be generated again.
+    :type seed: int
+    :return: Number of bugs planted. (Bugs formed by noise or broken by planting others over them are not told.)
+    :rtype: int
+    """
+    rng = random.Random(seed)
+    bug_height = bug.compiled_shape.height
+    bug_width = bug.compiled_shape.width
+
+    bug_rows = [''] * bug_height
+    for bug_part in bug.shape:
+        bug_rows[bug_part.id] = bug_part.raw_pattern
+
+    if scenario.height < 2 * bug_height or scenario.width < 2 * bug_width:
+        raise ValueError('Landscape should be at least twice as high and wide as the bug.')
+
+    noise_chars = sorted(set(''.join(bug_rows)) - {' '}) or ['#']
+    lines = [
+        [rng.choice(noise_chars) if rng.random() < scenario.noise_density else ' ' for _ in range(scenario.width)]
+        for _ in range(scenario.height)
+    ]
+
+    # Cells of the bug to be matched as they are: the first character of each row and all but spaces.
+    bug_cells = dict(
+        ((row_id, column), char)
+        for row_id, row in enumerate(bug_rows) for column, char in enumerate(row) if column == 0 or char != ' '
+    )
+
+    def twin_offset(row_step, column_step):
+        return next(
+            offset for offset in itertools.count(1)
+            if all(
+                bug_cells.get((row_id + offset * row_step, column + offset * column_step), char) == char
+                for (row_id, column), char in bug_cells.items()
+            )
+        )
+
+    def plant(rows, line_id, position):
+        for row_id, row in enumerate(rows):
+            lines[line_id + row_id][position:position + len(row)] = row
+
+    def plant_cells(line_id, position):
+        for (row_id, column), char in bug_cells.items():
+            lines[line_id + row_id][position + column] = char
+
+    def random_place(height, width):
+        return rng.randrange(scenario.height - height + 1), rng.randrange(scenario.width - width + 1)
+
+    for _ in range(scenario.partial_bug_count):
+        plant(bug_rows[:-1], *random_place(bug_height - 1, bug_width))
+
+    twin_line_offset = twin_offset(1, 0)
+    twin_column_offset = twin_offset(0, 1)
+
+    for twin_id in range(scenario.twin_bug_count):
+        if twin_id % 2:
+            line_id, position = random_place(bug_height + twin_line_offset, bug_width)
+            plant(bug_rows, line_id, position)
+            plant_cells(line_id + twin_line_offset, position)
+        else:
+            line_id, position = random_place(bug_height, bug_width + twin_column_offset)
+            plant(bug_rows, line_id, position)
+            plant_cells(line_id, position + twin_column_offset)
+
+    for _ in range(scenario.bug_count):
+        plant(bug_rows, *random_place(bug_height, bug_width))
+
+    for line in lines:
+        file_handler.write(''.join(line).rstrip() + '\n')
+
+    return scenario.bug_count + 2 * scenario.twin_bug_count
+
+
+def measure(bug, landscape, engine='regex', processes=1):
+    """
+    Count bugs in the landscape and measure how long it takes.
+
+    :param bug: Object representing bug pattern.
+    :type bug: Bug
+    :param landscape: Object representing landscape pattern.
+    :type landscape: Landscape
+    :param engine: Name of the engine to search bugs with.
+    :type engine: str
+    :param processes: Number of processes to search the landscape with.
+    :type processes: int
+    :return: Bug count, seconds spent and peak memory of the process in kilobytes.
+    :rtype: dict
+    """
+    bug_finder = BugFinder(bug, landscape, engine=engine)
+
+    start_time = time.time()
+    bug_finder.find_bugs_in_landscape(processes=processes)
+    seconds = time.time() - start_time
+
+    return {
+        'bug_count': bug_finder.bug_count,
+        'seconds': seconds,
+        'peak_memory_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def _measure_in_process(result_queue, bug, landscape, engine, processes):
+    """Measure in a fresh process, so that peak memory is not shared between measurements."""
+    result_queue.put(measure(bug, landscape, engine, processes))
+
+
+def run_benchmark(bug, scenarios, engines=('regex',), processes=1, seed=0):
+    """
+    Generate a landscape for each scenario and measure counting bugs in it with each engine.
+
+    :param bug: Object representing bug pattern.
+    :type bug: Bug
+    :param scenarios: Names of the scenarios to run. (See "SCENARIOS")
+    :type scenarios: collections.Iterable[str]
+    :param engines: Names of the engines to search bugs with.
+    :type engines: collections.Iterable[str]
+    :param processes: Number of processes to search the landscape with.
+    :type processes: int
+    :param seed: Seed of the random generator.
+    :type seed: int
+    :return: Results of each measurement.
+    :rtype: list[dict]
+    """
+    results = []
+
+    for scenario_name in scenarios:
+        scenario = SCENARIOS[scenario_name] if not isinstance(scenario_name, Scenario) else scenario_name
+
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=DATA_FOLDER_PATH, delete=False) as file_handler:
+            planted_bug_count = generate_landscape(file_handler, bug, scenario, seed)
+
+        try:
+            landscape = Landscape(os.path.basename(file_handler.name))
+            landscape_size = os.path.getsize(landscape.file_path)
+
+            for engine in engines:
+                result_queue = multiprocessing.Queue()
+                process = multiprocessing.Process(
+                    target=_measure_in_process, args=(result_queue, bug, landscape, engine, processes)
+                )
+
+                process.start()
+                result = result_queue.get()
+                process.join()
+
+                result.update({
+                    'scenario': scenario_name if not isinstance(scenario_name, Scenario) else 'custom',
+                    'engine': engine,
+                    'processes': processes,
+                    'planted_bug_count': planted_bug_count,
+                    'lines_per_second': scenario.height / result['seconds'] if result['seconds'] else None,
+                    'mb_per_second': landscape_size / 1e6 / result['seconds'] if result['seconds'] else None,
+                    'landscape': dict(scenario._asdict(), size=landscape_size),
+                })
+
+                results.append(result)
+        finally:
+            os.remove(file_handler.name)
+
+    return results
+
+
+def format_result(result):
+    """
+    Return a line telling the result of a measurement. Throughputs are told as "-" if they could not be measured, as
+    counting took less time than the timer tells.
+
+    :param result: Result of a measurement. (See "run_benchmark")
+    :type result: dict
+    :rtype: str
+    """
+    def throughput(value, format_spec):
+        return format(value, format_spec) if value is not None else '-'
+
+    return '{scenario:>14} {engine:>10} {bug_count:>8} bugs {lines_per_second:>12} lines/s {mb_per_second:>8} MB/s ' \
+           '{peak_memory_kb:>8} KB peak'.format(**dict(
+               result,
+               lines_per_second=throughput(result['lines_per_second'], '.0f'),
+               mb_per_second=throughput(result['mb_per_second'], '.2f'),
+           ))
+
+
+def compare_results(previous_results, results):
+    """
+    Return throughput changes between two benchmark runs, matched by scenario, engine and processes.
+
+    :param previous_results: Results of the earlier run.
+    :type previous_results: list[dict]
+    :param results: Results of the later run.
+    :type results: list[dict]
+    :return: Ratio of lines per second of the later run to the earlier one. Ex: {(scenario, engine, processes): 1.2}
+    :rtype: dict
+    """
+    def key(result):
+        return result['scenario'], result['engine'], result['processes']
+
+    previous_throughputs = dict((key(result), result['lines_per_second']) for result in previous_results)
+
+    return dict(
+        (key(result), result['lines_per_second'] / previous_throughputs[key(result)])
+        for result in results
+        if previous_throughputs.get(key(result)) and result['lines_per_second']
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='This is a script to measure the throughput of counting bugs in synthetic landscapes.'
+    )
+
+    parser.add_argument("--bug", "-b", default='bug.txt', help="filename with extension for bug")
+    parser.add_argument("--scenario", "-s", nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS),
+                        help="scenarios of landscapes to generate")
+    parser.add_argument("--engine", "-e", nargs='+', choices=list(ENGINES), default=['regex'],
+                        help="engines to search bugs with")
+    parser.add_argument("--processes", "-p", type=int, default=1, help="number of processes to search with")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random landscape generator")
+    parser.add_argument("--output", "-o", help="path of the JSON file to save results to")
+    parser.add_argument("--compare", "-c", help="path of a JSON file of earlier results to compare with")
+
+    args = parser.parse_args()
+
+    benchmark_results = run_benchmark(Bug(args.bug), args.scenario, args.engine, args.processes, args.seed)
+
+    for benchmark_result in benchmark_results:
+        print format_result(benchmark_result)
+
+    if args.compare:
+        with open(args.compare, 'r') as compare_file_handler:
+            changes = compare_results(json.load(compare_file_handler)['results'], benchmark_results)
+
+        for (scenario_name, engine_name, process_count), change in sorted(changes.items()):
+            print '{scenario:>14} {engine:>10} {change:>+7.1%} lines/s'.format(
+                scenario=scenario_name, engine=engine_name, change=change - 1
+            )
+
+    if args.output:
+        with open(args.output, 'w') as output_file_handler:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': benchmark_results,
+            }, output_file_handler, indent=2, sort_keys=True)
@@ -2,13 +2,79 @@
 
 import os
 import re
-import argparse
+import sys
+import json
+import mmap
+import array
+import bisect
+import stat
+import time
+import signal
+import string
+import itertools
 import collections
 
 DATA_FOLDER_PATH = 'data'
 
+READ_BLOCK_SIZE = 64 * 1024
+
+DECOMPRESS_READ_BLOCK_SIZE = 1024
+
+PARALLEL_CHUNKS_PER_PROCESS = 4
+
+READ_AHEAD_BATCH_SIZE = 4096
+
+CHECKPOINT_VERSION = 1
+
+LITERAL_PREFILTER_MIN_LENGTH = 2
+
+SPARSE_MIN_GAP = 64
+
+ORIENTATIONS = (
+    'original', 'rotate90', 'rotate180', 'rotate270',
+    'mirror', 'mirror-rotate90', 'mirror-rotate180', 'mirror-rotate270',
+)
+
+RESULT_CACHE_VERSION = 2
+
+RESULT_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
+RESULT_CACHE_EVICT_SHARE = 0.1
+
+LANDSCAPE_INDEX_VERSION = 2
+
+LANDSCAPE_INDEX_EXTENSION = '.index'
+
+LANDSCAPE_INDEX_MAX_ANCHOR_SHARE = 0.01
+
+BUG_LIBRARY_VERSION = 2
+
+COMPRESSION_EXTENSIONS = ('.gz', '.bz2', '.xz')
+
 ALPHANUM = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
 
+numpy = None
+
+
+def import_numpy():
+    """
+    Import NumPy on first use, as importing it takes most of the time the script needs to start.
+
+    :return: NumPy module, or None if it is not installed.
+    :rtype: module | None
+    """
+    global numpy
+
+    if numpy is None:
+        try:
+            import numpy as numpy_module
+        except ImportError:
+            return None
+
+        numpy = numpy_module
+
+    return numpy
+
 
 def escape(string, except_chars=''):
     """Escape all non-alphanumeric characters and the ones specified."""
@@ -23,18 +89,47 @@ def escape(string, except_chars=''):
     return string[:0].join(s)
 
 
+class CompiledShape(collections.namedtuple('CompiledShape', ['parts', 'height', 'width', 'last_part_id'])):
+    """Immutable, precomputed representation of a bug shape to be used while searching a landscape."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_parts(cls, parts):
+        """
+        Precompute the shape properties from bug parts.
+
+        :param parts: Bug parts having each line of the bug.
+        :type parts: list[Bug.Part]
+
+        :return: Compiled shape
+        :rtype: CompiledShape
+        """
+        parts = tuple(parts)
+
+        return cls(
+            parts=parts,
+            height=parts[-1].id + 1 if parts else 0,
+            width=max([len(part.raw_pattern) for part in parts] or [0]),
+            last_part_id=parts[-1].id if parts else None,
+        )
+
+
 class File(object):
     """Represents a file in the file system."""
 
-    def __init__(self, filename):
+    def __init__(self, filename, strict=True):
         """
         Initialise object.
 
         :param filename: Name and extension of the file. (Ex: schnitzel.txt)
         :type filename: str
+        :param strict: Whether the file should be a txt file in the data folder, or can be any path.
+        :type strict: bool
         """
         super(File, self).__init__()
 
+        self._strict = bool(strict)
         self.filename = filename
 
     @property
@@ -51,19 +146,36 @@ class File(object):
         if not isinstance(value, str):
             raise TypeError('Filename should be string.')
 
-        if not value.endswith('.txt'):
+        extension = os.path.splitext(value)[1]
+        uncompressed_value = value[:-len(extension)] if extension in COMPRESSION_EXTENSIONS else value
+
+        if self._strict and not uncompressed_value.endswith('.txt'):
             raise TypeError('File should be in txt format.')
 
         self._filename = value
 
+    @property
+    def compression(self):
+        """
+        Extension of the compression format of the file, if it is compressed. (See "COMPRESSION_EXTENSIONS")
+
+        :type: str | None
+        """
+        extension = os.path.splitext(self._filename)[1]
+
+        return extension if extension in COMPRESSION_EXTENSIONS else None
+
     @property
     def file_path(self):
         """
-        The path of the provided file in the file system.
+        The path of the provided file in the file system. The filename is taken as the path unless the file is strict.
 
         :type: str
         """
-        file_path = '{path}/{file}'.format(path=DATA_FOLDER_PATH, file=self.filename)
+        if self._strict:
+            file_path = '{path}/{file}'.format(path=DATA_FOLDER_PATH, file=self.filename)
+        else:
+            file_path = self.filename
 
         if not os.path.exists(file_path):
             raise ValueError('Please make sure "{file_path}" exists.'.format(file_path=file_path))
@@ -71,423 +183,4284 @@ class File(object):
         return file_path
 
     @classmethod
-    def reader(cls, file_handler):
+    def reader(cls, file_handler, first_line_id=0):
         """
         A generator method to return processed lines from a file handler.
 
         :param file_handler: File object opened to process.
         :type file_handler: BinaryIO
+        :param first_line_id: Id of the first line read. (Ex: when reading starts in the middle of a file)
+        :type first_line_id: int
 
         :returns: Processed line
         :rtype: collections.Iterable[File.Line]
         """
-        for line_id, pattern in enumerate(file_handler):
+        for line_id, pattern in enumerate(file_handler, first_line_id):
             pattern = pattern.rstrip()
 
             if pattern:
-                yield cls.Line(line_id, pattern)
+                yield tuple.__new__(cls.Line, (line_id, pattern, 0, len(pattern)))
 
-    class Line(object):
-        def __init__(self, line_id, pattern):
-            self.id = line_id
-            self.pattern = pattern
+    @classmethod
+    def block_reader(cls, blocks, first_line_id=0):
+        """
+        A generator method to return processed lines from blocks of text, which may split lines anywhere.
 
-        @property
-        def id(self):
-            """
-            Id of the landscape line.
+        :param blocks: Blocks of text, in order.
+        :type blocks: collections.Iterable[str]
+        :param first_line_id: Id of the first line read.
+        :type first_line_id: int
 
-            :type: int
-            """
-            return self._id
+        :returns: Processed line
+        :rtype: collections.Iterable[File.Line]
+        """
+        line_id = first_line_id
+        rest_pieces = []
 
-        @id.setter
-        def id(self, value):
-            if not isinstance(value, int):
-                raise TypeError('Id should be int.')
+        for block in blocks:
+            patterns = block.split('\n')
 
-            self._id = value
+            if len(patterns) == 1:
+                rest_pieces.append(block)
 
-        @property
-        def pattern(self):
-            """
-            Pattern of the landscape line.
+                continue
 
-            :type: str
-            """
-            return self._pattern
+            # Pieces of a line split over many blocks are joined once the line ends, not as each block is read.
+            rest_pieces.append(patterns[0])
+            patterns[0] = ''.join(rest_pieces)
+            rest_pieces = [patterns.pop()]
 
-        @pattern.setter
-        def pattern(self, value):
-            if not isinstance(value, str):
-                raise TypeError('Pattern should be string.')
+            for pattern in patterns:
+                pattern = pattern.rstrip()
 
-            self._pattern = value
+                if pattern:
+                    yield tuple.__new__(cls.Line, (line_id, pattern, 0, len(pattern)))
 
+                line_id += 1
 
-class Bug(File):
-    """Represents a bug pattern."""
+        rest = ''.join(rest_pieces).rstrip()
+        if rest:
+            yield tuple.__new__(cls.Line, (line_id, rest, 0, len(rest)))
 
-    def __init__(self, filename):
+    @classmethod
+    def decompressor(cls, compression):
         """
-        Initialise object.
+        Return a new decompressor of the compression format, importing its module on first use, so only compressed
+        landscapes pay for importing it.
 
-        :param filename: Name and extension of the file. (Ex: wurstel.txt)
-        :type filename: str
+        :param compression: Extension of the compression format. (See "COMPRESSION_EXTENSIONS")
+        :type compression: str
+        :return: Decompressor having "decompress" and "unused_data".
+        :rtype: object
         """
-        super(Bug, self).__init__(filename)
+        if compression == '.gz':
+            import zlib
 
-        self._shape = None
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
 
-        self._read_bug()
+        if compression == '.bz2':
+            import bz2
 
-    @property
-    def shape(self):
-        """
-        The shape representation of bug having each line as members of a list.
+            return bz2.BZ2Decompressor()
 
-        :type: list
+        try:
+            import lzma
+        except ImportError:
+            try:
+                from backports import lzma
+            except ImportError:
+                raise ValueError('Please install "backports.lzma" to read "{compression}" files.'.format(
+                    compression=compression
+                ))
+
+        return lzma.LZMADecompressor()
+
+    @classmethod
+    def decompressed_blocks(cls, file_handler, compression):
         """
-        return self._shape
+        A generator method to return decompressed blocks of a compressed file, reading it a block at a time.
 
-    @shape.setter
-    def shape(self, value):
-        if not isinstance(value, list):
-            raise TypeError('Shape should be list.')
+        Files made of several compressed streams one after the other (Ex: by "pigz" or "cat") are read to the end.
 
-        self._shape = value
+        Blocks are at most "READ_BLOCK_SIZE" long for decompressors which can limit their output (Ex: zlib), so a
+        highly compressed block does not take much memory. Others are given "DECOMPRESS_READ_BLOCK_SIZE" compressed
+        bytes at a time instead, which limits how much is decompressed at once.
 
-    def _read_bug(self):
-        """Open the file representing bug and processes it."""
-        with open(self.file_path, 'r') as file_handler:
-            self.shape = [self.Part(line) for line in File.reader(file_handler)]
+        :param file_handler: File object opened to read the compressed file.
+        :type file_handler: BinaryIO
+        :param compression: Extension of the compression format. (See "COMPRESSION_EXTENSIONS")
+        :type compression: str
 
-    class Part(File.Line):
-        def __init__(self, line):
-            """
-            Initialise object.
+        :returns: Decompressed block
+        :rtype: collections.Iterable[str]
+        """
+        decompressor = cls.decompressor(compression)
+        limits_output = hasattr(decompressor, 'unconsumed_tail')
+        read_size = READ_BLOCK_SIZE if limits_output else DECOMPRESS_READ_BLOCK_SIZE
 
-            :param line: Line object representing bug part.
-            :type line: Line
-            """
-            super(Bug.Part, self).__init__(line.id, line.pattern)
+        for block in iter(lambda: file_handler.read(read_size), ''):
+            while block:
+                if limits_output:
+                    yield decompressor.decompress(block, READ_BLOCK_SIZE)
 
-        @property
-        def pattern(self):
-            """
-            Pattern of the bug part.
+                    block = decompressor.unconsumed_tail
+                    if block:
+                        continue
+                else:
+                    try:
+                        decompressed_block = decompressor.decompress(block)
+                    except EOFError:
+                        # The stream ended right at the end of the previous block, so this block starts the next one.
+                        decompressor = cls.decompressor(compression)
+                        continue
 
-            :type: str
-            """
-            return self._pattern
+                    yield decompressed_block
 
-        @pattern.setter
-        def pattern(self, value):
-            if not isinstance(value, str):
-                raise TypeError('Pattern should be string.')
+                block = decompressor.unused_data
+                if block:
+                    decompressor = cls.decompressor(compression)
 
-            self._pattern = self._format_pattern(value)
+        if limits_output:
+            yield decompressor.flush()
 
-        @classmethod
-        def _format_pattern(cls, pattern):
-            """
-            A method to convert bug ASCII characters into regular expression with lookahead.
+    @classmethod
+    def mapped_reader(cls, file_handler, start=0, end=None, first_line_id=0):
+        """
+        A generator method to return processed lines from a file handler without copying them.
 
-            :param pattern: Pattern of the bug part.
-            :type pattern: str
+        The file is memory mapped and each line refers to its span in the map, which is released once no line refers
+        to it. Falls back to "File.reader" if the file can not be mapped. (Ex: a pipe)
 
-            :return: Regular expression
-            :rtype: str
-            """
-            if not isinstance(pattern, str):
-                raise TypeError('Pattern should be string.')
+        :param file_handler: File object opened to process.
+        :type file_handler: BinaryIO
+        :param start: Offset of the beginning of the first line.
+        :type start: int
+        :param end: Offset lines should start before. (Default: end of the file)
+        :type end: int
+        :param first_line_id: Id of the first line read.
+        :type first_line_id: int
 
-            if pattern:
-                shape_part_first_char = escape(pattern[0])
+        :returns: Processed line
+        :rtype: collections.Iterable[File.MappedLine]
+        """
+        try:
+            file_stat = os.fstat(file_handler.fileno())
 
-                shape_part_rest_chars = escape(pattern[1:], except_chars=' ')
-                shape_part_rest_chars = re.sub(r'\s+', cls._format_bug_replace_match_with_regex, shape_part_rest_chars)
+            if stat.S_ISREG(file_stat.st_mode) and not file_stat.st_size:
+                return
 
-                return '{first}(?={rest})'.format(first=shape_part_first_char, rest=shape_part_rest_chars)
+            mapped_file = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except (EnvironmentError, ValueError):
+            raw_lines = file_handler if not start and end is None else cls.range_reader(file_handler, start, end)
 
-        @classmethod
-        def _format_bug_replace_match_with_regex(cls, match):
-            """
-            A method to replace match with a regular expression to look for any value with same length of match.
+            for line in cls.reader(raw_lines, first_line_id):
+                yield line
 
-            Ex: If match is "apfelstrudel", it will be replaced with ".{12}"
+            return
 
-            :param match: Match found from the regular expression used in "re.sub()".
-            :type match: MatchObject
+        file_size = len(mapped_file)
+        end = file_size if end is None else min(end, file_size)
 
-            :return: Regular expression
-            :rtype: str
-            """
-            length_of_space = len(match.group(0))
+        line_id = first_line_id
+        line_start = start
 
-            return '.{{{length}}}'.format(length=length_of_space)
+        while line_start < end:
+            line_end = mapped_file.find('\n', line_start)
 
+            if line_end < 0:
+                line_end = file_size
 
-class Landscape(File):
-    """Represents a landscape pattern."""
+            pattern_end = cls.content_end(mapped_file, line_start, line_end)
+
+            if pattern_end > line_start:
+                yield tuple.__new__(cls.MappedLine, (line_id, mapped_file, line_start, pattern_end))
 
-    def __init__(self, filename):
+            line_id += 1
+            line_start = line_end + 1
+
+    @classmethod
+    def content_end(cls, buffer, start, end):
         """
-        Initialise object.
+        Return the end of a span of the buffer without its trailing whitespace.
 
-        :param filename: Name and extension of the file. (Ex: sachertorte.txt)
-        :type filename: str
+        Whitespace is trimmed by "str.rstrip" from slices at the end of the span, growing up to "READ_BLOCK_SIZE", so
+        a long span is not copied whole, and a long run of whitespace is not trimmed a character at a time.
+
+        :param buffer: Buffer holding the span. (Ex: memory mapped file)
+        :type buffer: str | mmap.mmap
+        :param start: Start of the span.
+        :type start: int
+        :param end: End of the span.
+        :type end: int
+        :return: End of the span without trailing whitespace, or start if the span is all whitespace.
+        :rtype: int
         """
-        super(Landscape, self).__init__(filename)
+        slice_size = 64
 
+        while end > start:
+            slice_start = max(end - slice_size, start)
+            content = buffer[slice_start:end].rstrip()
 
-class BugFinder(object):
-    """Holds the operations to find bugs in a landscape."""
+            if content:
+                return slice_start + len(content)
 
-    def __init__(self, bug, landscape):
-        """
-        Initialise object.
+            end = slice_start
+            slice_size = min(slice_size * 2, READ_BLOCK_SIZE)
 
-        :param bug: Object representing bug pattern.
-        :type bug: Bug
-        :param landscape: Object representing landscape pattern.
-        :type landscape: Landscape
+        return start
+
+    @classmethod
+    def line_spans(cls, mapped_file):
         """
-        self.bug = bug
-        self.landscape = landscape
+        A generator method to return start and end offsets of each line of a memory mapped file, not including the
+        newline.
 
-        self._bug_part_matches = collections.defaultdict(lambda: collections.defaultdict(list))
-        self._bug_count = 0
+        :param mapped_file: Memory mapped file.
+        :type mapped_file: mmap.mmap
 
-    @property
-    def bug(self):
+        :returns: Line span, in order of line ids. Ex: (start, end)
+        :rtype: collections.Iterable[tuple[int, int]]
         """
-        Object representing bug pattern.
+        file_size = len(mapped_file)
+        line_start = 0
 
-        :type: Bug
-        """
-        return self._bug
+        while line_start < file_size:
+            line_end = mapped_file.find('\n', line_start)
 
-    @bug.setter
-    def bug(self, value):
-        if not isinstance(value, Bug):
-            raise TypeError('Bug is either incorrect or not provided.')
+            if line_end < 0:
+                line_end = file_size
 
-        self._bug = value
+            yield line_start, line_end
 
-    @property
-    def landscape(self):
+            line_start = line_end + 1
+
+    @classmethod
+    def line_span_array(cls, mapped_file):
         """
-        Object representing landscape pattern.
+        Return start and end offsets of each line of a memory mapped file one after the other in an array, so memory
+        used grows with the number of lines but not with their width.
 
-        :type: Landscape
+        :param mapped_file: Memory mapped file.
+        :type mapped_file: mmap.mmap
+        :return: Line spans, by line id. Ex: array([start, end, start, end])
+        :rtype: array.array
         """
-        return self._landscape
+        line_spans = array.array(LandscapeIndex.offset_typecode(len(mapped_file)))
 
-    @landscape.setter
-    def landscape(self, value):
-        if not isinstance(value, Landscape):
-            raise TypeError('Landscape is either incorrect or not provided.')
+        for line_span in cls.line_spans(mapped_file):
+            line_spans.extend(line_span)
 
-        self._landscape = value
-        self._bug_count = 0
+        return line_spans
 
-    @property
-    def bug_part_matches(self):
+    @classmethod
+    def tile_reader(cls, mapped_file, line_spans, column_start, column_end):
         """
-        Hold occurrences of bug part matches in an ordered fashion. Is a default dict containing default dict of list.
+        A generator method to return processed lines of a column tile of a memory mapped file without copying them.
 
-        Ex: {line_number: {bug_part_id: [bug_part_match_position]}}
+        Each line refers to the part of the line from the start column to the end column in the map, so a tile of a very
+        wide line is searched without reading the rest of the line. Positions in tile lines are relative to the start
+        column.
 
-        :type: dict
-        """
-        return self._bug_part_matches
+        :param mapped_file: Memory mapped file.
+        :type mapped_file: mmap.mmap
+        :param line_spans: Start and end offsets of each line. (See "line_span_array")
+        :type line_spans: array.array
+        :param column_start: Column the tile starts at.
+        :type column_start: int
+        :param column_end: Column the tile ends before.
+        :type column_end: int
 
-    @property
-    def bug_count(self):
+        :returns: Processed line
+        :rtype: collections.Iterable[File.MappedLine]
         """
-        Number of times a bug is found in the landscape.
+        line_offsets = iter(line_spans)
 
-        :type: int
-        """
-        return self._bug_count
+        for line_id, (line_start, line_end) in enumerate(itertools.izip(line_offsets, line_offsets)):
+            tile_start = line_start + column_start
+            tile_end = cls.content_end(mapped_file, tile_start, min(line_end, line_start + column_end))
 
-    def increment_bug_count(self):
-        """Increment number of times a bug is found in the landscape by one."""
-        self._bug_count += 1
+            if tile_end > tile_start:
+                yield tuple.__new__(cls.MappedLine, (line_id, mapped_file, tile_start, tile_end))
 
-    def bug_part_match_exists(self, bug_part, landscape_line):
+    @classmethod
+    def complete_lines_end(cls, file_handler, start=0):
         """
-        Return whether a bug part match was registered in line.
+        Find the end of the last line ending with a newline. Lines after it may still be being written.
 
-        :param bug_part: Bug part to look for.
-        :type bug_part: Bug.Part
-        :param landscape_line: Line to look for bug part match in.
-        :type landscape_line: File.line
+        :param file_handler: File object opened to look for lines in.
+        :type file_handler: BinaryIO
+        :param start: Offset to look for lines after.
+        :type start: int
+
+        :returns: Offset after the last newline, or start if there is no newline after it.
+        :rtype: int
         """
-        if bug_part.id in self.bug_part_matches[landscape_line.id]:
-            return True
+        file_handler.seek(0, os.SEEK_END)
+        block_end = file_handler.tell()
 
-        return False
+        while block_end > start:
+            block_start = max(block_end - READ_BLOCK_SIZE, start)
 
-    def register_bug_part_match(self, bug_part, landscape_line, bug_part_match_position):
-        """
-        When a bug part match is found, register it.
+            file_handler.seek(block_start)
+            newline_position = file_handler.read(block_end - block_start).rfind('\n')
 
-        The registrations are to be later checked with other bug part matches to determine
-        whether registered bug part matches form a bug.
-        
-        :param bug_part: Bug part matched.
-        :type bug_part: Bug.Part
-        :param landscape_line: Line where the match is found in.
-        :type landscape_line: File.Line
-        :param bug_part_match_position: Match start position in line.
-        :type bug_part_match_position: int
-        """
-        self.bug_part_matches[landscape_line.id][bug_part.id].append(bug_part_match_position)
+            if newline_position >= 0:
+                return block_start + newline_position + 1
 
-    def deregister_bug_match(self, landscape_line, bug_part_match_position):
+            block_end = block_start
+
+        return start
+
+    @classmethod
+    def count_lines(cls, file_handler, start, end):
         """
-        When a bug match is found, deregister individual bug part matches.
+        Count lines ending in between offsets.
 
-        This way found bugs later won't be used in checking for additional bugs. (Disallow conjoined twin bugs.)
+        :param file_handler: File object opened to count lines in.
+        :type file_handler: BinaryIO
+        :param start: Offset to count lines from.
+        :type start: int
+        :param end: Offset to count lines up to.
+        :type end: int
 
-        :param landscape_line: Line where the match of the last part of the bug is found in.
-        :type landscape_line: File.Line
-        :param bug_part_match_position: Match start position of the last part of bug in line.
-        :type bug_part_match_position: int
+        :returns: Number of newlines in between offsets.
+        :rtype: int
         """
-        landscape_line_number = landscape_line.id
+        file_handler.seek(start)
 
-        for bug_part in reversed(self.bug.shape):
-            self.bug_part_matches[landscape_line_number][bug_part.id].remove(bug_part_match_position)
+        line_count = 0
+        while start < end:
+            block = file_handler.read(min(READ_BLOCK_SIZE, end - start))
 
-            landscape_line_number = landscape_line_number - 1
+            if not block:
+                break
 
-    def should_skip_all_bug_parts_in_line(self, bug_part, landscape_line):
-        """
-        Tell whether remaining bug part and remaining parts to check should be skipped.
+            line_count += block.count('\n')
+            start += len(block)
 
-        In the first -bug height amount- of lines, if no match for bug part found, skip remaining bug parts
-        in the same line.
+        return line_count
 
-        :param bug_part: Bug part to check for.
-        :type bug_part: Bug.Part
-        :param landscape_line: Landscape line to check in.
-        :type landscape_line: File.line
-        :return: Whether to skip
-        :rtype: bool
+    @classmethod
+    def chunk_offsets(cls, file_handler, chunk_count):
         """
-        if landscape_line.id - bug_part.id <= 0:
-            if not self.bug_part_match_exists(bug_part, landscape_line):
-                return True
+        Split a file into chunks of about the same size, each starting at the beginning of a line.
 
-        return False
+        :param file_handler: File object opened to split.
+        :type file_handler: BinaryIO
+        :param chunk_count: Number of chunks to split the file into.
+        :type chunk_count: int
 
-    def should_skip_bug_part_in_line(self, bug_part, landscape_line):
+        :returns: Start and end offsets of chunks. Ex: [(chunk_start, chunk_end)]
+        :rtype: list[tuple[int, int]]
         """
-        Tell whether bug part to check should be skipped.
+        file_handler.seek(0, os.SEEK_END)
+        file_size = file_handler.tell()
 
-        If previous bug part is not found in previous line, skip.
+        offsets = [0]
+        for chunk_id in range(1, chunk_count):
+            file_handler.seek(max(file_size * chunk_id // chunk_count - 1, 0))
+            file_handler.readline()
 
-        :param bug_part: Bug part to check for.
-        :type bug_part: Bug.Part
-        :param landscape_line: Landscape line to check in.
-        :type landscape_line: File.Line
-        :return: Whether to skip
-        :rtype: bool
-        """
-        if landscape_line.id - 1 >= 0 and bug_part.id - 1 >= 0:
-            if bug_part.id - 1 not in self.bug_part_matches[landscape_line.id - 1]:
-                return True
+            offset = file_handler.tell()
 
-        return False
+            if offsets[-1] < offset < file_size:
+                offsets.append(offset)
 
-    def bug_part_match_belongs_to_a_bug(self, bug_part, landscape_line, bug_part_match_position):
-        """
-        Return whether bug part match is part of a bug.
+        offsets.append(file_size)
 
-        If the matched bug part is the last part of its shape, then checks whether previous parts exist in previous
-        lines at the same match position.
+        return list(zip(offsets[:-1], offsets[1:]))
+
+    @classmethod
+    def rewind_lines(cls, file_handler, offset, line_count):
+        """
+        Find the beginning of the line which is -line count- amount of lines before the line starting at offset.
+
+        :param file_handler: File object opened to look for lines in.
+        :type file_handler: BinaryIO
+        :param offset: Offset of the beginning of a line.
+        :type offset: int
+        :param line_count: Number of lines to go back.
+        :type line_count: int
+
+        :returns: Offset of the beginning of the line found and the number of lines went back. (Less than line count
+            if the beginning of the file is reached.)
+        :rtype: tuple[int, int]
+        """
+        if not line_count or not offset:
+            return offset, 0
+
+        block_end = offset - 1
+        newline_count = 0
+
+        while block_end > 0:
+            block_start = max(block_end - READ_BLOCK_SIZE, 0)
+
+            file_handler.seek(block_start)
+            block = file_handler.read(block_end - block_start)
+
+            newline_position = len(block)
+            while True:
+                newline_position = block.rfind('\n', 0, newline_position)
+
+                if newline_position < 0:
+                    break
+
+                newline_count += 1
+
+                if newline_count == line_count:
+                    return block_start + newline_position + 1, line_count
+
+            block_end = block_start
+
+        return 0, newline_count + 1
+
+    @classmethod
+    def range_reader(cls, file_handler, start, end):
+        """
+        A generator method to return raw lines of a file starting in between offsets.
+
+        :param file_handler: File object opened to read.
+        :type file_handler: BinaryIO
+        :param start: Offset of the beginning of the first line.
+        :type start: int
+        :param end: Offset lines should start before. (Default: end of the file)
+        :type end: int
+
+        :returns: Raw line
+        :rtype: collections.Iterable[str]
+        """
+        file_handler.seek(start)
+
+        offset = start
+        while end is None or offset < end:
+            line = file_handler.readline()
+
+            if not line:
+                break
+
+            offset += len(line)
+
+            yield line
+
+    class Line(collections.namedtuple('Line', ['id', 'buffer', 'start', 'end'])):
+        """
+        Landscape line, as a tuple of its id and the span of its pattern in the buffer holding it, so its fields are
+        read as fast as items of a tuple while searching. Arguments are validated when a line is made by calling the
+        class; readers make lines of valid arguments only, so they make them with "tuple.__new__" instead.
+        """
+
+        __slots__ = ()
+
+        def __new__(cls, line_id, pattern):
+            """
+            Make object.
+
+            :param line_id: Id of the landscape line.
+            :type line_id: int
+            :param pattern: Pattern of the landscape line.
+            :type pattern: str
+            """
+            if not isinstance(line_id, int):
+                raise TypeError('Id should be int.')
+
+            if not isinstance(pattern, str):
+                raise TypeError('Pattern should be string.')
+
+            return tuple.__new__(cls, (line_id, pattern, 0, len(pattern)))
+
+        def __getnewargs__(self):
+            return self.id, self.pattern
+
+        @property
+        def pattern(self):
+            """
+            Pattern of the landscape line.
+
+            :type: str
+            """
+            return self[1]
+
+    class MappedLine(Line):
+        """Landscape line referring to its span in a memory mapped file, without copying it."""
+
+        __slots__ = ()
+
+        def __new__(cls, line_id, buffer, start, end):
+            """
+            Make object.
+
+            :param line_id: Id of the landscape line.
+            :type line_id: int
+            :param buffer: Memory mapped file holding the landscape line.
+            :type buffer: mmap.mmap
+            :param start: Position of the pattern of the landscape line in buffer.
+            :type start: int
+            :param end: Position of the end of the pattern of the landscape line in buffer.
+            :type end: int
+            """
+            if not isinstance(line_id, int):
+                raise TypeError('Id should be int.')
+
+            return tuple.__new__(cls, (line_id, buffer, start, end))
+
+        def __getnewargs__(self):
+            return tuple(self)
+
+        @property
+        def pattern(self):
+            """
+            Pattern of the landscape line. Copied out of the buffer on each access.
+
+            :type: str
+            """
+            return self[1][self[2]:self[3]]
+
+
+class Bug(File):
+    """Represents a bug pattern."""
+
+    def __init__(self, filename, strict=True, rows=None, parts=None):
+        """
+        Initialise object.
+
+        :param filename: Name and extension of the file. (Ex: wurstel.txt)
+        :type filename: str
+        :param strict: Whether the file should be a txt file in the data folder, or can be any path.
+        :type strict: bool
+        :param rows: Lines of the bug pattern to use instead of reading the file. They are processed as if they were
+            read from the file, and the filename is only used to tell the bug.
+        :type rows: collections.Iterable[str]
+        :param parts: Bug parts to use instead of reading the file, Ex: from a bug library. The filename is only used
+            to tell the bug. (See "BugLibrary")
+        :type parts: list[Bug.Part]
+        """
+        super(Bug, self).__init__(filename, strict=strict and rows is None and parts is None)
+
+        self._shape = None
+        self._compiled_shape = None
+        self._orientation = ORIENTATIONS[0]
+        self._original = None
+
+        if parts is not None:
+            self.shape = parts
+        elif rows is not None:
+            self.shape = self.read_parts(File.reader(row + '\n' for row in rows))
+        else:
+            self._read_bug()
+
+    @property
+    def shape(self):
+        """
+        The shape representation of bug having each line as members of a list.
+
+        :type: list
+        """
+        return self._shape
+
+    @shape.setter
+    def shape(self, value):
+        if not isinstance(value, list):
+            raise TypeError('Shape should be list.')
+
+        self._shape = value
+        self._compiled_shape = CompiledShape.from_parts(value)
+
+    @property
+    def compiled_shape(self):
+        """
+        Immutable shape representation of bug with compiled bug parts, height, width and last part id precomputed.
+
+        :type: CompiledShape
+        """
+        return self._compiled_shape
+
+    @property
+    def orientation(self):
+        """
+        Name of the rotation or reflection of the original bug this bug is. (See "ORIENTATIONS")
+
+        :type: str
+        """
+        return self._orientation
+
+    @property
+    def original(self):
+        """
+        Object representing the bug pattern this bug is an orientation of, or this bug if it is not derived.
+
+        :type: Bug
+        """
+        return self._original if self._original is not None else self
+
+    def orientations(self):
+        """
+        Return the distinct rotations and reflections of the bug, dropping the ones identical to an earlier one.
+
+        Each orientation is the bug as if its rotated or reflected picture was written to a bug file, so the first
+        character of each row is matched literally even if it is a space. (See "Bug.Part._format_pattern")
+
+        :return: Bugs of orientations by name, starting with this bug as "original".
+        :rtype: collections.OrderedDict[str, Bug]
+        """
+        parts = self._compiled_shape.parts
+        first_part_id = parts[0].id if parts else 0
+        width = self._compiled_shape.width
+
+        picture = [' ' * width] * (self._compiled_shape.last_part_id - first_part_id + 1 if parts else 0)
+        for bug_part in parts:
+            picture[bug_part.id - first_part_id] = bug_part.raw_pattern.ljust(width)
+
+        def rotate(rows):
+            return [''.join(row[column] for row in reversed(rows)) for column in range(len(rows[0]))] if rows else []
+
+        orientation_bugs = collections.OrderedDict()
+        orientation_rows = set()
+
+        for orientation in ORIENTATIONS:
+            if orientation == 'mirror':
+                picture = [row[::-1] for row in rotate(picture)]
+            elif orientation != ORIENTATIONS[0]:
+                picture = rotate(picture)
+
+            rows = tuple(row.rstrip() for row in picture)
+
+            if rows in orientation_rows:
+                continue
+
+            orientation_rows.add(rows)
+
+            if orientation == ORIENTATIONS[0]:
+                orientation_bugs[orientation] = self
+
+                continue
+
+            bug = Bug('{filename}:{orientation}'.format(filename=self.filename, orientation=orientation), rows=rows)
+            bug._orientation = orientation
+            bug._original = self
+
+            orientation_bugs[orientation] = bug
+
+        return orientation_bugs
+
+    def _read_bug(self):
+        """Open the file representing bug and processes it."""
+        with open(self.file_path, 'r') as file_handler:
+            self.shape = self.read_parts(File.reader(file_handler))
+
+    @classmethod
+    def read_parts(cls, lines):
+        """
+        Return bug parts of the lines of a bug pattern, with ids counted from the first line having a bug part.
+
+        Blank lines before the first bug part are dropped, like the ones after the last bug part. Blank lines in
+        between are kept as gaps in bug part ids, and are rows of the bug matching any landscape line.
+
+        :param lines: Processed lines of the bug pattern. (See "File.reader")
+        :type lines: collections.Iterable[File.Line]
+        :return: Bug parts
+        :rtype: list[Bug.Part]
+        """
+        bug_parts = []
+        first_line_id = None
+
+        for line in lines:
+            if first_line_id is None:
+                first_line_id = line.id
+
+            bug_parts.append(cls.Part(tuple.__new__(File.Line, (line.id - first_line_id,) + tuple(line[1:]))))
+
+        return bug_parts
+
+    class Part(object):
+        """
+        Line of a bug pattern, with what is needed to match it computed once. Its fields are slots rather than
+        properties, so they are read fast while searching, and they are not to be changed.
+
+        - id: Id of the bug part, as the id of its line in the bug file counted from the first bug part, which is the
+          row of the bug it matches. (See "Bug.read_parts")
+        - raw_pattern: Pattern of the bug part as read from the bug file.
+        - pattern: Regular expression of the bug part. (See "_format_pattern")
+        - literal_run: Offset and characters of the longest run of the bug part to be matched literally, preferring
+          runs of more distinct characters, which are less likely to match by chance. None if the longest run is too
+          short to find candidates faster than the regular expression. (See "LITERAL_PREFILTER_MIN_LENGTH")
+          Ex: (0, "###O")
+        """
+
+        __slots__ = ('id', 'raw_pattern', 'pattern', 'literal_run', '_regex')
+
+        def __init__(self, line):
+            """
+            Initialise object.
+
+            :param line: Line object representing bug part.
+            :type line: File.Line
+            """
+            if not isinstance(line.id, int):
+                raise TypeError('Id should be int.')
+
+            if not isinstance(line.pattern, str):
+                raise TypeError('Pattern should be string.')
+
+            self.id = line.id
+            self.raw_pattern = line.pattern
+            self.pattern = self._format_pattern(line.pattern)
+            self._regex = re.compile(self.pattern) if self.pattern else None
+
+            literal_runs = [
+                literal_run for literal_run in self.literal_runs(line.pattern)
+                if len(literal_run[1]) >= LITERAL_PREFILTER_MIN_LENGTH
+            ]
+            self.literal_run = max(
+                literal_runs, key=lambda literal_run: (len(literal_run[1]), len(set(literal_run[1])))
+            ) if literal_runs else None
+
+        @classmethod
+        def precomputed(cls, part_id, raw_pattern, pattern, literal_run):
+            """
+            Return a bug part from fields computed earlier by another bug part, without computing them again.
+            The regular expression is only compiled on first use. (See "BugLibrary")
+
+            :param part_id: Id of the bug part.
+            :type part_id: int
+            :param raw_pattern: Pattern of the bug part as read from the bug file.
+            :type raw_pattern: str
+            :param pattern: Regular expression of the bug part. (See "_format_pattern")
+            :type pattern: str | None
+            :param literal_run: Offset and characters of the literal run of the bug part.
+            :type literal_run: tuple[int, str] | None
+            :rtype: Bug.Part
+            """
+            bug_part = cls.__new__(cls)
+
+            bug_part.id = part_id
+            bug_part.raw_pattern = raw_pattern
+            bug_part.pattern = pattern
+            bug_part.literal_run = literal_run
+            bug_part._regex = None
+
+            return bug_part
+
+        @property
+        def regex(self):
+            """
+            Compiled regular expression of the bug part pattern.
+
+            :type: re.RegexObject
+            """
+            if self._regex is None and self.pattern:
+                self._regex = re.compile(self.pattern)
+
+            return self._regex
+
+        @classmethod
+        def literal_runs(cls, pattern):
+            """
+            Split the bug part pattern into runs of characters to be matched literally.
+
+            Spaces match any character, except the first one of the bug part. (See "_format_pattern")
+
+            :param pattern: Raw pattern of the bug part.
+            :type pattern: str
+            :return: Offsets and characters of runs. Ex: [(offset, run)]
+            :rtype: list[tuple[int, str]]
+            """
+            runs = []
+
+            for offset, char in enumerate(pattern):
+                if offset and char == ' ':
+                    continue
+
+                if runs and runs[-1][0] + len(runs[-1][1]) == offset:
+                    runs[-1] = (runs[-1][0], runs[-1][1] + char)
+                else:
+                    runs.append((offset, char))
+
+            return runs
+
+        @classmethod
+        def _format_pattern(cls, pattern):
+            """
+            A method to convert bug ASCII characters into regular expression with lookahead.
+
+            :param pattern: Pattern of the bug part.
+            :type pattern: str
+
+            :return: Regular expression
+            :rtype: str
+            """
+            if not isinstance(pattern, str):
+                raise TypeError('Pattern should be string.')
+
+            if pattern:
+                shape_part_first_char = escape(pattern[0])
+
+                shape_part_rest_chars = escape(pattern[1:], except_chars=' ')
+                shape_part_rest_chars = re.sub(r'\s+', cls._format_bug_replace_match_with_regex, shape_part_rest_chars)
+
+                return '{first}(?={rest})'.format(first=shape_part_first_char, rest=shape_part_rest_chars)
+
+        @classmethod
+        def _format_bug_replace_match_with_regex(cls, match):
+            """
+            A method to replace match with a regular expression to look for any value with same length of match.
+
+            Ex: If match is "apfelstrudel", it will be replaced with ".{12}"
+
+            :param match: Match found from the regular expression used in "re.sub()".
+            :type match: MatchObject
+
+            :return: Regular expression
+            :rtype: str
+            """
+            length_of_space = len(match.group(0))
+
+            return '.{{{length}}}'.format(length=length_of_space)
+
+
+class Landscape(File):
+    """Represents a landscape pattern."""
+
+    def __init__(self, filename, strict=True, stream=None):
+        """
+        Initialise object.
+
+        :param filename: Name and extension of the file. (Ex: sachertorte.txt) If the file is not strict, "-" stands
+            for the standard input.
+        :type filename: str
+        :param strict: Whether the file should be a txt file in the data folder, or can be any path.
+        :type strict: bool
+        :param stream: File object to read the landscape from instead of the file. (Ex: a pipe) The filename is then
+            only used to tell the landscape, and is not checked.
+        :type stream: BinaryIO
+        """
+        if stream is None and filename == '-' and not strict:
+            stream = sys.stdin
+
+        super(Landscape, self).__init__(filename, strict=strict and stream is None)
+
+        self._stream = stream
+
+    @property
+    def stream(self):
+        """
+        File object to read the landscape from instead of the file, if any.
+
+        :type: BinaryIO | None
+        """
+        return self._stream
+
+    @property
+    def seekable(self):
+        """
+        Whether the landscape is an uncompressed file, so parts of it can be read without reading it from the start.
+        Other landscapes can only be read once from the start. (Ex: to search in a single process)
+
+        :type: bool
+        """
+        return self._stream is None and self.compression is None
+
+    def lines(self, mapped=True):
+        """
+        A generator method to return processed lines of the landscape in a single pass, decompressing it on the fly.
+
+        :param mapped: Whether to memory map uncompressed landscape files instead of reading them. Reads of a mapped
+            file happen when its memory is first touched, which blocks other threads, unlike reading it.
+        :type mapped: bool
+
+        :returns: Processed line
+        :rtype: collections.Iterable[File.Line]
+        """
+        if self._stream is not None:
+            for line in File.reader(self._stream):
+                yield line
+        elif self.compression is not None:
+            with open(self.file_path, 'rb') as file_handler:
+                for line in File.block_reader(File.decompressed_blocks(file_handler, self.compression)):
+                    yield line
+        else:
+            with open(self.file_path, 'r') as file_handler:
+                for line in File.mapped_reader(file_handler) if mapped else File.reader(file_handler):
+                    yield line
+
+
+class BugPartMatchWindow(object):
+    """Holds bug part matches of the last -bug height amount- of landscape lines in a ring buffer."""
+
+    def __init__(self, size):
+        """
+        Initialise object.
+
+        :param size: Amount of landscape lines to hold bug part matches for. (Ex: bug height)
+        :type size: int
+        """
+        super(BugPartMatchWindow, self).__init__()
+
+        self.size = size
+
+        self._line_ids = [None] * size
+        self._lines = [None] * size
+
+    @property
+    def size(self):
+        """
+        Amount of landscape lines the window holds bug part matches for.
+
+        :type: int
+        """
+        return self._size
+
+    @size.setter
+    def size(self, value):
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise TypeError('Size should be int.')
+
+        if value < 1:
+            raise ValueError('Size should be positive.')
+
+        self._size = value
+
+    def __getitem__(self, line_id):
+        """
+        Return bug part matches of landscape line, replacing the line it shares the slot with.
+
+        Lines are only looked back -window size- amount, so the replaced line is never needed again.
+
+        :param line_id: Id of the landscape line.
+        :type line_id: int
+        :return: Bug part matches of the line. Ex: {bug_part_id: {bug_part_match_position}}
+        :rtype: dict
+        """
+        slot = line_id % self.size
+
+        if self._line_ids[slot] != line_id:
+            self._line_ids[slot] = line_id
+            self._lines[slot] = collections.defaultdict(set)
+
+        return self._lines[slot]
+
+    def __contains__(self, line_id):
+        return line_id in self._line_ids
+
+    def __iter__(self):
+        return iter(sorted(line_id for line_id in self._line_ids if line_id is not None))
+
+    def __len__(self):
+        return len(self._line_ids) - self._line_ids.count(None)
+
+
+class BugSearch(object):
+    """Holds the state of searching a bug in landscape lines. Engines searching bugs in different ways extend it."""
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(BugSearch, self).__init__()
+
+        self.bug = bug
+
+        self._bug_count = 0
+        self._found_bugs = None
+
+    @property
+    def bug(self):
+        """
+        Object representing bug pattern.
+
+        :type: Bug
+        """
+        return self._bug
+
+    @bug.setter
+    def bug(self, value):
+        if not isinstance(value, Bug):
+            raise TypeError('Bug is either incorrect or not provided.')
+
+        self._bug = value
+        self._shape = value.compiled_shape
+
+    @property
+    def bug_count(self):
+        """
+        Number of times a bug is found in the landscape.
+
+        :type: int
+        """
+        return self._bug_count
+
+    def increment_bug_count(self, amount=1):
+        """
+        Increment number of times a bug is found in the landscape.
+
+        :param amount: Amount to increment by.
+        :type amount: int
+        """
+        self._bug_count += amount
+
+    @property
+    def found_bugs(self):
+        """
+        Bugs found since collecting them started, or since they were last popped, as their first line id and column.
+        None if bugs found are not collected, which is the default, so engines do not spend time on positions of bugs
+        when only counts are needed. (See "collect_found_bugs")
+
+        Ex: [(line_id, column)]
+
+        :type: list[tuple[int, int]] | None
+        """
+        return self._found_bugs
+
+    def collect_found_bugs(self, collect=True):
+        """
+        Start or stop collecting bugs found.
+
+        :param collect: Whether to collect bugs found.
+        :type collect: bool
+        """
+        self._found_bugs = [] if collect else None
+
+    def pop_found_bugs(self):
+        """
+        Return bugs found so far and forget them.
+
+        :return: Bugs found as their first line id and column.
+        :rtype: list[tuple[int, int]]
+        """
+        found_bugs, self._found_bugs = self._found_bugs, []
+
+        return found_bugs
+
+    def add_found_bugs(self, landscape_line, columns):
+        """
+        Add bugs ending in the landscape line to the bugs found.
+
+        :param landscape_line: Landscape line the bugs end in.
+        :type landscape_line: File.Line
+        :param columns: Columns of the bugs.
+        :type columns: collections.Iterable[int]
+        """
+        first_line_id = landscape_line.id - self._shape.height + 1
+
+        self._found_bugs.extend((first_line_id, column) for column in columns)
+
+    def get_state(self):
+        """
+        Return the state of the search, to continue it later with the lines following the last line searched.
+
+        :return: JSON serializable state. (See "set_state")
+        :rtype: dict
+        """
+        return {'bug_count': self._bug_count}
+
+    def set_state(self, state):
+        """
+        Continue the search from a state returned by "get_state".
+
+        :param state: State of the search.
+        :type state: dict
+        """
+        self._bug_count = state['bug_count']
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bugs in the next landscape line.
+
+        :param landscape_line: Landscape line to search in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        """
+        raise NotImplementedError
+
+
+class RegexBugSearch(BugSearch):
+    """Searches a bug by matching bug parts with regular expressions having lookahead in each landscape line."""
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(RegexBugSearch, self).__init__(bug)
+
+        self._bug_part_matches = BugPartMatchWindow(max(self._shape.height, 1))
+        self._previous_bug_parts = dict(
+            (bug_part.id, previous_bug_part)
+            for previous_bug_part, bug_part in zip(self._shape.parts[:-1], self._shape.parts[1:])
+        )
+
+    @property
+    def bug_part_matches(self):
+        """
+        Hold occurrences of bug part matches of the last -bug height amount- of lines. Is a window of default dict
+        of set per line, so matches are registered, looked up and deregistered in constant time.
+
+        Ex: {line_number: {bug_part_id: {bug_part_match_position}}}
+
+        :type: BugPartMatchWindow
+        """
+        return self._bug_part_matches
+
+    def get_state(self):
+        state = super(RegexBugSearch, self).get_state()
+        state['bug_part_matches'] = [
+            [
+                line_id,
+                [
+                    (bug_part_id, sorted(bug_part_match_positions))
+                    for bug_part_id, bug_part_match_positions in self.bug_part_matches[line_id].items()
+                ]
+            ]
+            for line_id in self.bug_part_matches
+        ]
+
+        return state
+
+    def set_state(self, state):
+        super(RegexBugSearch, self).set_state(state)
+
+        self._bug_part_matches = BugPartMatchWindow(self.bug_part_matches.size)
+        for line_id, bug_part_matches in state['bug_part_matches']:
+            for bug_part_id, bug_part_match_positions in bug_part_matches:
+                self.bug_part_matches[line_id][bug_part_id] = set(bug_part_match_positions)
+
+    def bug_part_match_exists(self, bug_part, landscape_line):
+        """
+        Return whether a bug part match was registered in line.
+
+        :param bug_part: Bug part to look for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Line to look for bug part match in.
+        :type landscape_line: File.line
+        """
+        if bug_part.id in self.bug_part_matches[landscape_line.id]:
+            return True
+
+        return False
+
+    def register_bug_part_match(self, bug_part, landscape_line, bug_part_match_position):
+        """
+        When a bug part match is found, register it.
+
+        The registrations are to be later checked with other bug part matches to determine
+        whether registered bug part matches form a bug.
+        
+        :param bug_part: Bug part matched.
+        :type bug_part: Bug.Part
+        :param landscape_line: Line where the match is found in.
+        :type landscape_line: File.Line
+        :param bug_part_match_position: Match start position in line.
+        :type bug_part_match_position: int
+        """
+        self.bug_part_matches[landscape_line.id][bug_part.id].add(bug_part_match_position)
+
+    def deregister_bug_match(self, landscape_line, bug_part_match_position):
+        """
+        When a bug match is found, deregister individual bug part matches.
+
+        This way found bugs later won't be used in checking for additional bugs. (Disallow conjoined twin bugs.)
+
+        :param landscape_line: Line where the match of the last part of the bug is found in.
+        :type landscape_line: File.Line
+        :param bug_part_match_position: Match start position of the last part of bug in line.
+        :type bug_part_match_position: int
+        """
+        first_landscape_line_number = landscape_line.id - self._shape.last_part_id
+
+        for bug_part in reversed(self._shape.parts):
+            self.bug_part_matches[first_landscape_line_number + bug_part.id][bug_part.id].discard(
+                bug_part_match_position
+            )
+
+    def should_skip_all_bug_parts_in_line(self, bug_part, landscape_line):
+        """
+        Tell whether remaining bug part and remaining parts to check should be skipped.
+
+        In the first -bug height amount- of lines, if no match for bug part found, skip remaining bug parts
+        in the same line.
+
+        :param bug_part: Bug part to check for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to check in.
+        :type landscape_line: File.line
+        :return: Whether to skip
+        :rtype: bool
+        """
+        if landscape_line.id - bug_part.id <= 0:
+            if not self.bug_part_match_exists(bug_part, landscape_line):
+                return True
+
+        return False
+
+    def should_skip_bug_part_in_line(self, bug_part, landscape_line):
+        """
+        Tell whether bug part to check should be skipped.
+
+        If previous bug part is not found in the line as many lines before as it is rows before in the bug, skip.
+
+        :param bug_part: Bug part to check for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to check in.
+        :type landscape_line: File.Line
+        :return: Whether to skip
+        :rtype: bool
+        """
+        previous_bug_part = self._previous_bug_parts.get(bug_part.id)
+
+        if previous_bug_part is not None:
+            previous_landscape_line_number = landscape_line.id - bug_part.id + previous_bug_part.id
+
+            if previous_landscape_line_number >= 0:
+                if previous_bug_part.id not in self.bug_part_matches[previous_landscape_line_number]:
+                    return True
+
+        return False
+
+    def bug_part_match_belongs_to_a_bug(self, bug_part, landscape_line, bug_part_match_position):
+        """
+        Return whether bug part match is part of a bug.
+
+        If the matched bug part is the last part of its shape, then checks whether previous parts exist in previous
+        lines at the same match position.
+
+        :param bug_part: Bug part to check for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to bug part match is found in.
+        :type landscape_line: File.Line
+        :param bug_part_match_position: Position of match in the line.
+        :type bug_part_match_position: int
+        :return: Whether bug part match is part of a bug.
+        :rtype: bool
+        """
+        if bug_part.id == self._shape.last_part_id:
+            first_landscape_line_number = landscape_line.id - bug_part.id
+
+            for bug_part in reversed(self._shape.parts[:-1]):
+                bug_part_matches = self.bug_part_matches[first_landscape_line_number + bug_part.id]
+
+                if bug_part_match_position not in bug_part_matches[bug_part.id]:
+                    return False
+
+            return True
+
+        return False
+
+    def match_bug_part(self, bug_part, landscape_line):
+        """
+        Run the regular expression of bug part over landscape line.
+
+        If the bug part has a literal run long enough, it is looked for with a substring search instead, and the
+        regular expression is only run where the run is found, if there is more to the bug part than the run. Lines
+        not having the run are skipped without running the regular expression at all. (See "Bug.Part.literal_run")
+
+        :param bug_part: Bug part to look for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to look for bug part in.
+        :type landscape_line: File.Line
+        :return: Bug part match positions
+        :rtype: list[int]
+        """
+        buffer, start, end = landscape_line.buffer, landscape_line.start, landscape_line.end
+
+        if bug_part.literal_run is None:
+            return [bug_part_match.start() - start for bug_part_match in bug_part.regex.finditer(buffer, start, end)]
+
+        literal_offset, literal_run = bug_part.literal_run
+        regex_match = bug_part.regex.match if literal_run != bug_part.raw_pattern else None
+
+        bug_part_match_positions = []
+        literal_position = buffer.find(literal_run, start + literal_offset, end)
+
+        while literal_position >= 0:
+            position = literal_position - literal_offset
+
+            if regex_match is None or regex_match(buffer, position, end):
+                bug_part_match_positions.append(position - start)
+
+            literal_position = buffer.find(literal_run, literal_position + 1, end)
+
+        return bug_part_match_positions
+
+    def find_bug_part_match_positions(self, bug_part, landscape_line, line_cache=None):
+        """
+        Return start positions of bug part matches in landscape line.
+
+        Positions are shared through the line cache with other searches having an identical bug part.
+
+        :param bug_part: Bug part to look for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to look for bug part in.
+        :type landscape_line: File.Line
+        :param line_cache: Matches found in the same landscape line so far. Ex: {bug_part_pattern: [position]}
+        :type line_cache: dict
+        :return: Bug part match positions
+        :rtype: list[int]
+        """
+        if line_cache is None:
+            return self.match_bug_part(bug_part, landscape_line)
+
+        bug_part_match_positions = line_cache.get(bug_part.pattern)
+
+        if bug_part_match_positions is None:
+            bug_part_match_positions = line_cache[bug_part.pattern] = self.match_bug_part(bug_part, landscape_line)
+
+        return bug_part_match_positions
+
+    def find_bug_part_and_bugs_in_landscape_line(self, bug_part, landscape_line, line_cache=None):
+        """
+        Find bug part matches in landscape line.
+
+        If a bug part mack is found, check whether it belongs to a bug.
 
         :param bug_part: Bug part to check for.
         :type bug_part: Bug.Part
-        :param landscape_line: Landscape line to bug part match is found in.
+        :param landscape_line: Landscape line to check bug part in.
+        :type landscape_line: File.Line
+        :param line_cache: Matches found in the same landscape line by other searches.
+        :type line_cache: dict
+        """
+        for bug_part_match_position in self.find_bug_part_match_positions(bug_part, landscape_line, line_cache):
+            self.register_bug_part_match(bug_part, landscape_line, bug_part_match_position)
+
+            if self.bug_part_match_belongs_to_a_bug(bug_part, landscape_line, bug_part_match_position):
+                self.increment_bug_count()
+                self.deregister_bug_match(landscape_line, bug_part_match_position)
+
+                if self._found_bugs is not None:
+                    self.add_found_bugs(landscape_line, [bug_part_match_position])
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bug parts and bugs in the next landscape line.
+
+        :param landscape_line: Landscape line to check bug parts in.
+        :type landscape_line: File.Line
+        :param line_cache: Matches found in the same landscape line by other searches.
+        :type line_cache: dict
+        """
+        for bug_part in self._shape.parts:
+            if self.should_skip_bug_part_in_line(bug_part, landscape_line):
+                continue
+
+            self.find_bug_part_and_bugs_in_landscape_line(bug_part, landscape_line, line_cache)
+
+            if self.should_skip_all_bug_parts_in_line(bug_part, landscape_line):
+                break
+
+
+class SparseBugSearch(RegexBugSearch):
+    """
+    Searches a bug like "RegexBugSearch", but only in the content of landscape lines, for very wide landscapes which
+    are mostly whitespace with small islands of content.
+
+    Lines are split into islands at runs of spaces longer than any whitespace run in the bug parts, so a bug part match
+    is never in more than one island. Islands of a line are joined into a content line, each of them keeping the spaces
+    next to it that bug parts can start or end in, and bug parts are matched in the content line only. So each bug part
+    reads the content of the line rather than all of its width, and the line is read in full only once to find islands,
+    however many bugs and bug parts are searched. Runs shorter than "SPARSE_MIN_GAP" do not split islands, as joining
+    many small islands costs more than reading the spaces between them.
+    """
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(SparseBugSearch, self).__init__(bug)
+
+        island_gap = max([SPARSE_MIN_GAP] + [
+            len(whitespace) for bug_part in self._shape.parts for whitespace in re.findall(r'\s+', bug_part.raw_pattern)
+        ])
+
+        # Spaces kept on each side of an island, which are more than a bug part can start or end with.
+        self._island_margin = island_gap + 1
+        # Starting with literal spaces rather than a repetition lets the regular expression engine skip to gaps fast.
+        self._island_gap_regex = re.compile(' ' * (island_gap + 1) + ' *')
+
+        self._content_line_source = None
+        self._content_line = None
+        self._line_cache = None
+
+    def content_line(self, landscape_line, line_cache=None):
+        """
+        Return the islands of the landscape line joined into a line, with the offset of each island in it.
+
+        Content lines are shared through the line cache with other searches splitting lines the same way.
+
+        :param landscape_line: Landscape line to find islands in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        :return: Content line, offsets of islands in it, and how far each island is moved left from its position in the
+            landscape line. None if the line is a single island.
+        :rtype: tuple[File.Line, list[int], list[int]] | None
+        """
+        if self._content_line_source is landscape_line:
+            return self._content_line
+
+        cache_key = (SparseBugSearch, self._island_margin)
+        content_line = line_cache.get(cache_key, False) if line_cache is not None else False
+
+        if content_line is False:
+            buffer, start, end = landscape_line.buffer, landscape_line.start, landscape_line.end
+            island_start = start
+            islands = []
+            island_offsets = []
+            island_shifts = []
+            content_length = 0
+
+            # Lines are stripped of trailing whitespace, so there is an island after each gap.
+            for gap in self._island_gap_regex.finditer(buffer, start, end):
+                island_end = gap.start() + self._island_margin
+
+                islands.append(buffer[island_start:island_end])
+                island_offsets.append(content_length)
+                island_shifts.append(island_start - start - content_length)
+                content_length += island_end - island_start
+
+                island_start = gap.end() - self._island_margin
+
+            if islands:
+                islands.append(buffer[island_start:end])
+                island_offsets.append(content_length)
+                island_shifts.append(island_start - start - content_length)
+
+                content_pattern = ''.join(islands)
+                content_line = (
+                    tuple.__new__(File.Line, (landscape_line.id, content_pattern, 0, len(content_pattern))),
+                    island_offsets, island_shifts
+                )
+            else:
+                content_line = None
+
+            if line_cache is not None:
+                line_cache[cache_key] = content_line
+
+        self._content_line_source = landscape_line
+        self._content_line = content_line
+
+        return content_line
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        self._line_cache = line_cache
+
+        super(SparseBugSearch, self).search_landscape_line(landscape_line, line_cache)
+
+    def match_bug_part(self, bug_part, landscape_line):
+        """
+        Match the bug part in the content line of the landscape line only. (See "content_line")
+
+        :param bug_part: Bug part to look for.
+        :type bug_part: Bug.Part
+        :param landscape_line: Landscape line to look for bug part in.
+        :type landscape_line: File.Line
+        :return: Bug part match positions
+        :rtype: list[int]
+        """
+        content_line = self.content_line(landscape_line, self._line_cache)
+
+        if content_line is None:
+            return super(SparseBugSearch, self).match_bug_part(bug_part, landscape_line)
+
+        content_line, island_offsets, island_shifts = content_line
+
+        return [
+            position + island_shifts[bisect.bisect_right(island_offsets, position) - 1]
+            for position in super(SparseBugSearch, self).match_bug_part(bug_part, content_line)
+        ]
+
+
+class NumpyBugSearch(BugSearch):
+    """Searches a bug by AND-ing shifted equality masks of bug part cells over landscape lines as NumPy arrays."""
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        if import_numpy() is None:
+            raise ImportError('NumPy is required to search bugs with the numpy engine.')
+
+        super(NumpyBugSearch, self).__init__(bug)
+
+        self._bug_row_cells = [None] * self._shape.height
+        for bug_part in self._shape.parts:
+            self._bug_row_cells[bug_part.id] = self.bug_part_cells(bug_part)
+
+        self._chain_masks = []
+        self._last_line_id = None
+
+    @classmethod
+    def bug_part_cells(cls, bug_part):
+        """
+        Return cells of the bug part to compare with the landscape.
+
+        Spaces match any character, except the first one of the bug part. (See "Bug.Part._format_pattern")
+
+        :param bug_part: Bug part to get cells of.
+        :type bug_part: Bug.Part
+        :return: Offsets and character codes of cells. Ex: [(offset, code)]
+        :rtype: list[tuple[int, int]]
+        """
+        return [
+            (offset, ord(char))
+            for offset, char in enumerate(bug_part.raw_pattern)
+            if offset == 0 or char != ' '
+        ]
+
+    def get_state(self):
+        state = super(NumpyBugSearch, self).get_state()
+        state['last_line_id'] = self._last_line_id
+        state['chain_masks'] = [
+            [len(chain_mask), numpy.flatnonzero(chain_mask).tolist()] if chain_mask is not None else None
+            for chain_mask in self._chain_masks
+        ]
+
+        return state
+
+    def set_state(self, state):
+        super(NumpyBugSearch, self).set_state(state)
+
+        self._last_line_id = state['last_line_id']
+        self._chain_masks = []
+
+        for chain_mask_positions in state['chain_masks']:
+            chain_mask = None
+
+            if chain_mask_positions is not None:
+                chain_mask = numpy.zeros(chain_mask_positions[0], dtype=bool)
+                chain_mask[chain_mask_positions[1]] = True
+
+            self._chain_masks.append(chain_mask)
+
+    @classmethod
+    def landscape_line_array(cls, landscape_line, padding, line_cache=None):
+        """
+        Return the landscape line as an array of character codes, padded with zeros that never match a cell.
+
+        :param landscape_line: Landscape line to convert.
+        :type landscape_line: File.Line
+        :param padding: Minimum number of zeros to pad with.
+        :type padding: int
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        :return: Line array
+        :rtype: numpy.ndarray
+        """
+        if line_cache is not None:
+            line_array = line_cache.get(cls)
+
+            if line_array is not None and len(line_array) >= landscape_line.end - landscape_line.start + padding:
+                return line_array
+
+        line_length = landscape_line.end - landscape_line.start
+
+        line_array = numpy.zeros(line_length + padding, dtype=numpy.uint8)
+        line_array[:line_length] = numpy.frombuffer(
+            landscape_line.buffer, dtype=numpy.uint8, count=line_length, offset=landscape_line.start
+        )
+
+        if line_cache is not None:
+            line_cache[cls] = line_array
+
+        return line_array
+
+    def skip_blank_landscape_lines(self, landscape_line):
+        """
+        Carry chain masks over the blank landscape lines before the landscape line, which readers do not return.
+
+        Only chains followed by blank rows of the bug go on over a blank line. Others, and all chains if there are
+        more blank lines than the bug is high, are dropped.
+
+        :param landscape_line: Landscape line to search in next.
+        :type landscape_line: File.Line
+        """
+        blank_line_count = landscape_line.id - self._last_line_id - 1 if self._last_line_id is not None else None
+
+        if blank_line_count is None or not 0 <= blank_line_count < self._shape.height:
+            self._chain_masks = []
+
+            return
+
+        for _ in range(blank_line_count):
+            self._chain_masks = [None] + [
+                self._chain_masks[bug_row_id - 1] if self._bug_row_cells[bug_row_id] is None else None
+                for bug_row_id in range(1, len(self._chain_masks))
+            ]
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bugs ending in the next landscape line.
+
+        A chain mask is kept for each bug row, telling positions where the bug matched up to that row ending in the
+        previous line. Chains of the last row are bugs and are not carried to the next line, so parts of a found bug
+        are not used in other bugs. (See "RegexBugSearch.deregister_bug_match") Blank rows of the bug carry chains
+        on without a check, as they match any landscape line.
+
+        :param landscape_line: Landscape line to search in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        """
+        self.skip_blank_landscape_lines(landscape_line)
+        self._last_line_id = landscape_line.id
+
+        line_length = landscape_line.end - landscape_line.start
+        line_array = self.landscape_line_array(landscape_line, self._shape.width, line_cache)
+
+        chain_masks = []
+        for bug_row_id, bug_part_cells in enumerate(self._bug_row_cells):
+            if bug_row_id:
+                if bug_row_id > len(self._chain_masks) or self._chain_masks[bug_row_id - 1] is None:
+                    chain_masks.append(None)
+
+                    continue
+
+                if bug_part_cells is None:
+                    chain_masks.append(self._chain_masks[bug_row_id - 1])
+
+                    continue
+
+                chain_mask = self._chain_masks[bug_row_id - 1][:line_length].copy()
+            else:
+                chain_mask = numpy.ones(line_length, dtype=bool)
+
+            for offset, code in bug_part_cells:
+                chain_mask &= line_array[offset:offset + len(chain_mask)] == code
+
+            chain_masks.append(chain_mask if chain_mask.any() else None)
+
+        bug_mask = chain_masks.pop() if chain_masks else None
+
+        if bug_mask is not None:
+            self.increment_bug_count(int(numpy.count_nonzero(bug_mask)))
+
+            if self._found_bugs is not None:
+                self.add_found_bugs(landscape_line, numpy.flatnonzero(bug_mask).tolist())
+
+        self._chain_masks = chain_masks
+
+
+class BakerBirdBugSearch(BugSearch):
+    """
+    Searches a bug in time linear to the landscape size, following Baker-Bird two dimensional pattern matching.
+
+    Each landscape line is labelled with the distinct bug rows matching at each position using an Aho-Corasick
+    automaton, then sequences of labels are matched down the columns. Since spaces in bug rows match any character, a
+    position can match several distinct rows at once, so the columns are scanned with a bit parallel (Shift-And)
+    automaton instead of KMP, which needs a single label per position.
+    """
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(BakerBirdBugSearch, self).__init__(bug)
+
+        bug_row_ids = collections.OrderedDict()
+        for bug_part in self._shape.parts:
+            bug_row_ids.setdefault(bug_part.raw_pattern, len(bug_row_ids))
+
+        self._bug_row_masks = [0] * len(bug_row_ids)
+        for bug_part in self._shape.parts:
+            self._bug_row_masks[bug_row_ids[bug_part.raw_pattern]] |= 1 << bug_part.id
+
+        self._blank_row_mask = (1 << self._shape.height) - 1 if self._shape.height else 0
+        for bug_part in self._shape.parts:
+            self._blank_row_mask &= ~(1 << bug_part.id)
+
+        self._bug_row_segment_counts = []
+        segment_uses = collections.defaultdict(list)
+        for bug_row, bug_row_id in bug_row_ids.items():
+            segments = self.bug_row_segments(bug_row)
+
+            self._bug_row_segment_counts.append(len(segments))
+            for offset, segment in segments:
+                segment_uses[segment].append((bug_row_id, offset))
+
+        self._segment_uses = dict(segment_uses)
+        self._automaton = self.Automaton(self._segment_uses)
+
+        self._bug_mask = 1 << (self._shape.height - 1) if self._shape.height else 0
+        self._column_states = {}
+        self._last_line_id = None
+
+    @classmethod
+    def bug_row_segments(cls, bug_row):
+        """
+        Split the bug row into runs of characters to be matched literally. (See "Bug.Part.literal_runs")
+
+        :param bug_row: Raw pattern of the bug part.
+        :type bug_row: str
+        :return: Offsets and characters of runs. Ex: [(offset, run)]
+        :rtype: list[tuple[int, str]]
+        """
+        return Bug.Part.literal_runs(bug_row)
+
+    def get_state(self):
+        state = super(BakerBirdBugSearch, self).get_state()
+        state['last_line_id'] = self._last_line_id
+        state['column_states'] = sorted(self._column_states.items())
+
+        return state
+
+    def set_state(self, state):
+        super(BakerBirdBugSearch, self).set_state(state)
+
+        self._last_line_id = state['last_line_id']
+        self._column_states = dict(state['column_states'])
+
+    def label_landscape_line(self, landscape_line):
+        """
+        Label positions of the landscape line with the distinct bug rows matching there.
+
+        :param landscape_line: Landscape line to label.
+        :type landscape_line: File.Line
+        :return: Ids of the bug rows matching at each position, as bits. Ex: {position: bug_row_bits}
+        :rtype: dict[int, int]
+        """
+        segment_counts = collections.defaultdict(int)
+        labels = collections.defaultdict(int)
+
+        for segment_end, segment in self._automaton.find_all(landscape_line.pattern):
+            segment_start = segment_end - len(segment) + 1
+
+            for bug_row_id, offset in self._segment_uses[segment]:
+                position = segment_start - offset
+
+                if position < 0:
+                    continue
+
+                segment_counts[bug_row_id, position] += 1
+
+                if segment_counts[bug_row_id, position] == self._bug_row_segment_counts[bug_row_id]:
+                    labels[position] |= self._bug_row_masks[bug_row_id]
+
+        return labels
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bugs ending in the next landscape line.
+
+        A state is kept for each column, telling bug rows as bits, which matched in sequence ending in the previous
+        line. States reaching the last row are bugs and are not carried to the next line, so parts of a found bug are
+        not used in other bugs. (See "RegexBugSearch.deregister_bug_match") Blank rows of the bug match at every
+        position, as they match any landscape line.
+
+        :param landscape_line: Landscape line to search in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        """
+        blank_line_count = landscape_line.id - self._last_line_id - 1 if self._last_line_id is not None else None
+
+        if blank_line_count is None or not 0 <= blank_line_count < self._shape.height:
+            self._column_states = {}
+        else:
+            for _ in range(blank_line_count):
+                self._column_states = dict(
+                    (position, column_state)
+                    for position, column_state in (
+                        (position, (column_state << 1) & self._blank_row_mask)
+                        for position, column_state in self._column_states.items()
+                    )
+                    if column_state
+                )
+
+        self._last_line_id = landscape_line.id
+
+        labels = self.label_landscape_line(landscape_line)
+
+        if self._blank_row_mask:
+            for position in self._column_states:
+                labels[position] |= self._blank_row_mask
+
+        column_states = {}
+        for position, label in labels.items():
+            column_state = ((self._column_states.get(position, 0) << 1) | 1) & label
+
+            if column_state & self._bug_mask:
+                self.increment_bug_count()
+
+                if self._found_bugs is not None:
+                    self.add_found_bugs(landscape_line, [position])
+
+                column_state ^= self._bug_mask
+
+            if column_state:
+                column_states[position] = column_state
+
+        self._column_states = column_states
+
+    class Automaton(object):
+        """Aho-Corasick automaton to find all occurrences of many strings in a single pass over a text."""
+
+        def __init__(self, keywords):
+            """
+            Initialise object.
+
+            :param keywords: Strings to find.
+            :type keywords: collections.Iterable[str]
+            """
+            super(BakerBirdBugSearch.Automaton, self).__init__()
+
+            self._transitions = [{}]
+            self._outputs = [[]]
+
+            for keyword in keywords:
+                state = 0
+
+                for char in keyword:
+                    if char not in self._transitions[state]:
+                        self._transitions.append({})
+                        self._outputs.append([])
+                        self._transitions[state][char] = len(self._transitions) - 1
+
+                    state = self._transitions[state][char]
+
+                self._outputs[state].append(keyword)
+
+            self._failures = [0] * len(self._transitions)
+
+            queue = collections.deque(self._transitions[0].values())
+            while queue:
+                state = queue.popleft()
+
+                for char, next_state in self._transitions[state].items():
+                    failure = self._failures[state]
+
+                    while failure and char not in self._transitions[failure]:
+                        failure = self._failures[failure]
+
+                    failure = self._transitions[failure].get(char, 0)
+
+                    self._failures[next_state] = failure
+                    self._outputs[next_state] = self._outputs[next_state] + self._outputs[failure]
+
+                    queue.append(next_state)
+
+        def find_all(self, text):
+            """
+            A generator method to return all occurrences of keywords in the text.
+
+            :param text: Text to look for keywords in.
+            :type text: str
+
+            :returns: End position in the text and the keyword found.
+            :rtype: collections.Iterable[tuple[int, str]]
+            """
+            transitions = self._transitions
+            failures = self._failures
+            outputs = self._outputs
+
+            state = 0
+            for position, char in enumerate(text):
+                while state and char not in transitions[state]:
+                    state = failures[state]
+
+                state = transitions[state].get(char, 0)
+
+                for keyword in outputs[state]:
+                    yield position, keyword
+
+
+class BitsetBugSearch(BugSearch):
+    """
+    Searches a bug by AND-ing shifted character masks of landscape lines as Python ints, one bit per position.
+
+    Each bug part is matched at all positions of a line in a few big int operations, without any per position loop in
+    Python, so it suits wide lines with many candidate positions.
+    """
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(BitsetBugSearch, self).__init__(bug)
+
+        self._bug_row_cells = [None] * self._shape.height
+        for bug_part in self._shape.parts:
+            self._bug_row_cells[bug_part.id] = [
+                (offset, chr(code)) for offset, code in NumpyBugSearch.bug_part_cells(bug_part)
+            ]
+
+        self._translation_tables = dict(
+            (char, self.translation_table(char))
+            for bug_part_cells in self._bug_row_cells if bug_part_cells is not None
+            for _, char in bug_part_cells
+        )
+
+        self._chain_masks = []
+        self._last_line_id = None
+
+    @classmethod
+    def translation_table(cls, char):
+        """
+        Return the table to translate a text into a binary number string having "1" where the character is.
+
+        :param char: Character to find.
+        :type char: str
+        :rtype: str
+        """
+        return ''.join('1' if chr(code) == char else '0' for code in range(256))
+
+    def get_state(self):
+        state = super(BitsetBugSearch, self).get_state()
+        state['last_line_id'] = self._last_line_id
+        state['chain_masks'] = self._chain_masks
+
+        return state
+
+    def set_state(self, state):
+        super(BitsetBugSearch, self).set_state(state)
+
+        self._last_line_id = state['last_line_id']
+        self._chain_masks = list(state['chain_masks'])
+
+    @classmethod
+    def mask_positions(cls, mask):
+        """
+        A generator method to return positions of the bits set in the mask, in order.
+
+        :param mask: Mask of positions.
+        :type mask: int | long
+
+        :returns: Position
+        :rtype: collections.Iterable[int]
+        """
+        while mask:
+            lowest_bit = mask & -mask
+
+            yield lowest_bit.bit_length() - 1
+
+            mask ^= lowest_bit
+
+    def char_masks(self, landscape_line, line_cache=None):
+        """
+        Return masks of the characters of the bug in the landscape line, having bit i set if the character is at
+        position i.
+
+        :param landscape_line: Landscape line to get masks of.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        :return: Character masks. Ex: {char: mask}
+        :rtype: dict[str, int | long]
+        """
+        char_masks = line_cache.setdefault(BitsetBugSearch, {}) if line_cache is not None else {}
+        pattern = None
+
+        for char, translation_table in self._translation_tables.items():
+            if char in char_masks:
+                continue
+
+            if pattern is None:
+                pattern = landscape_line.pattern
+
+            char_masks[char] = int(pattern.translate(translation_table)[::-1], 2) if char in pattern else 0
+
+        return char_masks
+
+    def skip_blank_landscape_lines(self, landscape_line):
+        """
+        Carry chain masks over the blank landscape lines before the landscape line, which readers do not return.
+        (See "NumpyBugSearch.skip_blank_landscape_lines")
+
+        :param landscape_line: Landscape line to search in next.
         :type landscape_line: File.Line
-        :param bug_part_match_position: Position of match in the line.
-        :type bug_part_match_position: int
-        :return: Whether bug part match is part of a bug.
+        """
+        blank_line_count = landscape_line.id - self._last_line_id - 1 if self._last_line_id is not None else None
+
+        if blank_line_count is None or not 0 <= blank_line_count < self._shape.height:
+            self._chain_masks = []
+
+            return
+
+        for _ in range(blank_line_count):
+            self._chain_masks = [0] + [
+                self._chain_masks[bug_row_id - 1] if self._bug_row_cells[bug_row_id] is None else 0
+                for bug_row_id in range(1, len(self._chain_masks))
+            ]
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bugs ending in the next landscape line.
+
+        A chain mask is kept for each bug row, telling positions where the bug matched up to that row ending in the
+        previous line. Chains of the last row are bugs and are not carried to the next line, so parts of a found bug
+        are not used in other bugs. (See "RegexBugSearch.deregister_bug_match") Blank rows of the bug carry chains
+        on without a check, as they match any landscape line.
+
+        :param landscape_line: Landscape line to search in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        """
+        self.skip_blank_landscape_lines(landscape_line)
+        self._last_line_id = landscape_line.id
+
+        char_masks = None
+        chain_masks = []
+        for bug_row_id, bug_part_cells in enumerate(self._bug_row_cells):
+            if bug_row_id:
+                chain_mask = self._chain_masks[bug_row_id - 1] if bug_row_id <= len(self._chain_masks) else 0
+
+                if not chain_mask or bug_part_cells is None:
+                    chain_masks.append(chain_mask)
+
+                    continue
+            else:
+                chain_mask = (1 << (landscape_line.end - landscape_line.start)) - 1
+
+            if char_masks is None:
+                char_masks = self.char_masks(landscape_line, line_cache)
+
+            for offset, char in bug_part_cells:
+                chain_mask &= char_masks[char] >> offset
+
+            if not bug_part_cells:
+                chain_mask &= (1 << (landscape_line.end - landscape_line.start)) - 1
+
+            chain_masks.append(chain_mask)
+
+        bug_mask = chain_masks.pop() if chain_masks else 0
+
+        if bug_mask:
+            self.increment_bug_count(bin(bug_mask).count('1'))
+
+            if self._found_bugs is not None:
+                self.add_found_bugs(landscape_line, self.mask_positions(bug_mask))
+
+        self._chain_masks = chain_masks
+
+
+ENGINES = collections.OrderedDict([
+    ('regex', RegexBugSearch),
+    ('numpy', NumpyBugSearch),
+    ('bakerbird', BakerBirdBugSearch),
+    ('bitset', BitsetBugSearch),
+    ('sparse', SparseBugSearch),
+])
+
+
+class InstrumentedBugSearch(BugSearch):
+    """
+    Counts landscape lines searched and time spent by a search.
+
+    Engines are combined with it only when statistics are asked for, so searches without statistics pay nothing for
+    counting. (See "INSTRUMENTED_ENGINES")
+    """
+
+    def __init__(self, bug):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        """
+        super(InstrumentedBugSearch, self).__init__(bug)
+
+        self._counters = collections.Counter()
+        self._bug_part_counters = collections.defaultdict(collections.Counter)
+
+    @property
+    def stats(self):
+        """
+        Statistics of the search. Counters per bug part are keyed by bug part id.
+
+        Ex: {"bug": "bug.txt", "bug_count": 3, "lines_searched": 7, "seconds": 0.01, "regex_invocations": {0: 7}}
+
+        :type: dict
+        """
+        stats = dict(self._counters)
+        stats.update((name, dict(counter)) for name, counter in self._bug_part_counters.items())
+        stats.update(bug=self.bug.filename, bug_count=self.bug_count)
+
+        return stats
+
+    def add_stats(self, stats):
+        """
+        Add statistics of the same search done elsewhere. (Ex: in a worker process)
+
+        :param stats: Statistics to add. (See "stats")
+        :type stats: dict
+        """
+        for name, value in stats.items():
+            if isinstance(value, dict):
+                self._bug_part_counters[name].update(value)
+            elif name not in ('bug', 'bug_count'):
+                self._counters[name] += value
+
+    def search_landscape_line(self, landscape_line, line_cache=None):
+        """
+        Find bugs in the next landscape line, counting the line and the time spent.
+
+        :param landscape_line: Landscape line to search in.
+        :type landscape_line: File.Line
+        :param line_cache: Computations of the same landscape line shared by searches.
+        :type line_cache: dict
+        """
+        start_time = time.time()
+
+        super(InstrumentedBugSearch, self).search_landscape_line(landscape_line, line_cache)
+
+        self._counters['seconds'] += time.time() - start_time
+        self._counters['lines_searched'] += 1
+
+
+class InstrumentedRegexBugSearch(InstrumentedBugSearch, RegexBugSearch):
+    """Counts operations of searching a bug with regular expressions, besides lines searched and time spent."""
+
+    def match_bug_part(self, bug_part, landscape_line):
+        self._bug_part_counters['regex_invocations'][bug_part.id] += 1
+
+        return super(InstrumentedRegexBugSearch, self).match_bug_part(bug_part, landscape_line)
+
+    def register_bug_part_match(self, bug_part, landscape_line, bug_part_match_position):
+        self._counters['bug_part_matches_registered'] += 1
+
+        super(InstrumentedRegexBugSearch, self).register_bug_part_match(
+            bug_part, landscape_line, bug_part_match_position
+        )
+
+    def deregister_bug_match(self, landscape_line, bug_part_match_position):
+        self._counters['bug_deregistrations'] += 1
+
+        super(InstrumentedRegexBugSearch, self).deregister_bug_match(landscape_line, bug_part_match_position)
+
+    def should_skip_all_bug_parts_in_line(self, bug_part, landscape_line):
+        should_skip = super(InstrumentedRegexBugSearch, self).should_skip_all_bug_parts_in_line(
+            bug_part, landscape_line
+        )
+
+        if should_skip:
+            self._counters['all_bug_parts_skips'] += 1
+
+        return should_skip
+
+    def should_skip_bug_part_in_line(self, bug_part, landscape_line):
+        should_skip = super(InstrumentedRegexBugSearch, self).should_skip_bug_part_in_line(bug_part, landscape_line)
+
+        if should_skip:
+            self._bug_part_counters['bug_part_skips'][bug_part.id] += 1
+
+        return should_skip
+
+    def bug_part_match_belongs_to_a_bug(self, bug_part, landscape_line, bug_part_match_position):
+        if bug_part.id == self._shape.last_part_id:
+            self._counters['bug_checks'] += 1
+
+        return super(InstrumentedRegexBugSearch, self).bug_part_match_belongs_to_a_bug(
+            bug_part, landscape_line, bug_part_match_position
+        )
+
+
+INSTRUMENTED_ENGINES = collections.OrderedDict(
+    (engine, type('Instrumented' + search_class.__name__, (InstrumentedBugSearch, search_class), {}))
+    for engine, search_class in ENGINES.items()
+)
+INSTRUMENTED_ENGINES['regex'] = InstrumentedRegexBugSearch
+INSTRUMENTED_ENGINES['sparse'] = type(
+    'InstrumentedSparseBugSearch', (InstrumentedRegexBugSearch, SparseBugSearch), {}
+)
+
+
+class ResultCache(object):
+    """
+    On-disk cache of bug counts, keyed by the bug shape, the engine and the content of the landscape.
+
+    The content of a landscape is hashed once and reused while its size, modification time and inode are unchanged,
+    so counts of unchanged landscapes are returned without reading them. Least recently used files are removed when
+    the cache grows over its maximum size, down to "RESULT_CACHE_EVICT_SHARE" under it. The folder is only listed to
+    find its size once, which is then added to as files are written, until it is over the maximum size again. So it
+    is listed once per many files written, not once per file.
+    """
+
+    def __init__(self, path, max_size=RESULT_CACHE_MAX_SIZE):
+        """
+        Initialise object.
+
+        :param path: Path of the cache folder. It is created if it does not exist.
+        :type path: str
+        :param max_size: Maximum total size of cache files in bytes.
+        :type max_size: int
+        """
+        self.path = path
+        self.max_size = max_size
+        self._cache_size = None
+
+    @property
+    def path(self):
+        """
+        Path of the cache folder.
+
+        :type: str
+        """
+        return self._path
+
+    @path.setter
+    def path(self, value):
+        if not isinstance(value, basestring) or not value:
+            raise TypeError('Cache path is either incorrect or not provided.')
+
+        self._path = value
+
+    @property
+    def max_size(self):
+        """
+        Maximum total size of cache files in bytes.
+
+        :type: int
+        """
+        return self._max_size
+
+    @max_size.setter
+    def max_size(self, value):
+        if not isinstance(value, (int, long)) or isinstance(value, bool) or value < 0:
+            raise ValueError('Cache size should be a non-negative int.')
+
+        self._max_size = value
+
+    @classmethod
+    def bug_key(cls, bug):
+        """
+        Return the hash of the bug shape, so bugs with the same shape share results whatever their filenames are.
+
+        The shape is hashed as the row id and raw pattern of each bug part, so bugs told apart by blank rows only do
+        not share results. (See "Bug.read_parts")
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :return: Bug key
+        :rtype: str
+        """
+        import hashlib
+
+        return hashlib.sha1(json.dumps([[bug_part.id, bug_part.raw_pattern] for bug_part in bug.shape])).hexdigest()
+
+    def landscape_key(self, landscape):
+        """
+        Return the hash of the landscape content, hashing it only if it changed since it was last hashed.
+
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :return: Landscape key
+        :rtype: str
+        """
+        import hashlib
+
+        file_path = os.path.abspath(landscape.file_path)
+        file_stat = os.stat(file_path)
+        fingerprint = [file_stat.st_size, file_stat.st_mtime, file_stat.st_ino]
+
+        fingerprint_path = self._file_path('landscape', hashlib.sha1(file_path).hexdigest())
+        entry = self._read(fingerprint_path)
+
+        if entry is not None and entry['fingerprint'] == fingerprint:
+            return entry['hash']
+
+        content_hash = hashlib.sha1()
+        with open(file_path, 'rb') as file_handler:
+            for block in iter(lambda: file_handler.read(READ_BLOCK_SIZE), ''):
+                content_hash.update(block)
+
+        self._write(fingerprint_path, {'fingerprint': fingerprint, 'hash': content_hash.hexdigest()})
+
+        return content_hash.hexdigest()
+
+    def get(self, bug, landscape_key, engine='regex'):
+        """
+        Return the cached bug count of the bug in the landscape, marking it as recently used.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :param landscape_key: Hash of the landscape content. (See "landscape_key")
+        :type landscape_key: str
+        :param engine: Name of the engine the bug count is found with.
+        :type engine: str
+        :return: Bug count, or None if not cached.
+        :rtype: int | None
+        """
+        entry = self._read(self._file_path('result', self._result_key(bug, landscape_key, engine)))
+
+        return entry['bug_count'] if entry is not None else None
+
+    def set(self, bug, landscape_key, bug_count, engine='regex'):
+        """
+        Cache the bug count of the bug in the landscape, removing least recently used files if the cache is too big.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :param landscape_key: Hash of the landscape content. (See "landscape_key")
+        :type landscape_key: str
+        :param bug_count: Number of times the bug is found in the landscape.
+        :type bug_count: int
+        :param engine: Name of the engine the bug count is found with.
+        :type engine: str
+        """
+        self._write(
+            self._file_path('result', self._result_key(bug, landscape_key, engine)), {'bug_count': bug_count}
+        )
+
+        if self._cache_size is None or self._cache_size > self._max_size:
+            self.evict(int(self._max_size * (1 - RESULT_CACHE_EVICT_SHARE)))
+
+    def evict(self, target_size=None):
+        """
+        Remove least recently used cache files until their total size is not over the target size.
+
+        :param target_size: Size to remove files down to. (Default: maximum size)
+        :type target_size: int
+        """
+        if target_size is None:
+            target_size = self._max_size
+
+        cache_files = []
+
+        for filename in os.listdir(self._path):
+            if not filename.endswith('.json'):
+                continue
+
+            try:
+                file_stat = os.stat(os.path.join(self._path, filename))
+            except OSError:
+                continue
+
+            cache_files.append((file_stat.st_mtime, file_stat.st_size, filename))
+
+        cache_size = sum(file_size for _, file_size, _ in cache_files)
+
+        for _, file_size, filename in sorted(cache_files):
+            if cache_size <= target_size:
+                break
+
+            try:
+                os.remove(os.path.join(self._path, filename))
+            except OSError:
+                pass
+
+            cache_size -= file_size
+
+        self._cache_size = cache_size
+
+    def _result_key(self, bug, landscape_key, engine):
+        """Return the key of the result of the bug in the landscape found with the engine."""
+        import hashlib
+
+        return hashlib.sha1('{version}:{engine}:{bug}:{landscape}'.format(
+            version=RESULT_CACHE_VERSION, engine=engine, bug=self.bug_key(bug), landscape=landscape_key
+        )).hexdigest()
+
+    def _file_path(self, kind, key):
+        """Return the path of the cache file of the kind and key."""
+        return os.path.join(self._path, '{kind}-{key}.json'.format(kind=kind, key=key))
+
+    def _read(self, file_path):
+        """Return the entry of the cache file, marking it as recently used, or None if it is missing or outdated."""
+        try:
+            with open(file_path, 'r') as file_handler:
+                entry = json.load(file_handler)
+
+            os.utime(file_path, None)
+        except (EnvironmentError, ValueError):
+            return None
+
+        return entry if entry.get('version') == RESULT_CACHE_VERSION else None
+
+    def _write(self, file_path, entry):
+        """Write the entry to the cache file atomically, so concurrent readers never see a partial file."""
+        if not os.path.isdir(self._path):
+            try:
+                os.makedirs(self._path)
+            except OSError:
+                if not os.path.isdir(self._path):
+                    raise
+
+        data = json.dumps(dict(entry, version=RESULT_CACHE_VERSION))
+        temporary_path = '{path}.{pid}.tmp'.format(path=file_path, pid=os.getpid())
+
+        with open(temporary_path, 'w') as file_handler:
+            file_handler.write(data)
+
+        os.rename(temporary_path, file_path)
+
+        if self._cache_size is not None:
+            self._cache_size += len(data)
+
+
+class LandscapeIndex(object):
+    """
+    Index of a landscape file saved next to it, to count any bug without reading all of the landscape.
+
+    The index has the offset of each character of the landscape (except whitespace) by character, and start and end
+    offsets of each line. A bug is counted by looking up its rarest character in the landscape, and checking the bug
+    only where that character is in place. Checking a position costs much more than reading it, so the index only
+    pays off for bugs having a character rare in the landscape. (See "is_selective")
+
+    The index file starts with a JSON header line having its version and the size and modification time of the
+    landscape it is built from, so an index of a changed landscape is not used. Offsets follow as arrays of unsigned
+    ints (or longs for landscapes over 4 GB): line starts, line ends (without trailing whitespace) and offsets of each
+    character.
+    """
+
+    def __init__(self, landscape, header, mapped_index):
+        """
+        Initialise object. (See "build" and "load")
+
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :param header: Header of the index file.
+        :type header: dict
+        :param mapped_index: Memory mapped index file, after the header.
+        :type mapped_index: str | mmap.mmap
+        """
+        self._landscape = landscape
+        self._header = header
+        self._mapped_index = mapped_index
+
+        self._line_starts = self._read_offsets(0, header['line_count'])
+        self._line_ends = self._read_offsets(header['line_count'] * header['item_size'], header['line_count'])
+        self._mapped_landscape = None
+
+    @classmethod
+    def index_path(cls, landscape):
+        """
+        Return the path of the index file of the landscape.
+
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :rtype: str
+        """
+        return landscape.file_path + LANDSCAPE_INDEX_EXTENSION
+
+    @classmethod
+    def landscape_fingerprint(cls, landscape):
+        """
+        Return the size and modification time of the landscape file, which an index is valid for.
+
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :rtype: list
+        """
+        file_stat = os.stat(landscape.file_path)
+
+        return [file_stat.st_size, file_stat.st_mtime]
+
+    @classmethod
+    def offset_typecode(cls, file_size):
+        """
+        Return the array typecode of offsets in an index of a landscape of the size, the smallest holding them.
+
+        :param file_size: Size of the landscape file.
+        :type file_size: int
+        :rtype: str
+        """
+        return 'I' if array.array('I').itemsize >= 4 and file_size < 1 << 32 else 'L'
+
+    @classmethod
+    def build(cls, landscape):
+        """
+        Index the landscape and save the index next to it.
+
+        The landscape is read twice a block at a time: first to count lines and characters, which tells where the
+        offsets of each of them go in the index file, then to write offsets of each block there. So memory used does
+        not grow with the landscape.
+
+        :param landscape: Object representing landscape pattern. It should be seekable. (See "Landscape.seekable")
+        :type landscape: Landscape
+        :return: Index of the landscape.
+        :rtype: LandscapeIndex
+        """
+        if not landscape.seekable:
+            raise ValueError('Only uncompressed landscape files can be indexed.')
+
+        fingerprint = cls.landscape_fingerprint(landscape)
+
+        with open(landscape.file_path, 'r') as file_handler:
+            mapped_file = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ) if fingerprint[0] else ''
+
+        file_size = len(mapped_file)
+        typecode = cls.offset_typecode(file_size)
+        item_size = array.array(typecode).itemsize
+        whitespace = set(string.whitespace)
+
+        line_count = 1 if file_size and mapped_file[file_size - 1] != '\n' else 0
+        char_counts = collections.defaultdict(int)
+        for block_start in range(0, file_size, READ_BLOCK_SIZE):
+            block = mapped_file[block_start:block_start + READ_BLOCK_SIZE]
+
+            line_count += block.count('\n')
+            for char in set(block) - whitespace:
+                char_counts[char] += block.count(char)
+
+        header = {
+            'version': LANDSCAPE_INDEX_VERSION,
+            'landscape': fingerprint,
+            'typecode': typecode,
+            'item_size': item_size,
+            'line_count': line_count,
+            'chars': {},
+        }
+
+        write_offsets = {}
+        offset = 2 * line_count * item_size
+        for char, char_count in sorted(char_counts.items()):
+            header['chars'][str(ord(char))] = [offset, char_count]
+            write_offsets[char] = offset
+            offset += char_count * item_size
+
+        index_path = cls.index_path(landscape)
+        with open(index_path + '.tmp', 'wb') as file_handler:
+            file_handler.write(json.dumps(header, sort_keys=True) + '\n')
+            body_start = file_handler.tell()
+
+            def write(write_offset, offsets):
+                file_handler.seek(body_start + write_offset)
+                offsets.tofile(file_handler)
+
+                return write_offset + len(offsets) * item_size
+
+            line_starts = array.array(typecode)
+            line_ends = array.array(typecode)
+            write_offsets['line_starts'], write_offsets['line_ends'] = 0, line_count * item_size
+
+            for line_start, line_end in File.line_spans(mapped_file):
+                line_starts.append(line_start)
+                line_ends.append(line_start + len(mapped_file[line_start:line_end].rstrip()))
+
+                if len(line_starts) == READ_BLOCK_SIZE:
+                    write_offsets['line_starts'] = write(write_offsets['line_starts'], line_starts)
+                    write_offsets['line_ends'] = write(write_offsets['line_ends'], line_ends)
+
+                    del line_starts[:], line_ends[:]
+
+            write(write_offsets['line_starts'], line_starts)
+            write(write_offsets['line_ends'], line_ends)
+
+            for block_start in range(0, file_size, READ_BLOCK_SIZE):
+                block = mapped_file[block_start:block_start + READ_BLOCK_SIZE]
+
+                for char in sorted(set(block) - whitespace):
+                    offsets = array.array(typecode)
+                    offset = block.find(char)
+
+                    while offset >= 0:
+                        offsets.append(block_start + offset)
+                        offset = block.find(char, offset + 1)
+
+                    write_offsets[char] = write(write_offsets[char], offsets)
+
+        os.rename(index_path + '.tmp', index_path)
+
+        return cls.load(landscape)
+
+    @classmethod
+    def load(cls, landscape):
+        """
+        Return the index saved next to the landscape, if there is one built from the landscape as it is now.
+
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :return: Index of the landscape, or None if there is no index, or it is outdated.
+        :rtype: LandscapeIndex | None
+        """
+        if not landscape.seekable:
+            return None
+
+        try:
+            with open(cls.index_path(landscape), 'rb') as file_handler:
+                header = json.loads(file_handler.readline())
+                mapped_index = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except (EnvironmentError, ValueError):
+            return None
+
+        if (
+            not isinstance(header, dict) or
+            header.get('version') != LANDSCAPE_INDEX_VERSION or
+            header.get('typecode') not in ('I', 'L') or
+            header.get('item_size') != array.array(str(header['typecode'])).itemsize or
+            header.get('landscape') != cls.landscape_fingerprint(landscape)
+        ):
+            return None
+
+        header['typecode'] = str(header['typecode'])
+
+        return cls(landscape, header, buffer(mapped_index, mapped_index.find('\n') + 1))
+
+    @property
+    def landscape(self):
+        """
+        Object representing the landscape indexed.
+
+        :type: Landscape
+        """
+        return self._landscape
+
+    def char_count(self, char):
+        """
+        Return number of times the character is in the landscape.
+
+        :param char: Character to count. Whitespace is not indexed.
+        :type char: str
+        :rtype: int
+        """
+        return self._header['chars'].get(str(ord(char)), [0, 0])[1]
+
+    def anchor_cell(self, bug):
+        """
+        Return the cell of the bug to find it by, having the character rarest in the landscape.
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :return: Number of times the character is in the landscape, bug part id, offset and character of the cell, or
+            None if the bug has no character other than whitespace. (Ex: it has no bug parts)
+        :rtype: tuple[int, int, int, str] | None
+        """
+        anchor_cells = [
+            (self.char_count(chr(code)), bug_part.id, offset, chr(code))
+            for bug_part in bug.compiled_shape.parts
+            for offset, code in NumpyBugSearch.bug_part_cells(bug_part)
+            if chr(code) not in string.whitespace
+        ]
+
+        return min(anchor_cells) if anchor_cells else None
+
+    def is_selective(self, bug):
+        """
+        Tell whether finding the bug with the index is faster than reading the landscape, as its anchor cell is rare
+        enough. (See "LANDSCAPE_INDEX_MAX_ANCHOR_SHARE")
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :rtype: bool
+        """
+        anchor_cell = self.anchor_cell(bug)
+
+        return anchor_cell is None or anchor_cell[0] <= self._header['landscape'][0] * LANDSCAPE_INDEX_MAX_ANCHOR_SHARE
+
+    def find_bugs(self, bug):
+        """
+        A generator method to return bugs in the landscape.
+
+        Each bug is found by its anchor cell (See "anchor_cell"), so lines without it are never read. Bug parts are
+        checked in the lines of their rows, like searches do. (See "Bug.read_parts") Bugs are found at each position
+        they match at. (See "RegexBugSearch.deregister_bug_match")
+
+        :param bug: Object representing bug pattern.
+        :type bug: Bug
+        :returns: First line id and column of the bug.
+        :rtype: collections.Iterable[tuple[int, int]]
+        """
+        anchor_cell = self.anchor_cell(bug)
+
+        if anchor_cell is None or not anchor_cell[0]:
+            return
+
+        _, anchor_part_id, anchor_offset, anchor_char = anchor_cell
+
+        bug_part_cells = [
+            (bug_part.id, [(offset, chr(code)) for offset, code in NumpyBugSearch.bug_part_cells(bug_part)])
+            for bug_part in bug.compiled_shape.parts
+        ]
+        bug_height = bug.compiled_shape.height
+
+        if self._mapped_landscape is None:
+            with open(self._landscape.file_path, 'r') as file_handler:
+                self._mapped_landscape = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+
+        mapped_landscape = self._mapped_landscape
+        line_starts, line_ends = self._line_starts, self._line_ends
+        line_count = len(line_starts)
+
+        for char_offset in self._read_offsets(*self._header['chars'][str(ord(anchor_char))]):
+            line_id = bisect.bisect_right(line_starts, char_offset) - 1
+            first_line_id = line_id - anchor_part_id
+            column = char_offset - line_starts[line_id] - anchor_offset
+
+            if first_line_id < 0 or column < 0 or first_line_id + bug_height > line_count:
+                continue
+
+            for bug_part_id, cells in bug_part_cells:
+                line_start = line_starts[first_line_id + bug_part_id] + column
+                line_end = line_ends[first_line_id + bug_part_id]
+
+                if not all(
+                    line_start + offset < line_end and mapped_landscape[line_start + offset] == char
+                    for offset, char in cells
+                ):
+                    break
+            else:
+                yield first_line_id, column
+
+    def _read_offsets(self, start, count):
+        """Return the array of offsets at the position of the index file after the header."""
+        offsets = array.array(self._header['typecode'])
+        offsets.fromstring(self._mapped_index[start:start + count * offsets.itemsize])
+
+        return offsets
+
+
+class BugLibrary(object):
+    """
+    File of many named bugs, read and processed once when the library is built, so that using them later does not
+    process bug files again.
+
+    The library file starts with a JSON header line having its version and the name, offset and size of each bug entry
+    following the header. Each entry is a JSON line having the bug parts as computed by "Bug.Part": id, raw pattern,
+    regular expression and literal run. Only the header is read when the library is opened, and bugs are read on first
+    use.
+    """
+
+    def __init__(self, path):
+        """
+        Initialise object.
+
+        :param path: Path of the library file. (See "build")
+        :type path: str
+        """
+        try:
+            with open(path, 'rb') as file_handler:
+                header = json.loads(file_handler.readline(), encoding='latin-1')
+                entries_offset = file_handler.tell()
+                mapped_library = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            header = None
+
+        if not isinstance(header, dict) or header.get('version') != BUG_LIBRARY_VERSION:
+            raise ValueError('Please make sure "{path}" is a bug library of version {version}.'.format(
+                path=path, version=BUG_LIBRARY_VERSION
+            ))
+
+        self._path = path
+        self._mapped_library = mapped_library
+        self._entries = collections.OrderedDict(
+            (name.encode('latin-1'), (entries_offset + offset, size)) for name, offset, size in header['bugs']
+        )
+        self._bugs = {}
+
+    @classmethod
+    def build(cls, path, bugs):
+        """
+        Save the bugs as a library file.
+
+        :param path: Path of the library file.
+        :type path: str
+        :param bugs: Objects representing bug patterns, named by their filenames.
+        :type bugs: collections.Iterable[Bug]
+        :return: Library of the bugs.
+        :rtype: BugLibrary
+        """
+        names = []
+        entries = []
+
+        for bug in bugs:
+            if bug.filename in names:
+                raise ValueError('Bug "{name}" is given more than once.'.format(name=bug.filename))
+
+            names.append(bug.filename)
+            entries.append(json.dumps({
+                'parts': [
+                    [bug_part.id, bug_part.raw_pattern, bug_part.pattern, bug_part.literal_run]
+                    for bug_part in bug.shape
+                ],
+            }, encoding='latin-1', sort_keys=True) + '\n')
+
+        header_bugs = []
+        offset = 0
+        for name, entry in zip(names, entries):
+            header_bugs.append([name, offset, len(entry)])
+            offset += len(entry)
+
+        with open(path + '.tmp', 'wb') as file_handler:
+            file_handler.write(json.dumps({
+                'version': BUG_LIBRARY_VERSION,
+                'bugs': header_bugs,
+            }, encoding='latin-1', sort_keys=True) + '\n')
+
+            for entry in entries:
+                file_handler.write(entry)
+
+        os.rename(path + '.tmp', path)
+
+        return cls(path)
+
+    @property
+    def path(self):
+        """
+        Path of the library file.
+
+        :type: str
+        """
+        return self._path
+
+    @property
+    def names(self):
+        """
+        Names of the bugs in the library, in the order they were added.
+
+        :type: list[str]
+        """
+        return list(self._entries)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, name):
+        """
+        Return the bug of the name, reading it from the library on first use.
+
+        :param name: Name of the bug.
+        :type name: str
+        :rtype: Bug
+        """
+        bug = self._bugs.get(name)
+
+        if bug is None:
+            if name not in self._entries:
+                raise ValueError('Bug "{name}" is not in the library "{path}".'.format(name=name, path=self._path))
+
+            offset, size = self._entries[name]
+            entry = json.loads(self._mapped_library[offset:offset + size])
+
+            bug = self._bugs[name] = Bug(name, strict=False, parts=[
+                Bug.Part.precomputed(
+                    part_id,
+                    raw_pattern.encode('latin-1'),
+                    pattern.encode('latin-1') if pattern is not None else None,
+                    (literal_run[0], literal_run[1].encode('latin-1')) if literal_run is not None else None
+                )
+                for part_id, raw_pattern, pattern, literal_run in entry['parts']
+            ])
+
+        return bug
+
+
+class BugFinder(object):
+    """Holds the operations to find bugs in a landscape."""
+
+    def __init__(self, bug, landscape, engine='regex', stats=False, cache=None, orientations=False, index=False):
+        """
+        Initialise object.
+
+        :param bug: Object representing bug pattern, or a collection of them to search in one read of the landscape.
+        :type bug: Bug | collections.Iterable[Bug]
+        :param landscape: Object representing landscape pattern.
+        :type landscape: Landscape
+        :param engine: Name of the engine to search bugs with. (See "ENGINES")
+        :type engine: str
+        :param stats: Whether to collect statistics of searching. (See "stats")
+        :type stats: bool
+        :param cache: Cache of bug counts of landscapes searched before. (See "find_bugs_in_landscape")
+        :type cache: ResultCache
+        :param orientations: Whether to also search all distinct rotations and reflections of bugs, in the same read
+            of the landscape. (See "Bug.orientations")
+        :type orientations: bool
+        :param index: Whether to count bugs with the index of the landscape instead of reading it, if it has an up to
+            date index and each bug has a character rare enough in the landscape. (See "LandscapeIndex.is_selective")
+        :type index: bool
+        """
+        if cache is not None and not isinstance(cache, ResultCache):
+            raise TypeError('Cache is either incorrect or not provided.')
+
+        self._searches = ()
+        self._cache = cache
+        self._orientations = bool(orientations)
+        self._uses_index = bool(index)
+        self._collects_stats = bool(stats)
+        self._counters = collections.Counter()
+
+        self.engine = engine
+        self.bugs = bug
+        self.landscape = landscape
+
+    @property
+    def engine(self):
+        """
+        Name of the engine to search bugs with.
+
+        :type: str
+        """
+        return self._engine
+
+    @engine.setter
+    def engine(self, value):
+        if value not in ENGINES:
+            raise ValueError('Engine should be one of: {engines}.'.format(engines=', '.join(ENGINES)))
+
+        self._engine = value
+        self._reset_searches()
+
+    @property
+    def bugs(self):
+        """
+        Objects representing bug patterns to search for, including orientations of bugs if they are searched.
+
+        :type: tuple[Bug]
+        """
+        return self._bugs
+
+    @bugs.setter
+    def bugs(self, value):
+        if isinstance(value, Bug):
+            value = [value]
+
+        try:
+            value = tuple(collections.OrderedDict.fromkeys(value))
+        except TypeError:
+            raise TypeError('Bug is either incorrect or not provided.')
+
+        if not value or not all(isinstance(bug, Bug) for bug in value):
+            raise TypeError('Bug is either incorrect or not provided.')
+
+        if self._orientations:
+            value = tuple(collections.OrderedDict.fromkeys(
+                orientation_bug for bug in value for orientation_bug in bug.orientations().values()
+            ))
+
+        self._bugs = value
+        self._reset_searches()
+
+    @property
+    def bug(self):
+        """
+        Object representing the first (or only) bug pattern.
+
+        :type: Bug
+        """
+        return self._bugs[0]
+
+    @bug.setter
+    def bug(self, value):
+        if not isinstance(value, Bug):
+            raise TypeError('Bug is either incorrect or not provided.')
+
+        self.bugs = value
+
+    @property
+    def landscape(self):
+        """
+        Object representing landscape pattern.
+
+        :type: Landscape
+        """
+        return self._landscape
+
+    @landscape.setter
+    def landscape(self, value):
+        if not isinstance(value, Landscape):
+            raise TypeError('Landscape is either incorrect or not provided.')
+
+        self._landscape = value
+        self._reset_searches()
+
+    @property
+    def searches(self):
+        """
+        Searches of each bug, in the order of bugs.
+
+        :type: tuple[BugSearch]
+        """
+        return self._searches
+
+    @property
+    def stats(self):
+        """
+        Statistics of searching the landscape, if asked for when initialising. Lines read and reading time are only
+        counted when searching in a single process. In parallel searches, lines before each chunk are also searched,
+        and counted, by the process searching the chunk before. When reading ahead, time spent waiting for lines and
+        searching them is also counted. (See "read_ahead_landscape_lines")
+
+        Ex: {"engine": "regex", "lines_read": 7, "reading_seconds": 0.01, "seconds": 0.02, "bugs": [...]}
+
+        :type: dict | None
+        """
+        if not self._collects_stats:
+            return None
+
+        stats = dict(self._counters)
+        stats.update(engine=self._engine, bugs=[search.stats for search in self._searches])
+
+        return stats
+
+    @property
+    def bug_part_matches(self):
+        """
+        Bug part matches of the first (or only) bug. See "RegexBugSearch.bug_part_matches".
+
+        :type: BugPartMatchWindow
+        """
+        return self._searches[0].bug_part_matches
+
+    @property
+    def bug_count(self):
+        """
+        Number of times bugs are found in the landscape, in total.
+
+        :type: int
+        """
+        return sum(search.bug_count for search in self._searches)
+
+    @property
+    def bug_counts(self):
+        """
+        Number of times each bug is found in the landscape.
+
+        :type: collections.OrderedDict[Bug, int]
+        """
+        return collections.OrderedDict((search.bug, search.bug_count) for search in self._searches)
+
+    @property
+    def original_bug_counts(self):
+        """
+        Number of times each bug is found in the landscape, adding up counts of its orientations if they are searched.
+
+        :type: collections.OrderedDict[Bug, int]
+        """
+        bug_counts = collections.OrderedDict()
+
+        for search in self._searches:
+            bug_counts[search.bug.original] = bug_counts.get(search.bug.original, 0) + search.bug_count
+
+        return bug_counts
+
+    def increment_bug_count(self, bug=None):
+        """
+        Increment number of times a bug is found in the landscape by one.
+
+        :param bug: Bug found. The first (or only) bug if not provided.
+        :type bug: Bug
+        """
+        self._searches[self._bugs.index(bug) if bug is not None else 0].increment_bug_count()
+
+    def _reset_searches(self):
+        """Start searches of bugs from scratch, forgetting bug part matches and counts."""
+        if hasattr(self, '_bugs'):
+            engines = INSTRUMENTED_ENGINES if self._collects_stats else ENGINES
+
+            self._searches = tuple(engines[self._engine](bug) for bug in self._bugs)
+            self._counters = collections.Counter()
+
+            self._offset = 0
+            self._next_line_id = 0
+
+    @classmethod
+    def search_landscape_lines(cls, searches, landscape_lines):
+        """
+        Search bugs in landscape lines.
+
+        Matches of identical bug parts are shared between searches in each line.
+
+        :param searches: Searches of bugs.
+        :type searches: collections.Sequence[BugSearch]
+        :param landscape_lines: Landscape lines to search in.
+        :type landscape_lines: collections.Iterable[File.Line]
+        """
+        share_matches = len(searches) > 1
+
+        for landscape_line in landscape_lines:
+            line_cache = {} if share_matches else None
+
+            for search in searches:
+                search.search_landscape_line(landscape_line, line_cache)
+
+    @classmethod
+    def time_landscape_lines(cls, counters, landscape_lines):
+        """
+        A generator method to pass landscape lines through, counting them and the time spent reading them.
+
+        :param counters: Counters to add "lines_read" and "reading_seconds" to.
+        :type counters: collections.Counter
+        :param landscape_lines: Landscape lines read.
+        :type landscape_lines: collections.Iterable[File.Line]
+
+        :returns: Landscape line
+        :rtype: collections.Iterable[File.Line]
+        """
+        landscape_lines = iter(landscape_lines)
+
+        while True:
+            start_time = time.time()
+
+            try:
+                landscape_line = next(landscape_lines)
+            finally:
+                counters['reading_seconds'] += time.time() - start_time
+
+            counters['lines_read'] += 1
+
+            yield landscape_line
+
+    @classmethod
+    def read_ahead_landscape_lines(cls, landscape_lines, queue_depth, batch_size=READ_AHEAD_BATCH_SIZE, counters=None):
+        """
+        A generator method to read landscape lines in a background thread, so the next lines are read while the ones
+        read before are searched.
+
+        The thread puts batches of lines into a queue holding up to the queue depth of batches, waiting for a batch to
+        be taken when it is full. Errors of reading are raised when the batch they stop is reached.
+
+        With counters, "reading_seconds" is the time the thread spent reading, "read_ahead_stall_seconds" the time
+        spent waiting for the thread to read a batch, and "matching_seconds" the time spent on the batches read.
+
+        :param landscape_lines: Landscape lines to read.
+        :type landscape_lines: collections.Iterable[File.Line]
+        :param queue_depth: Number of batches to read ahead at most.
+        :type queue_depth: int
+        :param batch_size: Number of lines in a batch.
+        :type batch_size: int
+        :param counters: Counters to add statistics of reading to.
+        :type counters: collections.Counter
+
+        :returns: Landscape line
+        :rtype: collections.Iterable[File.Line]
+        """
+        import Queue
+        import threading
+
+        batch_queue = Queue.Queue(queue_depth)
+        stopped = threading.Event()
+
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    batch_queue.put(item, timeout=0.1)
+
+                    return True
+                except Queue.Full:
+                    pass
+
+            return False
+
+        def read():
+            lines = iter(landscape_lines)
+
+            try:
+                while True:
+                    start_time = time.time()
+                    batch = list(itertools.islice(lines, batch_size))
+
+                    if counters is not None:
+                        counters['reading_seconds'] += time.time() - start_time
+
+                    if not batch or not put((batch, None)):
+                        break
+            except BaseException:
+                put((None, sys.exc_info()))
+            finally:
+                put((None, None))
+
+        reader_thread = threading.Thread(target=read, name='landscape-read-ahead')
+        reader_thread.daemon = True
+        reader_thread.start()
+
+        try:
+            while True:
+                start_time = time.time()
+                batch, error = batch_queue.get()
+
+                if counters is not None:
+                    counters['read_ahead_stall_seconds'] += time.time() - start_time
+
+                if error is not None:
+                    raise error[0], error[1], error[2]
+
+                if batch is None:
+                    reader_thread.join()
+
+                    break
+
+                start_time = time.time()
+
+                for landscape_line in batch:
+                    yield landscape_line
+
+                if counters is not None:
+                    counters['lines_read'] += len(batch)
+                    counters['read_ahead_batches'] += 1
+                    counters['matching_seconds'] += time.time() - start_time
+        finally:
+            stopped.set()
+
+    def iter_bugs(self):
+        """
+        A generator method to search the landscape from the start, returning each bug as soon as it is found.
+
+        Bug counts are updated as lines are read, and reading stops when the generator is no longer iterated. With more
+        than one bug, bugs of all of them are returned.
+
+        :returns: First line id and column of the bug.
+        :rtype: collections.Iterable[tuple[int, int]]
+        """
+        share_matches = len(self._searches) > 1
+        landscape_lines = self.landscape.lines()
+
+        if self._collects_stats:
+            landscape_lines = self.time_landscape_lines(self._counters, landscape_lines)
+
+        for search in self._searches:
+            search.collect_found_bugs()
+
+        try:
+            for landscape_line in landscape_lines:
+                line_cache = {} if share_matches else None
+
+                for search in self._searches:
+                    search.search_landscape_line(landscape_line, line_cache)
+
+                    if search.found_bugs:
+                        for found_bug in search.pop_found_bugs():
+                            yield found_bug
+        finally:
+            for search in self._searches:
+                search.collect_found_bugs(False)
+
+    def exists(self):
+        """
+        Tell whether any bug is in the landscape, reading it only until the first bug is found.
+
+        :rtype: bool
+        """
+        landscape_index = self._load_index()
+
+        if landscape_index is not None:
+            return any(any(landscape_index.find_bugs(bug)) for bug in self._bugs)
+
+        for _ in self.iter_bugs():
+            return True
+
+        return False
+
+    def find_bugs_in_landscape(
+        self, processes=1, chunk_count=None, max_count=None, tile_width=None, read_ahead=None,
+        read_ahead_batch_size=READ_AHEAD_BATCH_SIZE
+    ):
+        """
+        Loop through lines of the landscape once to find all bugs.
+
+        With more than one process, row chunks of the landscape are searched in parallel. Each chunk also reads
+        -bug height - 1- amount of lines before it, so bugs crossing chunk seams are found by the chunk they end in.
+        Landscapes which are not seekable (Ex: compressed or streamed) are searched in a single process.
+
+        If a cache is given, the landscape is not read when bug counts of all bugs are cached for its content. If the
+        index is used, bugs are counted with it instead of searching all of the landscape, unless a max count or tile
+        width is given. (See "_load_index")
+
+        :param processes: Number of processes to search the landscape with.
+        :type processes: int
+        :param chunk_count: Number of row chunks to split the landscape into. (Default: a few per process)
+        :type chunk_count: int
+        :param max_count: Number of bugs in total to stop reading the landscape at. The landscape is then searched in
+            a single process, and counts are of the lines read, so they may be a little over it.
+        :type max_count: int
+        :param tile_width: Number of columns to split lines into tiles of, for landscapes with very wide lines. Tiles
+            are searched separately, in parallel with more than one process. (See "_find_bugs_in_landscape_tiles")
+        :type tile_width: int
+        :param read_ahead: Number of batches of lines to read ahead in a background thread while searching, when the
+            landscape is searched in a single process. Reading slow storage or decompressing then overlaps searching.
+            (See "read_ahead_landscape_lines")
+        :type read_ahead: int
+        :param read_ahead_batch_size: Number of lines in a batch read ahead.
+        :type read_ahead_batch_size: int
+        :return: Number of times each bug is found in the landscape.
+        :rtype: collections.OrderedDict[Bug, int]
+        """
+        if not isinstance(processes, int) or isinstance(processes, bool) or processes < 1:
+            raise ValueError('Processes should be a positive int.')
+
+        if max_count is not None and (not isinstance(max_count, int) or isinstance(max_count, bool) or max_count < 1):
+            raise ValueError('Max count should be a positive int.')
+
+        if tile_width is not None and (
+            not isinstance(tile_width, int) or isinstance(tile_width, bool) or tile_width < 1
+        ):
+            raise ValueError('Tile width should be a positive int.')
+
+        if read_ahead is not None and (
+            not isinstance(read_ahead, int) or isinstance(read_ahead, bool) or read_ahead < 1
+        ):
+            raise ValueError('Read ahead should be a positive int.')
+
+        if (
+            not isinstance(read_ahead_batch_size, int) or isinstance(read_ahead_batch_size, bool) or
+            read_ahead_batch_size < 1
+        ):
+            raise ValueError('Read ahead batch size should be a positive int.')
+
+        start_time = time.time()
+
+        if self._cache is not None and self.landscape.stream is None:
+            landscape_key = self._cache.landscape_key(self.landscape)
+            cached_bug_counts = [
+                self._cache.get(search.bug, landscape_key, self._engine) for search in self._searches
+            ]
+
+            if None not in cached_bug_counts:
+                for search, bug_count in zip(self._searches, cached_bug_counts):
+                    search.increment_bug_count(bug_count)
+
+                if self._collects_stats:
+                    self._counters['cache_hits'] += 1
+                    self._counters['seconds'] += time.time() - start_time
+
+                return self.bug_counts
+
+            previous_bug_counts = [search.bug_count for search in self._searches]
+
+        is_landscape_searched = True
+        landscape_index = None
+
+        if max_count is None and tile_width is None:
+            landscape_index = self._load_index()
+
+        if landscape_index is not None:
+            for search in self._searches:
+                search.increment_bug_count(sum(1 for _ in landscape_index.find_bugs(search.bug)))
+
+            if self._collects_stats:
+                self._counters['index_hits'] += 1
+        elif max_count is not None:
+            bug_count = self.bug_count
+
+            for _ in self.iter_bugs():
+                if self.bug_count - bug_count >= max_count:
+                    is_landscape_searched = False
+
+                    break
+        elif tile_width is not None and self.landscape.seekable:
+            self._find_bugs_in_landscape_tiles(processes, tile_width)
+        elif processes == 1 and not chunk_count or not self.landscape.seekable:
+            if read_ahead is not None:
+                landscape_lines = self.read_ahead_landscape_lines(
+                    self.landscape.lines(mapped=False), read_ahead, read_ahead_batch_size,
+                    self._counters if self._collects_stats else None
+                )
+            elif self._collects_stats:
+                landscape_lines = self.time_landscape_lines(self._counters, self.landscape.lines())
+            else:
+                landscape_lines = self.landscape.lines()
+
+            self.search_landscape_lines(self._searches, landscape_lines)
+        else:
+            self._find_bugs_in_landscape_chunks(processes, chunk_count or processes * PARALLEL_CHUNKS_PER_PROCESS)
+
+        if self._cache is not None and self.landscape.stream is None and is_landscape_searched:
+            for search, previous_bug_count in zip(self._searches, previous_bug_counts):
+                self._cache.set(search.bug, landscape_key, search.bug_count - previous_bug_count, self._engine)
+
+        if self._collects_stats:
+            self._counters['seconds'] += time.time() - start_time
+
+        return self.bug_counts
+
+    def find_new_bugs_in_landscape(self):
+        """
+        Search lines appended to the landscape since the last call, adding to the bug counts.
+
+        Lines not ending with a newline yet are left to the next call, since they may still be being written. The part
+        of the landscape searched, and the state of searches, can be saved to continue in another process.
+        (See "save_checkpoint") Searching with "find_bugs_in_landscape" is not taken into account.
+
+        :return: Number of times each bug is found in the landscape so far.
+        :rtype: collections.OrderedDict[Bug, int]
+        """
+        if not self.landscape.seekable:
+            raise ValueError('Only uncompressed landscape files can be searched for appended lines.')
+
+        with open(self.landscape.file_path, 'r') as file_handler:
+            file_handler.seek(0, os.SEEK_END)
+
+            if file_handler.tell() < self._offset:
+                raise ValueError('Landscape is shorter than the part already searched. It is truncated or replaced.')
+
+            end = File.complete_lines_end(file_handler, self._offset)
+
+            if end > self._offset:
+                self.search_landscape_lines(
+                    self._searches, File.mapped_reader(file_handler, self._offset, end, self._next_line_id)
+                )
+
+                self._next_line_id += File.count_lines(file_handler, self._offset, end)
+                self._offset = end
+
+        return self.bug_counts
+
+    def save_checkpoint(self, checkpoint_path):
+        """
+        Save the part of the landscape searched by "find_new_bugs_in_landscape" and the state of searches.
+
+        :param checkpoint_path: Path of the checkpoint file.
+        :type checkpoint_path: str
+        """
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'landscape': self.landscape.file_path,
+            'engine': self._engine,
+            'bugs': [bug.filename for bug in self._bugs],
+            'offset': self._offset,
+            'line_id': self._next_line_id,
+            'searches': [search.get_state() for search in self._searches],
+        }
+
+        with open(checkpoint_path + '.tmp', 'w') as file_handler:
+            json.dump(checkpoint, file_handler)
+
+        os.rename(checkpoint_path + '.tmp', checkpoint_path)
+
+    def load_checkpoint(self, checkpoint_path):
+        """
+        Continue from a checkpoint saved by "save_checkpoint" for the same bugs, landscape and engine.
+
+        :param checkpoint_path: Path of the checkpoint file.
+        :type checkpoint_path: str
+        """
+        with open(checkpoint_path, 'r') as file_handler:
+            checkpoint = json.load(file_handler)
+
+        if checkpoint.get('version') != CHECKPOINT_VERSION:
+            raise ValueError('Checkpoint version is not supported.')
+
+        if (
+            checkpoint['landscape'] != self.landscape.file_path or
+            checkpoint['engine'] != self._engine or
+            checkpoint['bugs'] != [bug.filename for bug in self._bugs]
+        ):
+            raise ValueError('Checkpoint belongs to other bugs, landscape or engine.')
+
+        for search, state in zip(self._searches, checkpoint['searches']):
+            search.set_state(state)
+
+        self._offset = checkpoint['offset']
+        self._next_line_id = checkpoint['line_id']
+
+    def _load_index(self):
+        """
+        Return the index of the landscape to count bugs with, if the index is to be used, the landscape has an up to
+        date index, and finding each bug with it is faster than reading the landscape.
+
+        :rtype: LandscapeIndex | None
+        """
+        if not self._uses_index:
+            return None
+
+        landscape_index = LandscapeIndex.load(self.landscape)
+
+        if landscape_index is None or not all(landscape_index.is_selective(bug) for bug in self._bugs):
+            return None
+
+        return landscape_index
+
+    def _find_bugs_in_landscape_chunks(self, processes, chunk_count):
+        """
+        Search row chunks of the landscape in a pool of processes and add up their bug counts.
+
+        :param processes: Number of processes to search the landscape with.
+        :type processes: int
+        :param chunk_count: Number of row chunks to split the landscape into.
+        :type chunk_count: int
+        """
+        file_path = self.landscape.file_path
+        overlap_line_count = max(search.bug.compiled_shape.height for search in self._searches) - 1
+
+        with open(file_path, 'r') as file_handler:
+            chunks = [
+                (chunk_start, chunk_end, overlap_line_count)
+                for chunk_start, chunk_end in File.chunk_offsets(file_handler, chunk_count)
+            ]
+
+        import multiprocessing
+
+        pool = multiprocessing.Pool(
+            processes,
+            initializer=_init_chunk_worker,
+            initargs=(self._bugs, file_path, self._engine, self._collects_stats)
+        )
+
+        try:
+            chunk_results = pool.map(_find_bugs_in_landscape_chunk, chunks)
+        finally:
+            pool.close()
+            pool.join()
+
+        for bug_counts, search_stats in chunk_results:
+            for search, bug_count in zip(self._searches, bug_counts):
+                search.increment_bug_count(bug_count)
+
+            for search, stats in zip(self._searches, search_stats or []):
+                search.add_stats(stats)
+
+    def _find_bugs_in_landscape_tiles(self, processes, tile_width):
+        """
+        Search column tiles of the landscape, in a pool of processes if more than one, and add up their bug counts.
+
+        Each tile also reads -bug width - 1- amount of columns after it, so bugs crossing tile seams are complete in the
+        tile they start in, and only bugs starting in the tile are counted by it.
+
+        :param processes: Number of processes to search the landscape with.
+        :type processes: int
+        :param tile_width: Number of columns of each tile.
+        :type tile_width: int
+        """
+        file_path = self.landscape.file_path
+        overlap_column_count = max(search.bug.compiled_shape.width for search in self._searches) - 1
+
+        _init_tile_worker(self._bugs, file_path, self._engine, self._collects_stats)
+        line_spans = _tile_worker_state['line_spans']
+        landscape_width = max(
+            [line_spans[index + 1] - line_spans[index] for index in xrange(0, len(line_spans), 2)] or [0]
+        )
+
+        tiles = [
+            (column_start, tile_width, overlap_column_count) for column_start in range(0, landscape_width, tile_width)
+        ]
+
+        if processes == 1:
+            tile_results = [_find_bugs_in_landscape_tile(tile) for tile in tiles]
+        else:
+            import multiprocessing
+
+            pool = multiprocessing.Pool(processes)
+
+            try:
+                tile_results = pool.map(_find_bugs_in_landscape_tile, tiles)
+            finally:
+                pool.close()
+                pool.join()
+
+        _tile_worker_state.clear()
+
+        for bug_counts, search_stats in tile_results:
+            for search, bug_count in zip(self._searches, bug_counts):
+                search.increment_bug_count(bug_count)
+
+            for search, stats in zip(self._searches, search_stats or []):
+                search.add_stats(stats)
+
+
+_chunk_worker_state = {}
+
+
+def _init_chunk_worker(bugs, file_path, engine, collects_stats=False):
+    """
+    Keep bugs, landscape file path and engine in the worker process to search landscape chunks with.
+
+    :param bugs: Objects representing bug patterns.
+    :type bugs: tuple[Bug]
+    :param file_path: Path of the landscape file.
+    :type file_path: str
+    :param engine: Name of the engine to search bugs with.
+    :type engine: str
+    :param collects_stats: Whether to collect statistics of searching.
+    :type collects_stats: bool
+    """
+    _chunk_worker_state['bugs'] = bugs
+    _chunk_worker_state['file_path'] = file_path
+    _chunk_worker_state['engine'] = engine
+    _chunk_worker_state['collects_stats'] = collects_stats
+
+
+def _find_bugs_in_landscape_chunk(chunk):
+    """
+    Search bugs in a row chunk of the landscape in a worker process.
+
+    Lines before the chunk are searched first so that bugs ending in the chunk are complete, but only bugs ending in
+    the chunk are counted.
+
+    :param chunk: Start and end offsets of the chunk, and number of lines before it to search.
+    :type chunk: tuple[int, int, int]
+    :return: Number of times each bug is found in the chunk, and statistics of each search if collected.
+    :rtype: tuple[list[int], list[dict] | None]
+    """
+    chunk_start, chunk_end, overlap_line_count = chunk
+    collects_stats = _chunk_worker_state['collects_stats']
+
+    engines = INSTRUMENTED_ENGINES if collects_stats else ENGINES
+    searches = [engines[_chunk_worker_state['engine']](bug) for bug in _chunk_worker_state['bugs']]
+
+    with open(_chunk_worker_state['file_path'], 'r') as file_handler:
+        overlap_start, overlap_line_count = File.rewind_lines(file_handler, chunk_start, overlap_line_count)
+
+        BugFinder.search_landscape_lines(searches, File.mapped_reader(file_handler, overlap_start, chunk_start))
+        overlap_bug_counts = [search.bug_count for search in searches]
+
+        BugFinder.search_landscape_lines(
+            searches, File.mapped_reader(file_handler, chunk_start, chunk_end, overlap_line_count)
+        )
+
+    bug_counts = [
+        search.bug_count - overlap_bug_count for search, overlap_bug_count in zip(searches, overlap_bug_counts)
+    ]
+
+    return bug_counts, [search.stats for search in searches] if collects_stats else None
+
+
+_tile_worker_state = {}
+
+
+def _init_tile_worker(bugs, file_path, engine, collects_stats=False):
+    """
+    Keep bugs, the memory mapped landscape, its line spans and engine to search landscape tiles with. Worker processes
+    of the pool are forked after it, and share them, so lines are only looked for once for all tiles.
+
+    :param bugs: Objects representing bug patterns.
+    :type bugs: tuple[Bug]
+    :param file_path: Path of the landscape file.
+    :type file_path: str
+    :param engine: Name of the engine to search bugs with.
+    :type engine: str
+    :param collects_stats: Whether to collect statistics of searching.
+    :type collects_stats: bool
+    """
+    with open(file_path, 'r') as file_handler:
+        if os.fstat(file_handler.fileno()).st_size:
+            mapped_file = mmap.mmap(file_handler.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            mapped_file = ''
+
+    _tile_worker_state['bugs'] = bugs
+    _tile_worker_state['mapped_file'] = mapped_file
+    _tile_worker_state['line_spans'] = File.line_span_array(mapped_file)
+    _tile_worker_state['engine'] = engine
+    _tile_worker_state['collects_stats'] = collects_stats
+
+
+def _find_bugs_in_landscape_tile(tile):
+    """
+    Search bugs in a column tile of the landscape.
+
+    Columns after the tile are also read so that bugs starting in the tile are complete, but only bugs starting in the
+    tile are counted.
+
+    :param tile: Start column and width of the tile, and number of columns after it to read.
+    :type tile: tuple[int, int, int]
+    :return: Number of times each bug is found in the tile, and statistics of each search if collected.
+    :rtype: tuple[list[int], list[dict] | None]
+    """
+    column_start, tile_width, overlap_column_count = tile
+    collects_stats = _tile_worker_state['collects_stats']
+
+    engines = INSTRUMENTED_ENGINES if collects_stats else ENGINES
+    searches = [engines[_tile_worker_state['engine']](bug) for bug in _tile_worker_state['bugs']]
+    bug_counts = [0] * len(searches)
+
+    for search in searches:
+        search.collect_found_bugs()
+
+    share_matches = len(searches) > 1
+    tile_lines = File.tile_reader(
+        _tile_worker_state['mapped_file'], _tile_worker_state['line_spans'],
+        column_start, column_start + tile_width + overlap_column_count
+    )
+
+    for tile_line in tile_lines:
+        line_cache = {} if share_matches else None
+
+        for search_id, search in enumerate(searches):
+            search.search_landscape_line(tile_line, line_cache)
+
+            if search.found_bugs:
+                bug_counts[search_id] += sum(1 for _, column in search.pop_found_bugs() if column < tile_width)
+
+    return bug_counts, [search.stats for search in searches] if collects_stats else None
+
+
+def read_manifest(file_handler):
+    """
+    A generator method to return bug and landscape filename pairs from a manifest.
+
+    Each line of the manifest has a bug filename and a landscape filename separated by whitespace. Blank lines and lines
+    starting with "#" are skipped.
+
+    :param file_handler: File object opened to read the manifest.
+    :type file_handler: BinaryIO
+
+    :returns: Bug and landscape filenames
+    :rtype: collections.Iterable[tuple[str, str]]
+    """
+    for line_number, line in enumerate(file_handler, 1):
+        line = line.strip()
+
+        if not line or line.startswith('#'):
+            continue
+
+        filenames = line.split()
+
+        if len(filenames) != 2:
+            raise ValueError('Manifest line {number} should have a bug and a landscape filename.'.format(
+                number=line_number
+            ))
+
+        yield filenames[0], filenames[1]
+
+
+def find_bugs_in_pairs(pairs, engine='regex', processes=1, cache=None):
+    """
+    A generator method to count bugs in landscapes of bug and landscape filename pairs, in the order of pairs.
+
+    Each distinct bug is read once and shared by all pairs having it. Pairs are searched in a pool of processes.
+
+    :param pairs: Bug and landscape filenames.
+    :type pairs: collections.Iterable[tuple[str, str]]
+    :param engine: Name of the engine to search bugs with.
+    :type engine: str
+    :param processes: Number of processes to search pairs with.
+    :type processes: int
+    :param cache: Cache of bug counts of landscapes searched before.
+    :type cache: ResultCache
+
+    :returns: Result of each pair. Ex: {"bug": "bug.txt", "landscape": "landscape.txt", "bug_count": 3}
+    :rtype: collections.Iterable[dict]
+    """
+    pairs = list(pairs)
+
+    bugs = {}
+    for bug_filename, _ in pairs:
+        if bug_filename not in bugs:
+            try:
+                bugs[bug_filename] = Bug(bug_filename)
+            except Exception as error:
+                bugs[bug_filename] = error
+
+    _init_pair_worker(bugs, engine, cache)
+
+    if processes == 1:
+        for pair in pairs:
+            yield _find_bugs_in_pair(pair)
+
+        return
+
+    import multiprocessing
+
+    pool = multiprocessing.Pool(processes, initializer=_init_pair_worker, initargs=(bugs, engine, cache))
+
+    try:
+        for result in pool.imap(_find_bugs_in_pair, pairs):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+_pair_worker_state = {}
+
+
+def _init_pair_worker(bugs, engine, cache=None):
+    """
+    Keep bugs, engine and cache in the worker process to search pairs with.
+
+    :param bugs: Objects representing bug patterns, or errors of reading them, by filename.
+    :type bugs: dict[str, Bug | Exception]
+    :param engine: Name of the engine to search bugs with.
+    :type engine: str
+    :param cache: Cache of bug counts of landscapes searched before.
+    :type cache: ResultCache
+    """
+    _pair_worker_state['bugs'] = bugs
+    _pair_worker_state['engine'] = engine
+    _pair_worker_state['cache'] = cache
+
+
+def _find_bugs_in_pair(pair):
+    """
+    Count bugs in landscape of the bug and landscape filename pair.
+
+    :param pair: Bug and landscape filenames.
+    :type pair: tuple[str, str]
+    :return: Result of the pair, having the bug count or the error.
+    :rtype: dict
+    """
+    bug_filename, landscape_filename = pair
+    result = {'bug': bug_filename, 'landscape': landscape_filename}
+
+    try:
+        bug = _pair_worker_state['bugs'][bug_filename]
+
+        if isinstance(bug, Exception):
+            raise bug
+
+        bug_finder = BugFinder(
+            bug, Landscape(landscape_filename), engine=_pair_worker_state['engine'], cache=_pair_worker_state['cache']
+        )
+        result['bug_count'] = bug_finder.find_bugs_in_landscape()[bug]
+    except Exception as error:
+        # Any failure of a pair (Ex: an engine failing to import) is its result, so other pairs are still counted.
+        result['error'] = str(error)
+
+    return result
+
+
+class BugServer(object):
+    """
+    Server counting bugs for clients, keeping bugs read in its worker processes between requests.
+
+    Requests and responses are JSON objects, one per line, and a connection can send many requests. Bugs are given by
+    filename and the landscape either by filename or as text:
+
+        {"bugs": ["bug.txt"], "landscape": "landscape.txt", "engine": "regex"}
+        {"bugs": ["bug.txt"], "landscape_text": "..."}
+
+    Responses have the bug count of each bug and in total, or the error. Ex: {"bug_counts": {"bug.txt": 3},
+    "bug_count": 3} Each connection is served by a thread, and searches run in a pool of processes, so slow searches do
+    not hold back other clients.
+    """
+
+    def __init__(self, address, bugs=(), engine='regex', processes=None, allow_remote=False):
+        """
+        Initialise object.
+
+        :param address: Path of a Unix socket, or "host:port" to listen on TCP.
+        :type address: str
+        :param bugs: Objects representing bug patterns to have ready before the first request.
+        :type bugs: collections.Iterable[Bug]
+        :param engine: Name of the engine to search bugs with, unless a request asks for another.
+        :type engine: str
+        :param processes: Number of processes to search with. (Default: number of CPUs)
+        :type processes: int
+        :param allow_remote: Whether to listen on a host other than loopback, letting any client on the network read
+            files through the server, as requests are not authenticated.
+        :type allow_remote: bool
+        """
+        if engine not in ENGINES:
+            raise ValueError('Engine should be one of: {engines}.'.format(engines=', '.join(ENGINES)))
+
+        import multiprocessing
+
+        self._pool = multiprocessing.Pool(
+            processes, initializer=_init_server_worker, initargs=(tuple(bugs), engine)
+        )
+
+        try:
+            server_address = self.parse_address(address, allow_remote)
+            server_classes = _import_server_classes()
+            server_class = server_classes['tcp' if isinstance(server_address, tuple) else 'unix']
+
+            self._server = server_class(server_address, server_classes['request_handler'])
+        except Exception:
+            self._pool.terminate()
+            raise
+
+        self._server.bug_server = self
+
+    @classmethod
+    def parse_address(cls, address, allow_remote=False):
+        """
+        Return the socket address to listen on.
+
+        :param address: Path of a Unix socket, or "host:port" to listen on TCP. (Default host: localhost)
+        :type address: str
+        :param allow_remote: Whether a host other than loopback is accepted.
+        :type allow_remote: bool
+        :return: Socket address
+        :rtype: str | tuple[str, int]
+        """
+        host, separator, port = address.rpartition(':')
+
+        if separator and port.isdigit():
+            host = host or 'localhost'
+
+            if not allow_remote and not cls.is_loopback(host):
+                raise ValueError(
+                    'Please make sure "{host}" is a loopback host, or allow remote clients to read files through the '
+                    'server.'.format(host=host)
+                )
+
+            return host, int(port)
+
+        if os.path.exists(address):
+            if not stat.S_ISSOCK(os.stat(address).st_mode):
+                raise ValueError('Please make sure "{address}" is not a file other than a socket.'.format(
+                    address=address
+                ))
+
+            os.remove(address)
+
+        return address
+
+    @staticmethod
+    def is_loopback(host):
+        """
+        Return whether a host resolves to a loopback address, so only clients of this machine can connect to it.
+
+        :param host: Host name or IPv4 address.
+        :type host: str
+        :return: Whether the host is loopback
         :rtype: bool
         """
-        if bug_part.id == self.bug.shape[-1].id:
-            landscape_line_number = landscape_line.id
+        import socket
 
-            for bug_part in reversed(self.bug.shape[:-1]):
-                landscape_line_number = landscape_line_number - 1
+        try:
+            return socket.gethostbyname(host).startswith('127.')
+        except socket.error:
+            return False
 
-                if bug_part_match_position not in self.bug_part_matches[landscape_line_number][bug_part.id]:
-                    return False
+    @property
+    def server_address(self):
+        """
+        Socket address the server listens on.
 
-            return True
+        :type: str | tuple[str, int]
+        """
+        return self._server.server_address
 
-        return False
+    def count_bugs(self, request):
+        """
+        Count bugs for the request in a worker process.
 
-    def find_bug_part_and_bugs_in_landscape_line(self, bug_part, landscape_line):
+        :param request: Bugs and landscape to count. (See "BugServer")
+        :type request: dict
+        :return: Response
+        :rtype: dict
         """
-        Find bug part matches in landscape line.
+        return self._pool.apply(_count_bugs_for_request, (request,))
 
-        If a bug part mack is found, check whether it belongs to a bug.
+    def serve_forever(self):
+        """Handle requests until "shutdown" is called."""
+        self._server.serve_forever()
 
-        :param bug_part: Bug part to check for.
-        :type bug_part: Bug.Part
-        :param landscape_line: Landscape line to check bug part in.
-        :type landscape_line: File.Line
+    def shutdown(self):
+        """Stop "serve_forever", from another thread."""
+        self._server.shutdown()
+
+    def close(self):
+        """Close the socket and stop worker processes."""
+        self._server.server_close()
+
+        if isinstance(self._server.server_address, str) and os.path.exists(self._server.server_address):
+            os.remove(self._server.server_address)
+
+        self._pool.terminate()
+        self._pool.join()
+
+    def handle_connection(self, rfile, wfile):
         """
-        for bug_part_match in re.finditer(bug_part.pattern, landscape_line.pattern):
-            bug_part_match_position = bug_part_match.start()
+        Answer each request line of a connection with a response line.
 
-            self.register_bug_part_match(bug_part, landscape_line, bug_part_match_position)
+        :param rfile: File object to read requests of the connection from.
+        :type rfile: BinaryIO
+        :param wfile: File object to write responses of the connection to.
+        :type wfile: BinaryIO
+        """
+        for request_line in iter(rfile.readline, ''):
+            if not request_line.strip():
+                continue
 
-            if self.bug_part_match_belongs_to_a_bug(bug_part, landscape_line, bug_part_match_position):
-                self.increment_bug_count()
-                self.deregister_bug_match(landscape_line, bug_part_match_position)
+            try:
+                request = json.loads(request_line)
 
-    def find_bugs_in_landscape(self):
-        """Loop through lines of the landscape to find bugs."""
-        with open(self.landscape.file_path, 'r') as file_handler:
-            for landscape_line in File.reader(file_handler):
-                for bug_part in self.bug.shape:
-                    if self.should_skip_bug_part_in_line(bug_part, landscape_line):
-                        continue
+                if not isinstance(request, dict):
+                    raise ValueError('Request should be a JSON object.')
+            except ValueError as error:
+                response = {'error': str(error)}
+            else:
+                response = self.count_bugs(request)
 
-                    self.find_bug_part_and_bugs_in_landscape_line(bug_part, landscape_line)
+            wfile.write(json.dumps(response, sort_keys=True) + '\n')
+            wfile.flush()
 
-                    if self.should_skip_all_bug_parts_in_line(bug_part, landscape_line):
-                        break
+
+_server_classes = {}
+
+
+def _import_server_classes():
+    """
+    Import "SocketServer" on first use and return the server and request handler classes of "BugServer", so only
+    serving pays for importing it.
+
+    :return: Classes by kind: "unix" and "tcp" servers, and "request_handler".
+    :rtype: dict[str, type]
+    """
+    if not _server_classes:
+        import SocketServer
+
+        class ThreadingUnixServer(SocketServer.ThreadingMixIn, SocketServer.UnixStreamServer):
+            daemon_threads = True
+
+        class ThreadingTCPServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+
+        class RequestHandler(SocketServer.StreamRequestHandler):
+            def handle(self):
+                self.server.bug_server.handle_connection(self.rfile, self.wfile)
+
+        _server_classes.update(unix=ThreadingUnixServer, tcp=ThreadingTCPServer, request_handler=RequestHandler)
+
+    return _server_classes
+
+
+_server_worker_state = {}
+
+
+def _init_server_worker(bugs, engine):
+    """
+    Keep bugs read before and the default engine in the worker process to search requests with.
+
+    :param bugs: Objects representing bug patterns.
+    :type bugs: tuple[Bug]
+    :param engine: Name of the engine to search bugs with, unless a request asks for another.
+    :type engine: str
+    """
+    _server_worker_state['bugs'] = dict(
+        (bug.filename, (os.path.getmtime(bug.file_path), bug)) for bug in bugs
+    )
+    _server_worker_state['engine'] = engine
+
+
+def _get_server_bug(bug_filename):
+    """
+    Return the bug of the filename, reading it only if it is not read yet or changed since.
+
+    :param bug_filename: Filename with extension for bug.
+    :type bug_filename: str
+    :rtype: Bug
+    """
+    modification_time = os.path.getmtime(File(bug_filename).file_path)
+
+    read_modification_time, read_bug = _server_worker_state['bugs'].get(bug_filename, (None, None))
+    if read_modification_time == modification_time:
+        return read_bug
+
+    bug = Bug(bug_filename)
+    _server_worker_state['bugs'][bug_filename] = (modification_time, bug)
+
+    return bug
+
+
+def _count_bugs_for_request(request):
+    """
+    Count bugs for the request of a client.
+
+    :param request: Bugs and landscape to count. (See "BugServer")
+    :type request: dict
+    :return: Response having bug counts or the error.
+    :rtype: dict
+    """
+    try:
+        bug_filenames = request.get('bugs')
+        if isinstance(bug_filenames, basestring):
+            bug_filenames = [bug_filenames]
+
+        if not bug_filenames or not isinstance(bug_filenames, list):
+            raise TypeError('Bug is either incorrect or not provided.')
+
+        bugs = [_get_server_bug(str(bug_filename)) for bug_filename in bug_filenames]
+        engine = request.get('engine', _server_worker_state['engine'])
+
+        if request.get('landscape') is not None:
+            bug_finder = BugFinder(bugs, Landscape(str(request['landscape'])), engine=engine)
+            bug_finder.find_bugs_in_landscape()
+            searches = bug_finder.searches
+        elif isinstance(request.get('landscape_text'), basestring):
+            if engine not in ENGINES:
+                raise ValueError('Engine should be one of: {engines}.'.format(engines=', '.join(ENGINES)))
+
+            searches = [ENGINES[engine](bug) for bug in collections.OrderedDict.fromkeys(bugs)]
+            BugFinder.search_landscape_lines(searches, (
+                File.Line(line_id, line.rstrip())
+                for line_id, line in enumerate(request['landscape_text'].encode('utf-8').splitlines())
+            ))
+        else:
+            raise TypeError('Landscape is either incorrect or not provided.')
+    except Exception as error:
+        # Any failure of a request (Ex: a corrupt compressed landscape) is its response, so the connection is kept.
+        return {'error': str(error)}
+
+    bug_counts = dict((search.bug.filename, search.bug_count) for search in searches)
+
+    return {'bug_counts': bug_counts, 'bug_count': sum(bug_counts.values())}
 
 
 if __name__ == '__main__':
+    import argparse
+
     parser = argparse.ArgumentParser(
         description='This is a script to count matches of a pattern (bug) in another pattern (landscape).'
     )
 
-    parser.add_argument("--bug", "-b", help="filename with extension for bug")
+    parser.add_argument("--bug", "-b", nargs='+', help="filename with extension for bug, or several to count at once")
     parser.add_argument("--landscape", "-l", help="filename with extension for landscape")
+    parser.add_argument("--manifest", "-m",
+                        help="path of a file having a bug and a landscape filename pair per line, to count bugs of "
+                             "each pair, writing a JSON line of results per pair")
+    parser.add_argument("--engine", "-e", choices=list(ENGINES), default='regex', help="engine to search bugs with")
+    parser.add_argument("--processes", "-p", type=int, default=1,
+                        help="number of processes to search the landscape with")
+    parser.add_argument("--stats", action='store_true', help="write statistics of searching as JSON to stderr")
+    parser.add_argument("--checkpoint", help="path of the file to continue searching lines appended to landscape from")
+    parser.add_argument("--follow", type=float, metavar='SECONDS',
+                        help="keep searching lines appended to landscape, checking every given seconds")
+    parser.add_argument("--library", metavar='PATH',
+                        help="path of a bug library to take bugs from, by name with -b or all of them without")
+    parser.add_argument("--build-library", metavar='PATH',
+                        help="save bugs given with -b as a bug library to this path, to start faster with --library")
+    parser.add_argument("--build-index", action='store_true',
+                        help="build an index of the landscape next to it, to count any bug later without reading all "
+                             "of the landscape")
+    parser.add_argument("--index", action='store_true',
+                        help="count bugs with the index of the landscape built with --build-index, for bugs having a "
+                             "character rare in the landscape")
+    parser.add_argument("--read-ahead", type=int, metavar='BATCHES',
+                        help="read this many batches of lines ahead in a background thread while searching, for slow "
+                             "storage or compressed landscapes")
+    parser.add_argument("--read-ahead-batch-size", type=int, default=READ_AHEAD_BATCH_SIZE, metavar='LINES',
+                        help="number of lines in a batch read ahead")
+    parser.add_argument("--tile-width", type=int, metavar='COLUMNS',
+                        help="search very wide landscapes in column tiles of this width, in parallel with -p")
+    parser.add_argument("--orientations", action='store_true',
+                        help="also count all distinct rotations and reflections of bugs, in the same read of landscape")
+    parser.add_argument("--exists", action='store_true',
+                        help="only tell whether there is any bug in the landscape, stopping at the first one found")
+    parser.add_argument("--max-count", type=int, metavar='COUNT',
+                        help="stop reading the landscape once this many bugs are found")
+    parser.add_argument("--paths", action='store_true',
+                        help="take bug and landscape as paths of files in any format instead of txt files in the data "
+                             "folder (the landscape is read from standard input with -l -)")
+    parser.add_argument("--serve", metavar='ADDRESS',
+                        help="serve requests of counting bugs on a Unix socket path or host:port, keeping bugs read")
+    parser.add_argument("--serve-remote", action='store_true',
+                        help="allow --serve on a host other than loopback, letting clients on the network read files "
+                             "through the server")
+    parser.add_argument("--cache", metavar='PATH',
+                        help="path of the folder to cache bug counts in, so unchanged landscapes are not searched "
+                             "again")
+    parser.add_argument("--cache-size", type=int, default=RESULT_CACHE_MAX_SIZE, metavar='BYTES',
+                        help="maximum size of the cache folder, removing least recently used results over it")
 
     args = parser.parse_args()
 
-    if not args.bug:
+    result_cache = ResultCache(args.cache, args.cache_size) if args.cache else None
+
+    if args.serve:
+        bug_server = BugServer(
+            args.serve, [Bug(bug_filename) for bug_filename in args.bug or []], engine=args.engine,
+            processes=args.processes if args.processes > 1 else None, allow_remote=args.serve_remote
+        )
+
+        signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit())
+
+        try:
+            bug_server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            bug_server.close()
+
+        sys.exit()
+
+    if args.manifest:
+        with open(args.manifest, 'r') as manifest_file_handler:
+            manifest_pairs = list(read_manifest(manifest_file_handler))
+
+        for pair_result in find_bugs_in_pairs(
+            manifest_pairs, engine=args.engine, processes=args.processes, cache=result_cache
+        ):
+            print json.dumps(pair_result, sort_keys=True)
+            sys.stdout.flush()
+
+        sys.exit()
+
+    if not args.bug and not args.build_index and not args.library:
         parser.print_usage()
         raise ValueError('Please provide a bug file.')
 
+    if args.build_library:
+        bug_library = BugLibrary.build(
+            args.build_library, [Bug(bug_filename, strict=not args.paths) for bug_filename in args.bug]
+        )
+
+        print 'Library of {count} bugs is saved to {path}.'.format(count=len(bug_library), path=bug_library.path)
+        sys.exit()
+
     if not args.landscape:
         parser.print_usage()
         raise ValueError('Please provide a landscape file.')
 
-    bug_default = Bug(args.bug)
-    landscape_default = Landscape(args.landscape)
+    landscape_default = Landscape(args.landscape, strict=not args.paths and args.landscape != '-')
+
+    if args.build_index:
+        LandscapeIndex.build(landscape_default)
+
+        print 'Index of the landscape is saved to {path}.'.format(path=LandscapeIndex.index_path(landscape_default))
+        sys.exit()
+
+    if args.library:
+        bug_library = BugLibrary(args.library)
+        bugs_default = [bug_library[bug_name] for bug_name in args.bug or bug_library]
+    else:
+        bugs_default = [Bug(bug_filename, strict=not args.paths) for bug_filename in args.bug]
+
+    bug_finder = BugFinder(
+        bugs_default, landscape_default, engine=args.engine, stats=args.stats, cache=result_cache,
+        orientations=args.orientations, index=args.index
+    )
+
+    if args.checkpoint or args.follow:
+        if args.checkpoint and os.path.exists(args.checkpoint):
+            bug_finder.load_checkpoint(args.checkpoint)
+
+        bug_count = None
+        try:
+            while True:
+                bug_finder.find_new_bugs_in_landscape()
 
-    bug_finder = BugFinder(bug_default, landscape_default)
-    bug_finder.find_bugs_in_landscape()
+                if args.checkpoint:
+                    bug_finder.save_checkpoint(args.checkpoint)
+
+                if not args.follow:
+                    break
+
+                if bug_finder.bug_count != bug_count:
+                    bug_count = bug_finder.bug_count
+
+                    print 'Bug count in the landscape: {count}'.format(count=bug_count)
+                    sys.stdout.flush()
+
+                time.sleep(args.follow)
+        except KeyboardInterrupt:
+            pass
+    elif args.exists:
+        bug_exists = bug_finder.exists()
+
+        print 'Bug exists in the landscape: {answer}'.format(answer='yes' if bug_exists else 'no')
+        sys.exit(0 if bug_exists else 1)
+    else:
+        bug_finder.find_bugs_in_landscape(
+            processes=args.processes, max_count=args.max_count, tile_width=args.tile_width,
+            read_ahead=args.read_ahead, read_ahead_batch_size=args.read_ahead_batch_size
+        )
+
+    if len(bug_finder.bugs) > 1:
+        for bug, count in bug_finder.bug_counts.items():
+            print 'Bug count of {bug} in the landscape: {count}'.format(bug=bug.filename, count=count)
+
+    if args.orientations and len(bug_finder.original_bug_counts) > 1:
+        for bug, count in bug_finder.original_bug_counts.items():
+            print 'Bug count of {bug} in any orientation in the landscape: {count}'.format(
+                bug=bug.filename, count=count
+            )
 
     print 'Bug count in the landscape: {count}'.format(count=bug_finder.bug_count)
+
+    if args.stats:
+        json.dump(bug_finder.stats, sys.stderr, indent=2, sort_keys=True)
+        sys.stderr.write('\n')
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from StringIO import StringIO
+from unittest import TestCase, main
+from main import DATA_FOLDER_PATH, Bug, Landscape, BugFinder
+from benchmark import Scenario, generate_landscape, run_benchmark, format_result, compare_results
+
+
+class TestBenchmark(TestCase):
+    def setUp(self):
+        self.bug = Bug('bug.txt')
+        self.scenario = Scenario(60, 40, 0.1, 5, 10, 4)
+
+    def test_generate_landscape(self):
+        landscape_patterns = []
+        for _ in range(2):
+            file_handler = StringIO()
+
+            generate_landscape(file_handler, self.bug, self.scenario, seed=3)
+
+            landscape_patterns.append(file_handler.getvalue())
+
+        self.assertEqual(landscape_patterns[0], landscape_patterns[1])
+        self.assertEqual(landscape_patterns[0].count('\n'), self.scenario.height)
+
+        # Without noise, bugs found are the bugs planted, both bugs of each twin pair included.
+        for scenario in [Scenario(20, 20, 0, 0, 0, 2), Scenario(100, 100, 0, 5, 0, 10)]:
+            with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=DATA_FOLDER_PATH, delete=False) as file_handler:
+                planted_bug_count = generate_landscape(file_handler, self.bug, scenario)
+
+            try:
+                bug_finder = BugFinder(self.bug, Landscape(os.path.basename(file_handler.name)))
+
+                self.assertEqual(bug_finder.find_bugs_in_landscape()[self.bug], planted_bug_count)
+                self.assertEqual(planted_bug_count, scenario.bug_count + 2 * scenario.twin_bug_count)
+            finally:
+                os.remove(file_handler.name)
+
+        self.assertRaises(ValueError, lambda: generate_landscape(StringIO(), self.bug, Scenario(4, 40, 0, 1, 0, 0)))
+
+    def test_run_benchmark(self):
+        results = run_benchmark(self.bug, [self.scenario], engines=['regex', 'bakerbird'])
+
+        self.assertEqual([result['engine'] for result in results], ['regex', 'bakerbird'])
+        self.assertEqual(results[0]['bug_count'], results[1]['bug_count'])
+        self.assertGreaterEqual(results[0]['bug_count'], 5)
+
+        for result in results:
+            self.assertEqual(result['landscape']['height'], self.scenario.height)
+            self.assertGreater(result['peak_memory_kb'], 0)
+
+    def test_format_result(self):
+        result = {
+            'scenario': 'sparse', 'engine': 'regex', 'bug_count': 3, 'lines_per_second': 1234.4, 'mb_per_second': 1.5,
+            'peak_memory_kb': 100,
+        }
+
+        self.assertIn(' 1234 lines/s ', format_result(result))
+        self.assertIn(' 1.50 MB/s ', format_result(result))
+        self.assertIn(' - lines/s ', format_result(dict(result, lines_per_second=None, mb_per_second=None)))
+
+    def test_compare_results(self):
+        previous_results = [{'scenario': 'sparse', 'engine': 'regex', 'processes': 1, 'lines_per_second': 100.0}]
+        results = [
+            {'scenario': 'sparse', 'engine': 'regex', 'processes': 1, 'lines_per_second': 150.0},
+            {'scenario': 'dense', 'engine': 'regex', 'processes': 1, 'lines_per_second': 50.0},
+        ]
+
+        self.assertEqual(compare_results(previous_results, results), {('sparse', 'regex', 1): 1.5})
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,66 @@
-from unittest import TestCase, main
-from main import escape, File, Bug, Landscape, BugFinder, DATA_FOLDER_PATH
+import os
+import copy
+import bz2
+import gzip
+import json
+import time
+import random
+import shutil
+import socket
+import tempfile
+import threading
+from unittest import TestCase, main, skipIf
+from main import (
+    escape, import_numpy, CompiledShape, File, Bug, Landscape, BugPartMatchWindow, RegexBugSearch, NumpyBugSearch,
+    BakerBirdBugSearch, BitsetBugSearch, SparseBugSearch, BugFinder, ResultCache, LandscapeIndex, BugLibrary, BugServer,
+    ENGINES, read_manifest, find_bugs_in_pairs, DATA_FOLDER_PATH, DECOMPRESS_READ_BLOCK_SIZE, ORIENTATIONS,
+    SPARSE_MIN_GAP
+)
+
+numpy = import_numpy()
+
+
+def make_data_file(pattern, repeat=1):
+    """Write a temporary file into the data folder and return its filename."""
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', dir=DATA_FOLDER_PATH, delete=False) as file_handler:
+        for _ in range(repeat):
+            file_handler.write(pattern)
+
+    return os.path.basename(file_handler.name)
+
+
+def make_bug(pattern):
+    """Return a bug read from a temporary file having the pattern."""
+    filename = make_data_file(pattern)
+
+    try:
+        return Bug(filename)
+    finally:
+        remove_data_file(filename)
+
+
+def make_random_landscape(bug, line_count, line_width, bug_count, seed=0):
+    """Return a random landscape pattern with the bug planted in it, including blank lines and conjoined twins."""
+    rng = random.Random(seed)
+    chars = sorted(set(''.join(part.raw_pattern for part in bug.shape))) + [' ']
+
+    lines = [[rng.choice(chars) for _ in range(line_width)] for _ in range(line_count)]
+    for _ in range(bug_count):
+        line_id = rng.randrange(line_count - bug.compiled_shape.height + 1)
+        position = rng.randrange(line_width - bug.compiled_shape.width + 1)
+
+        for part in bug.shape:
+            lines[line_id + part.id][position:position + len(part.raw_pattern)] = part.raw_pattern
+
+    for _ in range(line_count // 10):
+        lines[rng.randrange(line_count)] = []
+
+    return ''.join(''.join(line).rstrip() + '\n' for line in lines)
+
+
+def remove_data_file(filename):
+    """Remove a temporary file from the data folder."""
+    os.remove('{path}/{file}'.format(path=DATA_FOLDER_PATH, file=filename))
 
 
 class Test(TestCase):
@@ -27,6 +88,204 @@ class TestFile(TestCase):
         f = File(self.valid_filename)
         self.assertEqual(f.file_path, '{folder}/{file}'.format(folder=DATA_FOLDER_PATH, file=self.valid_filename))
 
+    def test_mapped_reader(self):
+        f = File('landscape.txt')
+
+        with open(f.file_path, 'r') as file_handler:
+            lines = [(line.id, line.pattern) for line in File.reader(file_handler)]
+
+            mapped_lines = list(File.mapped_reader(file_handler))
+            for line in mapped_lines:
+                self.assertIsInstance(line, File.MappedLine)
+                self.assertEqual(line.buffer[line.start:line.end], line.pattern)
+
+            self.assertEqual([(line.id, line.pattern) for line in mapped_lines], lines)
+
+            file_handler.seek(0)
+            start = len(file_handler.readline())
+
+            self.assertEqual(
+                [(line.id, line.pattern) for line in File.mapped_reader(file_handler, start, start + 1, 1)], lines[:1]
+            )
+
+        filename = make_data_file('')
+
+        try:
+            with open(File(filename).file_path, 'r') as file_handler:
+                self.assertEqual(list(File.mapped_reader(file_handler)), [])
+        finally:
+            remove_data_file(filename)
+
+        filename = make_data_file('ab' + ' \t' * 10000 + '\n' + ' ' * 20000 + '\n c')
+
+        try:
+            with open(File(filename).file_path, 'r') as file_handler:
+                self.assertEqual(
+                    [(line.id, line.pattern) for line in File.mapped_reader(file_handler)], [(0, 'ab'), (2, ' c')]
+                )
+        finally:
+            remove_data_file(filename)
+
+        read_descriptor, write_descriptor = os.pipe()
+        with os.fdopen(write_descriptor, 'w') as file_handler:
+            file_handler.write('ab \n\ncd')
+
+        with os.fdopen(read_descriptor, 'r') as file_handler:
+            self.assertEqual(
+                [(line.id, line.pattern) for line in File.mapped_reader(file_handler)], [(0, 'ab'), (2, 'cd')]
+            )
+
+    def test_content_end(self):
+        self.assertEqual(File.content_end('ab  \t', 0, 5), 2)
+        self.assertEqual(File.content_end('ab  cd', 2, 4), 2)
+        self.assertEqual(File.content_end('a' + ' ' * 100000 + 'b', 0, 100001), 1)
+        self.assertEqual(File.content_end('a' * 1000, 10, 1000), 1000)
+
+    def test_tile_reader(self):
+        mapped_file = 'ab  cd\n\n   e\nf'
+
+        self.assertEqual(list(File.line_spans(mapped_file)), [(0, 6), (7, 7), (8, 12), (13, 14)])
+
+        line_spans = File.line_span_array(mapped_file)
+        self.assertEqual(line_spans.tolist(), [0, 6, 7, 7, 8, 12, 13, 14])
+
+        self.assertEqual(
+            [(line.id, line.pattern) for line in File.tile_reader(mapped_file, line_spans, 1, 4)],
+            [(0, 'b'), (2, '  e')]
+        )
+        self.assertEqual(
+            [(line.id, line.pattern) for line in File.tile_reader(mapped_file, line_spans, 0, 100)],
+            [(0, 'ab  cd'), (2, '   e'), (3, 'f')]
+        )
+
+        mapped_file = 'a' + ' ' * 100000 + 'b\n' + ' ' * 50000
+        line_spans = File.line_span_array(mapped_file)
+        self.assertEqual(
+            [(line.id, line.pattern) for line in File.tile_reader(mapped_file, line_spans, 0, 100000)],
+            [(0, 'a')]
+        )
+
+    def test_File_strict(self):
+        self.assertRaises(TypeError, lambda: File('landscape.gz'))
+        self.assertEqual(File('landscape.txt.gz').compression, '.gz')
+        self.assertIsNone(File('landscape.txt').compression)
+
+        f = File(__file__, strict=False)
+        self.assertEqual(f.file_path, __file__)
+
+    def test_block_reader(self):
+        text = 'ab \n\ncd\n  ef'
+
+        for block_size in range(1, len(text) + 1):
+            blocks = [text[start:start + block_size] for start in range(0, len(text), block_size)]
+
+            self.assertEqual(
+                [(line.id, line.pattern) for line in File.block_reader(blocks, 1)], [(1, 'ab'), (3, 'cd'), (4, '  ef')]
+            )
+
+        blocks = ['a' * 1000] * 1000 + ['\nb', 'c\n', 'd' * 1000]
+        self.assertEqual(
+            [(line.id, line.pattern) for line in File.block_reader(blocks)],
+            [(0, 'a' * 1000000), (1, 'bc'), (2, 'd' * 1000)]
+        )
+
+    def test_decompressed_blocks(self):
+        path = tempfile.mkdtemp()
+
+        try:
+            for compression, compressed_file_class in [('.gz', gzip.GzipFile), ('.bz2', bz2.BZ2File)]:
+                file_path = os.path.join(path, 'landscape' + compression)
+
+                for pattern in ['ab\n', 'cd\n']:
+                    compressed_file_handler = compressed_file_class(file_path + '.part', 'w')
+                    compressed_file_handler.write(pattern)
+                    compressed_file_handler.close()
+
+                    with open(file_path, 'ab') as file_handler, open(file_path + '.part', 'rb') as part_file_handler:
+                        file_handler.write(part_file_handler.read())
+
+                with open(file_path, 'rb') as file_handler:
+                    self.assertEqual(''.join(File.decompressed_blocks(file_handler, compression)), 'ab\ncd\n')
+
+            # A first stream ending exactly at the end of a read block.
+            random_generator = random.Random(0)
+            text = ''.join(random_generator.choice('#| \n') for _ in range(100000))
+            text_length = next(
+                length for length in range(1, len(text))
+                if len(bz2.compress(text[:length])) % DECOMPRESS_READ_BLOCK_SIZE == 0
+            )
+            file_path = os.path.join(path, 'streams.bz2')
+
+            with open(file_path, 'wb') as file_handler:
+                file_handler.write(bz2.compress(text[:text_length]) + bz2.compress('cd\n'))
+
+            with open(file_path, 'rb') as file_handler:
+                self.assertEqual(''.join(File.decompressed_blocks(file_handler, '.bz2')), text[:text_length] + 'cd\n')
+
+            file_path = os.path.join(path, 'zeros.gz')
+            compressed_file_handler = gzip.GzipFile(file_path, 'w')
+            compressed_file_handler.write('\0' * 10000000)
+            compressed_file_handler.close()
+
+            with open(file_path, 'rb') as file_handler:
+                blocks = list(File.decompressed_blocks(file_handler, '.gz'))
+
+            self.assertEqual(sum(len(block) for block in blocks), 10000000)
+            self.assertLessEqual(max(len(block) for block in blocks), 64 * 1024)
+        finally:
+            shutil.rmtree(path)
+
+    def test_complete_lines_end(self):
+        filename = make_data_file('ab\ncd\nef')
+
+        try:
+            with open(File(filename).file_path, 'r') as file_handler:
+                self.assertEqual(File.complete_lines_end(file_handler), 6)
+                self.assertEqual(File.complete_lines_end(file_handler, 6), 6)
+                self.assertEqual(File.count_lines(file_handler, 0, 6), 2)
+                self.assertEqual(File.count_lines(file_handler, 3, 8), 1)
+        finally:
+            remove_data_file(filename)
+
+    def test_chunk_offsets(self):
+        f = File('landscape.txt')
+
+        with open(f.file_path, 'r') as file_handler:
+            pattern = file_handler.read()
+
+            for chunk_count in [1, 2, 3, 100]:
+                chunks = File.chunk_offsets(file_handler, chunk_count)
+
+                self.assertLessEqual(len(chunks), chunk_count)
+                self.assertEqual(''.join(pattern[start:end] for start, end in chunks), pattern)
+
+                for start, end in chunks:
+                    self.assertTrue(start == 0 or pattern[start - 1] == '\n')
+
+    def test_rewind_lines(self):
+        f = File('landscape.txt')
+
+        with open(f.file_path, 'r') as file_handler:
+            line_offsets = [0]
+            for line in file_handler:
+                line_offsets.append(line_offsets[-1] + len(line))
+
+            self.assertEqual(File.rewind_lines(file_handler, line_offsets[5], 0), (line_offsets[5], 0))
+            self.assertEqual(File.rewind_lines(file_handler, line_offsets[5], 2), (line_offsets[3], 2))
+            self.assertEqual(File.rewind_lines(file_handler, line_offsets[1], 1), (0, 1))
+            self.assertEqual(File.rewind_lines(file_handler, line_offsets[2], 5), (0, 2))
+            self.assertEqual(File.rewind_lines(file_handler, 0, 5), (0, 0))
+
+    def test_range_reader(self):
+        f = File('landscape.txt')
+
+        with open(f.file_path, 'r') as file_handler:
+            lines = file_handler.readlines()
+            start = len(lines[0])
+
+            self.assertEqual(list(File.range_reader(file_handler, start, start + 1)), lines[1:2])
+            self.assertEqual(list(File.range_reader(file_handler, start, 10 ** 6)), lines[1:])
+
     def test_reader(self):
         f = File(self.valid_filename)
 
@@ -63,6 +322,23 @@ class TestLine(TestCase):
         line = File.Line(self.valid_line_prop['id'], self.valid_line_prop['pattern'])
         self.assertEqual(line.pattern, self.valid_line_prop['pattern'])
 
+    def test_buffer(self):
+        line = File.Line(self.valid_line_prop['id'], self.valid_line_prop['pattern'])
+        self.assertEqual(line.buffer[line.start:line.end], self.valid_line_prop['pattern'])
+
+    def test_slots(self):
+        line = File.Line(self.valid_line_prop['id'], self.valid_line_prop['pattern'])
+        mapped_line = File.MappedLine(self.valid_line_prop['id'], '[---]', 1, 4)
+
+        for slotted in (line, mapped_line, Bug('bug.txt').shape[0]):
+            self.assertRaises(AttributeError, lambda: setattr(slotted, 'other', None))
+
+        self.assertEqual(mapped_line.pattern, self.valid_line_prop['pattern'])
+        self.assertEqual(copy.copy(line), line)
+        self.assertEqual(copy.copy(mapped_line), mapped_line)
+        self.assertRaises(AttributeError, lambda: setattr(line, 'id', 2))
+        self.assertRaises(TypeError, lambda: File.MappedLine(None, '[---]', 1, 4))
+
 
 class TestBug(TestCase):
     def setUp(self):
@@ -87,6 +363,46 @@ class TestBug(TestCase):
 
         self.assertEqual(part_count, 3)
 
+    def test_compiled_shape(self):
+        bug = Bug(self.valid_filename)
+        compiled_shape = bug.compiled_shape
+
+        self.assertIsInstance(compiled_shape, CompiledShape)
+        self.assertEqual(compiled_shape.parts, tuple(bug.shape))
+        self.assertEqual(compiled_shape.height, 3)
+        self.assertEqual(compiled_shape.width, 4)
+        self.assertEqual(compiled_shape.last_part_id, 2)
+
+        self.assertRaises(AttributeError, lambda: setattr(compiled_shape, 'height', 1))
+
+    def test_read_parts(self):
+        bug = make_bug('\n\n| |\n\n###O\n\n')
+
+        self.assertEqual([(part.id, part.raw_pattern) for part in bug.shape], [(0, '| |'), (2, '###O')])
+        self.assertEqual(bug.compiled_shape.height, 3)
+        self.assertEqual(bug.compiled_shape.last_part_id, 2)
+
+    def test_rows(self):
+        bug = Bug('bug.txt:rows', rows=['| | ', '', '###O'])
+
+        self.assertEqual([(part.id, part.raw_pattern) for part in bug.shape], [(0, '| |'), (2, '###O')])
+        self.assertIs(bug.original, bug)
+        self.assertEqual(bug.orientation, 'original')
+
+    def test_orientations(self):
+        bug = Bug(self.valid_filename)
+        orientations = bug.orientations()
+
+        self.assertEqual(list(orientations), ['original', 'rotate90', 'rotate180', 'rotate270'])
+        self.assertIs(orientations['original'], bug)
+        self.assertEqual([part.raw_pattern for part in orientations['rotate90'].shape], ['|#|', ' #', '|#|', ' O'])
+        self.assertEqual([part.raw_pattern for part in orientations['rotate180'].shape], [' | |', 'O###', ' | |'])
+        self.assertIs(orientations['rotate270'].original, bug)
+        self.assertEqual(orientations['rotate270'].orientation, 'rotate270')
+
+        self.assertEqual(len(make_bug('O#\n##\n##\n').orientations()), 8)
+        self.assertEqual(list(make_bug('#\n#\n').orientations()), ['original', 'rotate90'])
+
 
 class TestPart(TestCase):
     def setUp(self):
@@ -111,6 +427,38 @@ class TestPart(TestCase):
         self.assertEqual(bug.shape[0].pattern, '\|(?=.{1}\|)')
         self.assertEqual(bug.shape[1].pattern, '\#(?=\#\#O)')
 
+    def test_regex(self):
+        bug = Bug(self.valid_filename)
+
+        self.assertEqual(bug.shape[1].raw_pattern, '###O')
+        self.assertEqual(bug.shape[1].regex.pattern, bug.shape[1].pattern)
+        self.assertEqual([match.start() for match in bug.shape[0].regex.finditer('| | |')], [0, 2])
+
+    def test_literal_run(self):
+        self.assertEqual(Bug.Part.literal_runs('  ab  c'), [(0, ' '), (2, 'ab'), (6, 'c')])
+
+        bug = Bug(self.valid_filename)
+
+        self.assertIsNone(bug.shape[0].literal_run)
+        self.assertEqual(bug.shape[1].literal_run, (0, '###O'))
+        self.assertEqual(make_bug('## aab abc\n').shape[0].literal_run, (7, 'abc'))
+
+
+class TestRegexBugSearch(TestCase):
+    def test_match_bug_part(self):
+        rng = random.Random(0)
+        search = RegexBugSearch(make_bug('#x #x\n xx x\n'))
+
+        for _ in range(100):
+            landscape_line = File.Line(0, ''.join(rng.choice('#x ') for _ in range(40)))
+
+            for bug_part in search.bug.shape:
+                self.assertIsNotNone(bug_part.literal_run)
+                self.assertEqual(
+                    search.match_bug_part(bug_part, landscape_line),
+                    [match.start() for match in bug_part.regex.finditer(landscape_line.pattern)]
+                )
+
 
 class TestLandscape(TestCase):
     def setUp(self):
@@ -123,6 +471,156 @@ class TestLandscape(TestCase):
         for filename in self.invalid_filenames:
             self.assertRaises(TypeError, lambda: File(filename))
 
+    def test_lines(self):
+        landscape = Landscape('landscape.txt')
+        lines = [(line.id, line.pattern) for line in landscape.lines()]
+
+        self.assertTrue(landscape.seekable)
+        self.assertEqual(len(lines), 7)
+
+        with open(landscape.file_path, 'r') as file_handler:
+            landscape = Landscape('-', stream=file_handler)
+
+            self.assertFalse(landscape.seekable)
+            self.assertEqual([(line.id, line.pattern) for line in landscape.lines()], lines)
+
+        path = tempfile.mkdtemp()
+
+        try:
+            file_path = os.path.join(path, 'landscape.gz')
+            with open(Landscape('landscape.txt').file_path, 'r') as file_handler:
+                compressed_file_handler = gzip.GzipFile(file_path, 'w')
+                compressed_file_handler.write(file_handler.read())
+                compressed_file_handler.close()
+
+            landscape = Landscape(file_path, strict=False)
+
+            self.assertFalse(landscape.seekable)
+            self.assertEqual([(line.id, line.pattern) for line in landscape.lines()], lines)
+
+            for processes in [1, 2]:
+                self.assertEqual(BugFinder(Bug('bug.txt'), landscape).find_bugs_in_landscape(processes).values(), [3])
+
+            self.assertRaises(ValueError, lambda: BugFinder(Bug('bug.txt'), landscape).find_new_bugs_in_landscape())
+        finally:
+            shutil.rmtree(path)
+
+
+class TestBugPartMatchWindow(TestCase):
+    def test_BugPartMatchWindow(self):
+        for size in [0, -1, True, None, '3']:
+            self.assertRaises((TypeError, ValueError), lambda: BugPartMatchWindow(size))
+
+    def test_getitem(self):
+        window = BugPartMatchWindow(2)
+        window[0][0].add(4)
+        window[1][1].add(4)
+
+        self.assertEqual(window[0][0], {4})
+        self.assertEqual(list(window), [0, 1])
+
+        window[2][0].add(7)
+
+        self.assertNotIn(0, window)
+        self.assertEqual(list(window), [1, 2])
+        self.assertEqual(window[1][1], {4})
+        self.assertEqual(len(window), 2)
+
+
+@skipIf(numpy is None, 'NumPy is not installed.')
+class TestNumpyBugSearch(TestCase):
+    def test_bug_part_cells(self):
+        bug = make_bug(' O\n# #\n')
+
+        self.assertEqual(NumpyBugSearch.bug_part_cells(bug.shape[0]), [(0, ord(' ')), (1, ord('O'))])
+        self.assertEqual(NumpyBugSearch.bug_part_cells(bug.shape[1]), [(0, ord('#')), (2, ord('#'))])
+
+    def test_search_landscape_line(self):
+        search = NumpyBugSearch(Bug('bug.txt'))
+
+        with open(File('landscape.txt').file_path, 'r') as file_handler:
+            for landscape_line in File.reader(file_handler):
+                search.search_landscape_line(landscape_line)
+
+        self.assertEqual(search.bug_count, 3)
+
+
+class TestBakerBirdBugSearch(TestCase):
+    def test_bug_row_segments(self):
+        self.assertEqual(BakerBirdBugSearch.bug_row_segments('###O'), [(0, '###O')])
+        self.assertEqual(BakerBirdBugSearch.bug_row_segments('| |'), [(0, '|'), (2, '|')])
+        self.assertEqual(BakerBirdBugSearch.bug_row_segments('  ab  c'), [(0, ' '), (2, 'ab'), (6, 'c')])
+
+    def test_Automaton(self):
+        automaton = BakerBirdBugSearch.Automaton(['he', 'she', 'his', 'hers'])
+
+        self.assertEqual(
+            sorted(automaton.find_all('ushers')),
+            [(3, 'he'), (3, 'she'), (5, 'hers')]
+        )
+
+    def test_label_landscape_line(self):
+        search = BakerBirdBugSearch(Bug('bug.txt'))
+
+        self.assertEqual(dict(search.label_landscape_line(File.Line(0, '| | ###O'))), {0: 5, 4: 2})
+
+    def test_search_landscape_line(self):
+        search = BakerBirdBugSearch(make_bug('#\n#\n'))
+
+        for line_id in range(5):
+            search.search_landscape_line(File.Line(line_id, '###'))
+
+        self.assertEqual(search.bug_count, 12)
+
+
+class TestBitsetBugSearch(TestCase):
+    def test_char_masks(self):
+        search = BitsetBugSearch(make_bug(' #x\n'))
+
+        self.assertEqual(search.char_masks(File.Line(0, '## #  x')), {' ': 0b0110100, '#': 0b0001011, 'x': 0b1000000})
+
+    def test_search_landscape_line(self):
+        search = BitsetBugSearch(make_bug('#\n#\n'))
+
+        for line_id in range(5):
+            search.search_landscape_line(File.Line(line_id, '###'))
+
+        self.assertEqual(search.bug_count, 12)
+
+        search.set_state(search.get_state())
+        search.search_landscape_line(File.Line(5, '# #'))
+
+        self.assertEqual(search.bug_count, 14)
+
+
+class TestSparseBugSearch(TestCase):
+    def test_content_line(self):
+        search = SparseBugSearch(make_bug('#\n  x\n'))
+        gap = ' ' * (SPARSE_MIN_GAP + 10)
+        margin = ' ' * (SPARSE_MIN_GAP + 1)
+
+        self.assertIsNone(search.content_line(File.Line(0, '# #')))
+
+        content_line, island_offsets, island_shifts = search.content_line(File.Line(1, '# #' + gap + 'x x' + gap + 'x'))
+        self.assertEqual(content_line.pattern, '# #' + margin + margin + 'x x' + margin + margin + 'x')
+        self.assertEqual(island_offsets, [0, len(margin) + 3, 3 * len(margin) + 6])
+        self.assertEqual(island_shifts, [0, len(gap) - 2 * len(margin), 2 * (len(gap) - 2 * len(margin))])
+
+    def test_match_bug_part(self):
+        rng = random.Random(0)
+        search = SparseBugSearch(make_bug('x  #\n #x\n'))
+
+        for _ in range(100):
+            landscape_line = File.Line(0, ''.join(
+                rng.choice('#x ') if rng.random() < 0.05 and rng.random() < 0.5 else ' ' for _ in range(1000)
+            ).rstrip())
+
+            for bug_part in search.bug.shape:
+                self.assertEqual(
+                    search.match_bug_part(bug_part, landscape_line),
+                    [match.start() for match in bug_part.regex.finditer(landscape_line.pattern)]
+                )
+
 
 class TestBugFinder(TestCase):
     def setUp(self):
@@ -136,6 +634,8 @@ class TestBugFinder(TestCase):
         self.assertIsInstance(bug_finder.landscape, Landscape)
 
         self.assertRaises(TypeError, lambda: BugFinder(123, None))
+        self.assertRaises(TypeError, lambda: BugFinder([], self.landscape))
+        self.assertRaises(TypeError, lambda: BugFinder([self.bug, 123], self.landscape))
 
     def test_increment_bug_count(self):
         bug_finder = BugFinder(self.bug, self.landscape)
@@ -150,6 +650,656 @@ class TestBugFinder(TestCase):
 
         self.assertEqual(bug_finder.bug_count, 3)
 
+    def test_find_bugs_in_landscape_multiple_bugs(self):
+        bugs = [self.bug, make_bug('###O\n'), Bug('bug.txt')]
+        bug_finder = BugFinder(bugs, self.landscape)
+        bug_counts = bug_finder.find_bugs_in_landscape()
+
+        self.assertEqual(list(bug_counts.keys()), bugs)
+        self.assertEqual(list(bug_counts.values()), [3, 3, 3])
+        self.assertEqual(bug_finder.bug_count, 9)
+
+        for bug in bugs:
+            single_bug_finder = BugFinder(bug, self.landscape)
+            single_bug_finder.find_bugs_in_landscape()
+
+            self.assertEqual(single_bug_finder.bug_count, bug_counts[bug])
+
+    def test_engine(self):
+        self.assertEqual(BugFinder(self.bug, self.landscape).engine, 'regex')
+
+        self.assertRaises(ValueError, lambda: BugFinder(self.bug, self.landscape, engine='abacus'))
+
+    def test_stats(self):
+        self.assertIsNone(BugFinder(self.bug, self.landscape).stats)
+
+        for engine in ENGINES:
+            if engine == 'numpy' and numpy is None:
+                continue
+
+            bug_finder = BugFinder(self.bug, self.landscape, engine=engine, stats=True)
+            bug_finder.find_bugs_in_landscape()
+
+            stats = bug_finder.stats
+            self.assertEqual(stats['engine'], engine)
+            self.assertEqual(stats['lines_read'], 7)
+            self.assertEqual(stats['bugs'][0]['bug_count'], 3)
+            self.assertEqual(stats['bugs'][0]['lines_searched'], 7)
+
+        self.assertEqual(stats['bugs'][0]['bug'], 'bug.txt')
+
+        bug_finder = BugFinder(self.bug, self.landscape, stats=True)
+        bug_finder.find_bugs_in_landscape()
+
+        stats = bug_finder.stats['bugs'][0]
+        self.assertEqual(stats['regex_invocations'], {0: 7, 1: 3, 2: 3})
+        self.assertEqual(stats['bug_part_skips'], {1: 4, 2: 4})
+        self.assertEqual(stats['bug_checks'], 5)
+        self.assertEqual(stats['bug_deregistrations'], 3)
+
+        bug_finder = BugFinder(self.bug, self.landscape, stats=True)
+        bug_finder.find_bugs_in_landscape(processes=2)
+
+        stats = bug_finder.stats['bugs'][0]
+        self.assertEqual(stats['bug_count'], 3)
+        self.assertGreaterEqual(stats['lines_searched'], 7)
+
+    def test_find_bugs_in_landscape_engines(self):
+        bugs = [
+            self.bug, make_bug('#\n#\n'), make_bug(' O\n# #\n'), make_bug('O  #\n# O\n'), make_bug('#\n\nO\n'),
+            make_bug('\n# #\n\n\n O\n'),
+        ]
+
+        for seed, bug in enumerate(bugs):
+            filename = make_data_file(make_random_landscape(bug, 200, 50, 30, seed))
+
+            try:
+                landscape = Landscape(filename)
+                bug_count = BugFinder(bug, landscape).find_bugs_in_landscape()[bug]
+
+                for engine in ENGINES:
+                    if engine == 'numpy' and numpy is None:
+                        continue
+
+                    bug_counts = BugFinder([bug, self.bug], landscape, engine=engine).find_bugs_in_landscape()
+
+                    self.assertEqual(bug_counts[bug], bug_count, engine)
+            finally:
+                remove_data_file(filename)
+
+    def test_find_bugs_in_landscape_blank_bug_rows(self):
+        cases = [
+            ('#\n\n#\n', '#\n#\n#\n#\n', 2),
+            ('\n#\n#\n', '#\n#\n#\n', 2),
+            ('#\n\n\n#\n', '#\n\nx\n#\n#\n\n#\n', 2),
+        ]
+
+        for bug_pattern, landscape_pattern, bug_count in cases:
+            bug = make_bug(bug_pattern)
+            filename = make_data_file(landscape_pattern)
+
+            try:
+                for engine in ENGINES:
+                    if engine == 'numpy' and numpy is None:
+                        continue
+
+                    bug_counts = BugFinder(bug, Landscape(filename), engine=engine).find_bugs_in_landscape()
+
+                    self.assertEqual(bug_counts[bug], bug_count, (bug_pattern, engine))
+            finally:
+                remove_data_file(filename)
+
+    def test_find_bugs_in_landscape_read_ahead(self):
+        bug = make_bug(' O\n# #\n')
+        filename = make_data_file(make_random_landscape(bug, 200, 50, 30))
+
+        try:
+            landscape = Landscape(filename)
+            bug_count = BugFinder(bug, landscape).find_bugs_in_landscape()[bug]
+
+            for batch_size in (1, 7, 1000):
+                bug_finder = BugFinder(bug, landscape, stats=True)
+                bug_finder.find_bugs_in_landscape(read_ahead=2, read_ahead_batch_size=batch_size)
+
+                stats = bug_finder.stats
+
+                self.assertEqual(bug_finder.bug_count, bug_count)
+                self.assertEqual(stats['read_ahead_batches'], (stats['lines_read'] - 1) // batch_size + 1)
+
+                for counter in ('reading_seconds', 'read_ahead_stall_seconds', 'matching_seconds'):
+                    self.assertIn(counter, stats)
+
+            bug_finder = BugFinder(bug, landscape)
+
+            self.assertRaises(ValueError, lambda: bug_finder.find_bugs_in_landscape(read_ahead=0))
+            self.assertRaises(
+                ValueError, lambda: bug_finder.find_bugs_in_landscape(read_ahead=1, read_ahead_batch_size=0)
+            )
+        finally:
+            remove_data_file(filename)
+
+    def test_read_ahead_landscape_lines(self):
+        def landscape_lines():
+            for line_id in range(10):
+                yield File.Line(line_id, '#')
+
+            raise IOError('Landscape is not readable.')
+
+        read_lines = []
+
+        with self.assertRaises(IOError):
+            for landscape_line in BugFinder.read_ahead_landscape_lines(landscape_lines(), 1, 3):
+                read_lines.append(landscape_line.id)
+
+        self.assertEqual(read_lines, range(9))
+
+        lines = BugFinder.read_ahead_landscape_lines((File.Line(line_id, '#') for line_id in range(10 ** 6)), 1, 2)
+        self.assertEqual(next(lines).id, 0)
+        lines.close()
+
+    def test_iter_bugs(self):
+        bug = make_bug(' O\n# #\n')
+        filename = make_data_file(make_random_landscape(bug, 200, 50, 30))
+
+        try:
+            landscape = Landscape(filename)
+            found_bugs = None
+
+            for engine in ENGINES:
+                if engine == 'numpy' and numpy is None:
+                    continue
+
+                bug_finder = BugFinder(bug, landscape, engine=engine)
+                engine_found_bugs = sorted(bug_finder.iter_bugs())
+
+                self.assertEqual(len(engine_found_bugs), bug_finder.bug_count, engine)
+                self.assertEqual(engine_found_bugs, found_bugs or engine_found_bugs, engine)
+                self.assertIsNone(bug_finder.searches[0].found_bugs)
+
+                found_bugs = engine_found_bugs
+        finally:
+            remove_data_file(filename)
+
+        self.assertEqual(list(BugFinder(self.bug, self.landscape).iter_bugs())[0], (1, 4))
+
+    def test_find_bugs_in_landscape_tiles(self):
+        bug = make_bug('O  #\n# O\n')
+        filename = make_data_file(make_random_landscape(bug, 20, 300, 40))
+
+        try:
+            landscape = Landscape(filename)
+            bug_count = BugFinder(bug, landscape).find_bugs_in_landscape()[bug]
+
+            for engine in ENGINES:
+                if engine == 'numpy' and numpy is None:
+                    continue
+
+                for tile_width, processes in [(1, 1), (7, 1), (50, 3), (1000, 1)]:
+                    bug_finder = BugFinder([bug, self.bug], landscape, engine=engine)
+
+                    self.assertEqual(
+                        bug_finder.find_bugs_in_landscape(processes, tile_width=tile_width)[bug], bug_count,
+                        (engine, tile_width)
+                    )
+        finally:
+            remove_data_file(filename)
+
+        self.assertRaises(ValueError, lambda: BugFinder(self.bug, self.landscape).find_bugs_in_landscape(tile_width=0))
+
+    def test_find_bugs_in_landscape_orientations(self):
+        bug = make_bug('O#\n##\n##\n')
+        landscape_rows = make_random_landscape(bug, 60, 40, 10).splitlines()
+        landscape_rows = [row.ljust(40) for row in landscape_rows]
+
+        bug_count = None
+        for orientation, orientation_bug in Bug('landscape.txt', rows=landscape_rows).orientations().items():
+            rows = [''] * (orientation_bug.compiled_shape.last_part_id + 1)
+            for part in orientation_bug.shape:
+                rows[part.id] = part.raw_pattern
+
+            filename = make_data_file(''.join(row + '\n' for row in rows))
+
+            try:
+                bug_finder = BugFinder(bug, Landscape(filename), engine='bitset', orientations=True)
+                bug_finder.find_bugs_in_landscape()
+            finally:
+                remove_data_file(filename)
+
+            self.assertEqual(len(bug_finder.bugs), 8)
+            self.assertEqual(bug_finder.original_bug_counts.values(), [bug_finder.bug_count])
+            self.assertEqual(bug_finder.bug_count, bug_count or bug_finder.bug_count, orientation)
+            self.assertGreaterEqual(bug_finder.bug_counts[bug_finder.bugs[ORIENTATIONS.index(orientation)]], 10)
+
+            bug_count = bug_finder.bug_count
+
+    def test_exists_and_max_count(self):
+        with open(self.landscape.file_path, 'r') as file_handler:
+            filename = make_data_file(file_handler.read(), 100)
+
+        try:
+            landscape = Landscape(filename)
+
+            self.assertTrue(BugFinder(self.bug, landscape).exists())
+            self.assertFalse(BugFinder(make_bug('xyz\n'), landscape).exists())
+
+            bug_finder = BugFinder(self.bug, landscape, stats=True)
+            self.assertEqual(bug_finder.find_bugs_in_landscape(max_count=5)[self.bug], 5)
+            self.assertLess(bug_finder.stats['lines_read'], 100)
+
+            self.assertRaises(ValueError, lambda: BugFinder(self.bug, landscape).find_bugs_in_landscape(max_count=0))
+        finally:
+            remove_data_file(filename)
+
+    def test_find_new_bugs_in_landscape(self):
+        pattern = make_random_landscape(self.bug, 200, 50, 30, 5)
+        full_filename = make_data_file(pattern)
+        filename = make_data_file('')
+        checkpoint_path = '{path}/{file}.checkpoint'.format(path=DATA_FOLDER_PATH, file=filename)
+
+        try:
+            landscape = Landscape(filename)
+            bug_count = BugFinder(self.bug, Landscape(full_filename)).find_bugs_in_landscape()
+
+            for engine in ENGINES:
+                if engine == 'numpy' and numpy is None:
+                    continue
+
+                with open(landscape.file_path, 'w'):
+                    pass
+
+                for end in list(range(0, len(pattern), 487)) + [len(pattern)]:
+                    with open(landscape.file_path, 'a') as file_handler:
+                        file_handler.write(pattern[os.path.getsize(landscape.file_path):end])
+
+                    bug_finder = BugFinder(self.bug, landscape, engine=engine)
+
+                    if end:
+                        bug_finder.load_checkpoint(checkpoint_path)
+
+                    bug_finder.find_new_bugs_in_landscape()
+                    bug_finder.save_checkpoint(checkpoint_path)
+
+                self.assertEqual(bug_finder.bug_counts.values(), bug_count.values(), engine)
+                self.assertEqual(bug_finder.find_new_bugs_in_landscape().values(), bug_count.values(), engine)
+
+            self.assertRaises(ValueError, lambda: BugFinder(self.bug, self.landscape).load_checkpoint(checkpoint_path))
+
+            with open(landscape.file_path, 'w'):
+                pass
+
+            self.assertRaises(ValueError, bug_finder.find_new_bugs_in_landscape)
+        finally:
+            remove_data_file(full_filename)
+            remove_data_file(filename)
+            os.remove(checkpoint_path)
+
+    def test_find_bugs_in_landscape_parallel(self):
+        for seed, bug in enumerate([self.bug, make_bug('#\n#\n')]):
+            filename = make_data_file(make_random_landscape(bug, 300, 60, 40, seed))
+
+            try:
+                landscape = Landscape(filename)
+
+                bug_finder = BugFinder(bug, landscape)
+                bug_count = bug_finder.find_bugs_in_landscape()[bug]
+
+                for chunk_count in [2, 7, 300]:
+                    bug_finder = BugFinder([bug, self.bug], landscape)
+
+                    self.assertEqual(bug_finder.find_bugs_in_landscape(2, chunk_count)[bug], bug_count)
+            finally:
+                remove_data_file(filename)
+
+        self.assertRaises(ValueError, lambda: BugFinder(self.bug, self.landscape).find_bugs_in_landscape(0))
+
+    def test_find_bugs_in_landscape_memory(self):
+        with open(self.landscape.file_path, 'r') as file_handler:
+            pattern = file_handler.read()
+
+        held_matches = []
+        for repeat in [10, 1000]:
+            filename = make_data_file(pattern, repeat)
+
+            try:
+                bug_finder = BugFinder(self.bug, Landscape(filename))
+                bug_finder.find_bugs_in_landscape()
+            finally:
+                remove_data_file(filename)
+
+            self.assertEqual(bug_finder.bug_count, 3 * repeat)
+            self.assertLessEqual(len(bug_finder.bug_part_matches), len(self.bug.shape))
+
+            held_matches.append(sum(
+                len(positions)
+                for line_id in bug_finder.bug_part_matches
+                for positions in bug_finder.bug_part_matches[line_id].values()
+            ))
+
+        self.assertEqual(held_matches[0], held_matches[1])
+
+
+class TestResultCache(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.bug = Bug('bug.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_ResultCache(self):
+        self.assertRaises(TypeError, lambda: ResultCache(None))
+        self.assertRaises(ValueError, lambda: ResultCache(self.path, -1))
+
+    def test_bug_key(self):
+        with open(self.bug.file_path, 'r') as file_handler:
+            self.assertEqual(ResultCache.bug_key(make_bug(file_handler.read())), ResultCache.bug_key(self.bug))
+
+        self.assertNotEqual(ResultCache.bug_key(make_bug('#\n')), ResultCache.bug_key(self.bug))
+        self.assertNotEqual(ResultCache.bug_key(make_bug('#\n\n#\n')), ResultCache.bug_key(make_bug('#\n#\n')))
+        self.assertEqual(ResultCache.bug_key(make_bug('\n#\n#\n')), ResultCache.bug_key(make_bug('#\n#\n')))
+
+    def test_find_bugs_in_landscape(self):
+        with open('{path}/landscape.txt'.format(path=DATA_FOLDER_PATH), 'r') as file_handler:
+            filename = make_data_file(file_handler.read())
+
+        try:
+            landscape = Landscape(filename)
+
+            for expected_bug_count, expected_cache_hits in [(3, 0), (3, 1)]:
+                bug_finder = BugFinder(self.bug, landscape, stats=True, cache=ResultCache(self.path))
+
+                self.assertEqual(bug_finder.find_bugs_in_landscape()[self.bug], expected_bug_count)
+                self.assertEqual(bug_finder.stats.get('cache_hits', 0), expected_cache_hits)
+
+            with open(landscape.file_path, 'a') as file_handler:
+                file_handler.write(''.join(part.raw_pattern + '\n' for part in self.bug.shape))
+
+            bug_finder = BugFinder(self.bug, landscape, stats=True, cache=ResultCache(self.path))
+
+            self.assertEqual(bug_finder.find_bugs_in_landscape()[self.bug], 4)
+            self.assertNotIn('cache_hits', bug_finder.stats)
+        finally:
+            remove_data_file(filename)
+
+    def test_evict(self):
+        cache = ResultCache(self.path)
+        landscape_key = cache.landscape_key(Landscape('landscape.txt'))
+
+        for bug_count in range(5):
+            cache.set(make_bug('#' * (bug_count + 1) + '\n'), landscape_key, bug_count)
+            time.sleep(0.01)
+
+        cache_size = sum(os.path.getsize(os.path.join(self.path, filename)) for filename in os.listdir(self.path))
+        cache.max_size = cache_size - 1
+        cache.landscape_key(Landscape('landscape.txt'))
+        cache.get(make_bug('#\n'), landscape_key)
+        cache.evict()
+
+        self.assertEqual(cache.get(make_bug('#\n'), landscape_key), 0)
+        self.assertIsNone(cache.get(make_bug('##\n'), landscape_key))
+        self.assertEqual(cache.get(make_bug('###\n'), landscape_key), 2)
+
+    def test_evict_scans(self):
+        cache = ResultCache(self.path)
+        landscape_key = cache.landscape_key(Landscape('landscape.txt'))
+        listdir = os.listdir
+        scanned_paths = []
+
+        def counting_listdir(path):
+            scanned_paths.append(path)
+            return listdir(path)
+
+        os.listdir = counting_listdir
+        try:
+            for bug_count in range(100):
+                cache.set(make_bug('#' * (bug_count + 1) + '\n'), landscape_key, bug_count)
+
+            self.assertEqual(len(scanned_paths), 1)
+
+            cache.max_size = sum(os.path.getsize(os.path.join(self.path, filename)) for filename in listdir(self.path))
+            for bug_count in range(5):
+                cache.set(make_bug('O' * (bug_count + 1) + '\n'), landscape_key, bug_count)
+        finally:
+            os.listdir = listdir
+
+        self.assertEqual(len(scanned_paths), 2)
+        cache_size = sum(os.path.getsize(os.path.join(self.path, filename)) for filename in os.listdir(self.path))
+        self.assertLessEqual(cache_size, cache.max_size)
+
+
+class TestLandscapeIndex(TestCase):
+    def test_find_bugs(self):
+        bugs = [
+            Bug('bug.txt'), make_bug('#\n#\n'), make_bug(' O\n# #\n'), make_bug('O  #\n# O\n'), make_bug('#\n\nO\n'),
+            make_bug('\n# #\n\n\n O\n'),
+        ]
+
+        for seed, bug in enumerate(bugs):
+            filename = make_data_file(make_random_landscape(bug, 100, 50, 20, seed))
+
+            try:
+                landscape = Landscape(filename)
+                found_bugs = sorted(BugFinder(bug, landscape).iter_bugs())
+
+                landscape_index = LandscapeIndex.build(landscape)
+
+                self.assertEqual(sorted(landscape_index.find_bugs(bug)), found_bugs)
+                self.assertEqual(BugFinder(bug, landscape, index=True).find_bugs_in_landscape()[bug], len(found_bugs))
+                self.assertEqual(BugFinder(bug, landscape, index=True).exists(), bool(found_bugs))
+            finally:
+                os.remove(LandscapeIndex.index_path(landscape))
+                remove_data_file(filename)
+
+    def test_find_bugs_in_landscape(self):
+        with open(Landscape('landscape.txt').file_path, 'r') as file_handler:
+            filename = make_data_file(file_handler.read() + '#  #\n' * 200 + '   \n' * 100)
+
+        try:
+            landscape = Landscape(filename)
+            bugs = [
+                Bug('bug.txt'), make_bug('#\n\n#\n'), make_bug('\n#\n#\n'), make_bug('| |\n\n| |\n'), make_bug(' \n\n')
+            ]
+            bug_counts = BugFinder(bugs, landscape).find_bugs_in_landscape()
+
+            LandscapeIndex.build(landscape)
+
+            for bug in bugs:
+                bug_finder = BugFinder(bug, landscape, stats=True, index=True)
+
+                self.assertEqual(bug_finder.find_bugs_in_landscape()[bug], bug_counts[bug])
+                self.assertEqual(sum(1 for _ in LandscapeIndex.load(landscape).find_bugs(bug)), bug_counts[bug])
+                self.assertEqual('index_hits' in bug_finder.stats, bug not in bugs[1:3])
+
+            self.assertEqual(bug_counts[bugs[0]], 3)
+            self.assertEqual(bug_counts[bugs[-1]], 0)
+
+            bug_finder = BugFinder(bugs[0], landscape, stats=True)
+            bug_finder.find_bugs_in_landscape()
+            self.assertNotIn('index_hits', bug_finder.stats)
+        finally:
+            os.remove(LandscapeIndex.index_path(landscape))
+            remove_data_file(filename)
+
+    def test_load(self):
+        with open(Landscape('landscape.txt').file_path, 'r') as file_handler:
+            filename = make_data_file(file_handler.read())
+
+        try:
+            landscape = Landscape(filename)
+            self.assertIsNone(LandscapeIndex.load(landscape))
+
+            landscape_index = LandscapeIndex.build(landscape)
+            self.assertIsNotNone(LandscapeIndex.load(landscape))
+            self.assertEqual(landscape_index.char_count('O'), 3)
+            self.assertEqual(landscape_index.char_count(' '), 0)
+
+            with open(landscape.file_path, 'a') as file_handler:
+                file_handler.write('| |\n###O\n| |\n')
+
+            self.assertIsNone(LandscapeIndex.load(landscape))
+
+            bug_finder = BugFinder(Bug('bug.txt'), landscape, stats=True)
+            self.assertEqual(bug_finder.find_bugs_in_landscape()[bug_finder.bug], 4)
+            self.assertNotIn('index_hits', bug_finder.stats)
+        finally:
+            os.remove(LandscapeIndex.index_path(landscape))
+            remove_data_file(filename)
+
+
+class TestBugLibrary(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_build(self):
+        bugs = [Bug('bug.txt'), make_bug(' O\n\n# #\n'), make_bug('\xe9\xe9\n\\.*\n')]
+        library = BugLibrary.build(os.path.join(self.path, 'bugs.lib'), bugs)
+
+        self.assertEqual(library.names, [bug.filename for bug in bugs])
+
+        library = BugLibrary(library.path)
+
+        for bug in bugs:
+            self.assertIn(bug.filename, library)
+
+            library_bug = library[bug.filename]
+
+            self.assertIs(library[bug.filename], library_bug)
+            self.assertEqual(library_bug.filename, bug.filename)
+            self.assertEqual(library_bug.compiled_shape.width, bug.compiled_shape.width)
+
+            for library_bug_part, bug_part in zip(library_bug.shape, bug.shape):
+                self.assertEqual(library_bug_part.id, bug_part.id)
+                self.assertEqual(library_bug_part.raw_pattern, bug_part.raw_pattern)
+                self.assertEqual(library_bug_part.pattern, bug_part.pattern)
+                self.assertEqual(library_bug_part.literal_run, bug_part.literal_run)
+                self.assertEqual(library_bug_part.regex.pattern, bug_part.regex.pattern)
+
+        bug_finder = BugFinder(library['bug.txt'], Landscape('landscape.txt'))
+        self.assertEqual(bug_finder.find_bugs_in_landscape().values(), [3])
+        self.assertRaises(ValueError, lambda: library['missing.txt'])
+        self.assertRaises(ValueError, lambda: BugLibrary.build(os.path.join(self.path, 'twice.lib'), bugs[:1] * 2))
+
+    def test_BugLibrary(self):
+        path = os.path.join(self.path, 'bugs.lib')
+
+        with open(path, 'w') as file_handler:
+            file_handler.write('{"version": 0, "bugs": []}\n')
+
+        self.assertRaises(ValueError, lambda: BugLibrary(path))
+        self.assertRaises(ValueError, lambda: BugLibrary(Landscape('landscape.txt').file_path))
+
+
+class TestManifest(TestCase):
+    def test_read_manifest(self):
+        manifest = ['# nightly\n', 'bug.txt landscape.txt\n', '\n', '  bug.txt\tother.txt  \n']
+        self.assertEqual(list(read_manifest(manifest)), [('bug.txt', 'landscape.txt'), ('bug.txt', 'other.txt')])
+
+        self.assertRaises(ValueError, lambda: list(read_manifest(['bug.txt\n'])))
+
+    def test_find_bugs_in_pairs(self):
+        pairs = [('bug.txt', 'landscape.txt'), ('bug.txt', 'doesNotExist.txt'), ('doesNotExist.txt', 'landscape.txt')]
+
+        for processes in [1, 2]:
+            results = list(find_bugs_in_pairs(pairs * 2, processes=processes))
+
+            self.assertEqual(len(results), 6)
+            self.assertEqual(results[:3], results[3:])
+            self.assertEqual(results[0], {'bug': 'bug.txt', 'landscape': 'landscape.txt', 'bug_count': 3})
+            self.assertEqual(sorted(results[1]), ['bug', 'error', 'landscape'])
+            self.assertEqual(sorted(results[2]), ['bug', 'error', 'landscape'])
+
+
+class TestBugServer(TestCase):
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.bug_server = BugServer(os.path.join(self.path, 'socket'), [Bug('bug.txt')], processes=2)
+
+        self.thread = threading.Thread(target=self.bug_server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.bug_server.shutdown()
+        self.thread.join()
+        self.bug_server.close()
+        shutil.rmtree(self.path)
+
+    def request(self, *requests):
+        client = socket.socket(socket.AF_UNIX)
+        client.connect(self.bug_server.server_address)
+
+        try:
+            client_file = client.makefile('r+')
+            responses = []
+
+            for request in requests:
+                client_file.write((request if isinstance(request, str) else json.dumps(request)) + '\n')
+                client_file.flush()
+                responses.append(json.loads(client_file.readline()))
+
+            return responses
+        finally:
+            client.close()
+
+    def test_parse_address(self):
+        self.assertEqual(BugServer.parse_address('localhost:8000'), ('localhost', 8000))
+        self.assertEqual(BugServer.parse_address(':8000'), ('localhost', 8000))
+        self.assertEqual(BugServer.parse_address('127.0.0.1:8000'), ('127.0.0.1', 8000))
+        self.assertEqual(BugServer.parse_address('0.0.0.0:8000', allow_remote=True), ('0.0.0.0', 8000))
+        self.assertEqual(BugServer.parse_address('/tmp/bugs'), '/tmp/bugs')
+        self.assertRaises(ValueError, lambda: BugServer.parse_address('0.0.0.0:8000'))
+        self.assertRaises(ValueError, lambda: BugServer.parse_address('doesNotExist.invalid:8000'))
+        self.assertRaises(ValueError, lambda: BugServer.parse_address(__file__))
+
+    def test_request(self):
+        with open('{path}/landscape.txt'.format(path=DATA_FOLDER_PATH), 'r') as file_handler:
+            landscape_text = file_handler.read()
+
+        # Not gzip data, so decompressing it fails with "zlib.error".
+        corrupt_filename = make_data_file('not gzip\n')
+        os.rename(File(corrupt_filename).file_path, File(corrupt_filename).file_path + '.gz')
+
+        try:
+            responses = self.request(
+                {'bugs': ['bug.txt'], 'landscape': 'landscape.txt'},
+                {'bugs': 'bug.txt', 'landscape_text': landscape_text, 'engine': 'bakerbird'},
+                {'bugs': ['bug.txt'], 'landscape': 'doesNotExist.txt'},
+                {'bugs': ['bug.txt'], 'landscape_text': landscape_text, 'engine': 'unknown'},
+                {'landscape': 'landscape.txt'},
+                'not json',
+                {'bugs': ['bug.txt'], 'landscape': corrupt_filename + '.gz'},
+                {'bugs': ['bug.txt'], 'landscape': 'landscape.txt'},
+            )
+        finally:
+            remove_data_file(corrupt_filename + '.gz')
+
+        self.assertEqual(responses[0], {'bug_counts': {'bug.txt': 3}, 'bug_count': 3})
+        self.assertEqual(responses[1], responses[0])
+        self.assertEqual(responses[-1], responses[0])
+
+        for response in responses[2:-1]:
+            self.assertEqual(list(response), ['error'])
+
+    def test_concurrent_requests(self):
+        responses = []
+
+        threads = [
+            threading.Thread(target=lambda: responses.extend(self.request(
+                {'bugs': ['bug.txt'], 'landscape': 'landscape.txt'}
+            )))
+            for _ in range(8)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(responses, [{'bug_counts': {'bug.txt': 3}, 'bug_count': 3}] * 8)
+
 
 if __name__ == '__main__':
     main()